@@ -13,7 +13,8 @@ AI personalities (Elaine and Carrie) that assist with game development,
 """
 
 # --- OLLAMA INTEGRATION HELPER ---
-def query_ollama(prompt, model="llama2-uncensored:latest", max_tokens=512, temperature=0.7, stream=False):
+def query_ollama(prompt, model="llama2-uncensored:latest", max_tokens=512, temperature=0.7, stream=False, on_chunk=None,
+                 interactive=False):
     """Query the local Ollama HTTP API.
 
     Args:
@@ -22,68 +23,98 @@ def query_ollama(prompt, model="llama2-uncensored:latest", max_tokens=512, tempe
         max_tokens (int): Max tokens to generate.
         temperature (float): Sampling temperature.
         stream (bool): Whether to attempt streaming the response.
+        on_chunk (callable): Optional callback receiving each streamed text piece as it
+            arrives (implies stream=True). Called on the requesting thread.
+        interactive (bool): User-facing request; it takes the next free generation slot
+            ahead of queued background work (learning, training, summaries).
 
     Returns:
         str: Model response or an error message.
     """
-    import requests, json
-    url = "http://localhost:11434/api/generate"
+    import requests
+    url = OLLAMA_GENERATE_URL
+    if on_chunk is not None:
+        stream = True
     payload = {
         "model": model,
         "prompt": prompt,
         "max_tokens": max_tokens,
         "temperature": temperature,
+        "options": {"temperature": temperature},  # where /api/generate reads sampling settings
         "stream": stream,
     }
     REQUEST_TIMEOUT = 120
-    try:
-        try:
-            response = requests.post(url, json=payload, timeout=REQUEST_TIMEOUT, stream=stream)
-            response.raise_for_status()
-        except requests.exceptions.ReadTimeout:
-            # Retry once with a longer timeout for longer generations
-            response = requests.post(url, json=payload, timeout=REQUEST_TIMEOUT * 2, stream=stream)
-            response.raise_for_status()
 
-        # If streaming, parse line-delimited JSON chunks
-        if stream:
-            result = ""
-            for line in response.iter_lines(decode_unicode=True):
-                if not line:
-                    continue
-                try:
-                    obj = json.loads(line)
+    # Deterministic (near-zero temperature) prompts always produce the same text, so reuse it
+    cache_key = None
+    if not stream and temperature <= OLLAMA_CACHE_MAX_TEMPERATURE:
+        cache_key = _ollama_cache_key(model, prompt, max_tokens)
+        cached = _ollama_cache_get(cache_key)
+        if cached is not None:
+            return cached
+        # Near-duplicate phrasing of an earlier prompt
+        cached, prompt_vec = _SEMANTIC_CACHE.lookup(prompt, (model, max_tokens))
+        if cached is not None:
+            _ollama_cache_put(cache_key, cached)
+            return cached
+
+    # One process-wide queue for generations so the brains never compete for the model
+    with _OLLAMA_GATE.slot(interactive):
+        try:
+            try:
+                response = _OLLAMA_SESSION.post(url, json=payload, timeout=REQUEST_TIMEOUT, stream=stream)
+                response.raise_for_status()
+            except requests.exceptions.ReadTimeout:
+                # Retry once with a longer timeout for longer generations
+                response = _OLLAMA_SESSION.post(url, json=payload, timeout=REQUEST_TIMEOUT * 2, stream=stream)
+                response.raise_for_status()
+
+            # If streaming, parse line-delimited JSON chunks
+            if stream:
+                chunks = []
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    try:
+                        obj = _json.loads(line)
+                    except Exception:
+                        # ignore non-json lines
+                        continue
                     # Ollama stream chunks may include a 'response' key
-                    if isinstance(obj, dict) and 'response' in obj:
-                        result += obj.get('response') or ''
+                    if isinstance(obj, dict) and obj.get('response'):
+                        piece = obj['response']
+                        chunks.append(piece)
+                        if on_chunk is not None:
+                            on_chunk(piece)
+                if chunks:
+                    return ''.join(chunks)
+                # fall back to the full JSON body if streaming returned nothing
+                try:
+                    data = response.json()
+                    return data.get('response', '') or "No response from Ollama."
                 except Exception:
-                    # ignore non-json lines
-                    continue
-            if result:
-                return result
-            # fall back to the full JSON body if streaming returned nothing
+                    return "No response from Ollama."
+
+            # Non-streaming: parse the single JSON response straight from the raw bytes
+            data = _json.loads(response.content)
+            result = data.get('response', '')
+            if result and cache_key is not None:
+                _ollama_cache_put(cache_key, result)
+                _SEMANTIC_CACHE.store(prompt_vec, result, (model, max_tokens))
+            return result or "No response from Ollama."
+
+        except requests.exceptions.ConnectionError:
+            return "Ollama error: Unable to connect. Is the Ollama server running?"
+        except requests.exceptions.HTTPError as e:
+            status = e.response.status_code if e.response is not None else 'unknown'
+            body = ''
             try:
-                data = response.json()
-                return data.get('response', '') or "No response from Ollama."
+                body = e.response.text
             except Exception:
-                return "No response from Ollama."
-
-        # Non-streaming: parse the single JSON response
-        data = response.json()
-        return data.get('response', '') or "No response from Ollama."
-
-    except requests.exceptions.ConnectionError:
-        return "Ollama error: Unable to connect. Is the Ollama server running?"
-    except requests.exceptions.HTTPError as e:
-        status = e.response.status_code if e.response is not None else 'unknown'
-        body = ''
-        try:
-            body = e.response.text
-        except Exception:
-            body = str(e)
-        return f"Ollama error: HTTP {status}: {body}"
-    except Exception as e:
-        return f"Ollama error: {str(e)}"
+                body = str(e)
+            return f"Ollama error: HTTP {status}: {body}"
+        except Exception as e:
+            return f"Ollama error: {str(e)}"
 import tkinter as tk
 """
 DUAL BRAIN AI CREATIVE WORKFLOW CENTER
@@ -100,19 +131,36 @@ Combines the layout of v1.0 with the logic/learning of v2.2+, adding:
 - Expandable for mobile/multi-node interfaces
 """
 
-from tkinter import ttk, filedialog, messagebox, scrolledtext, simpledialog
+from tkinter import ttk, filedialog, messagebox, scrolledtext, simpledialog, font as tkfont
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
 import datetime
+import getpass
+import glob
+import socket
 import threading
 import os
 import time
 import json
 import random
 import subprocess
+import shutil
+import collections
+import contextlib
+import codecs
+import mmap
+import atexit
+import concurrent.futures
+import hashlib
+import heapq
+import itertools
+import queue
 import sqlite3
 import numpy as np
 import math  # Added for recursive harmonics
+import re
+import functools
 try:
     from stl import mesh  # For STL generation (numpy-stl)
 except ImportError:
@@ -128,16 +176,446 @@ try:
 except ImportError:
     Image = None
 
+try:
+    import orjson as _json  # Faster decoding of Ollama response bodies and memory contexts
+
+    def _json_dumps(obj):
+        return _json.dumps(obj).decode('utf-8')
+except ImportError:
+    import json as _json
+    _json_dumps = _json.dumps
+
+try:
+    from numba import njit  # JIT for the fractal harmonic kernel
+except ImportError:
+    njit = None
+
+try:
+    from scipy.signal import lfilter  # Batched IIR evaluation for triadic harmony replay
+except ImportError:
+    lfilter = None
+
+try:
+    import lxml  # noqa: F401 - C HTML parser backend for BeautifulSoup
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+try:
+    import zstandard as zstd  # Compressed storage for ProjectAgent.file_cache
+except ImportError:
+    zstd = None
+
+try:
+    import faiss  # ANN index over memory summary embeddings
+except ImportError:
+    faiss = None
+
+try:
+    import ahocorasick  # Single-pass matching of custom template triggers
+except ImportError:
+    ahocorasick = None
+
+try:
+    from watchdog.observers import Observer  # Event-driven project watcher (inotify/FSEvents)
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+# --- OLLAMA HTTP SESSION ---
+# One pooled keep-alive session for all calls to the local Ollama server
+_OLLAMA_SESSION = requests.Session()
+_OLLAMA_SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=0))
+_OLLAMA_SESSION.headers.update({'Connection': 'keep-alive', 'Accept-Encoding': 'gzip'})
+
+def close_ollama_session():
+    """Release pooled Ollama connections (called on app shutdown)."""
+    try:
+        _OLLAMA_SESSION.close()
+    except Exception:
+        pass
+
+class OllamaGate:
+    """Process-wide limit on concurrent Ollama generations.
+
+    Waiting interactive requests are admitted before any waiting background ones.
+    """
+    def __init__(self, slots=1):
+        self._cond = threading.Condition()
+        self._free = slots
+        self._interactive_waiting = 0
+
+    @contextlib.contextmanager
+    def slot(self, interactive=False):
+        with self._cond:
+            if interactive:
+                self._interactive_waiting += 1
+            try:
+                while self._free <= 0 or (not interactive and self._interactive_waiting):
+                    self._cond.wait()
+            finally:
+                if interactive:
+                    self._interactive_waiting -= 1
+            self._free -= 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._free += 1
+                self._cond.notify_all()
+
+# Generations admitted at once; raise to match the server's OLLAMA_NUM_PARALLEL if it has spare slots
+_OLLAMA_GATE = OllamaGate(max(1, int(os.getenv('OLLAMA_GENERATE_SLOTS', '1'))))
+
+# --- WEB HTTP SESSION ---
+# Pooled session for web search / page fetches so repeat calls skip the TCP/TLS handshake
+_WEB_SESSION = requests.Session()
+_WEB_SESSION.headers.update({"User-Agent": "Mozilla/5.0"})
+
+def close_web_session():
+    """Release pooled web connections (called on app shutdown)."""
+    try:
+        _WEB_SESSION.close()
+    except Exception:
+        pass
+
+# Only the DuckDuckGo result blocks are materialised when parsing search pages.
+# The strainer sees the raw class attribute, so match 'result' as a whole word in it.
+_DDG_RESULT_STRAINER = SoupStrainer('div', class_=re.compile(r'(?:^|\s)result(?:\s|$)'))
+
+# Process-wide LRU + TTL of successful web searches, keyed by normalised query.
+# Persisted across restarts by load_search_cache/save_search_cache.
+_SEARCH_CACHE_TTL = 600
+_SEARCH_CACHE_MAX = 256
+_SEARCH_CACHE = collections.OrderedDict()  # query -> (stored_at, results text)
+_SEARCH_CACHE_LOCK = threading.Lock()
+
+def _search_cache_get(query):
+    with _SEARCH_CACHE_LOCK:
+        entry = _SEARCH_CACHE.get(query)
+        if entry is None:
+            return None
+        if time.time() - entry[0] > _SEARCH_CACHE_TTL:
+            del _SEARCH_CACHE[query]
+            return None
+        _SEARCH_CACHE.move_to_end(query)
+        return entry[1]
+
+def _search_cache_put(query, results):
+    with _SEARCH_CACHE_LOCK:
+        _SEARCH_CACHE[query] = (time.time(), results)
+        _SEARCH_CACHE.move_to_end(query)
+        while len(_SEARCH_CACHE) > _SEARCH_CACHE_MAX:
+            _SEARCH_CACHE.popitem(last=False)
+
+def load_search_cache(db_path="dspa_studio.db"):
+    """Warm the web search cache from the search_cache table, skipping expired entries. Returns entries loaded."""
+    cutoff = time.time() - _SEARCH_CACHE_TTL
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.execute("CREATE TABLE IF NOT EXISTS search_cache (query TEXT PRIMARY KEY, results TEXT, stored_at REAL)")
+            rows = conn.execute("SELECT query, results, stored_at FROM search_cache WHERE stored_at > ? "
+                                "ORDER BY stored_at DESC LIMIT ?", (cutoff, _SEARCH_CACHE_MAX)).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return 0
+    with _SEARCH_CACHE_LOCK:
+        for query, results, stored_at in reversed(rows):
+            _SEARCH_CACHE[query] = (stored_at, results)
+            _SEARCH_CACHE.move_to_end(query)
+        while len(_SEARCH_CACHE) > _SEARCH_CACHE_MAX:
+            _SEARCH_CACHE.popitem(last=False)
+    return len(rows)
+
+def save_search_cache(db_path="dspa_studio.db"):
+    """Persist unexpired web search results, keeping their original timestamps. Returns entries written."""
+    cutoff = time.time() - _SEARCH_CACHE_TTL
+    with _SEARCH_CACHE_LOCK:
+        items = [(query, results, stored_at) for query, (stored_at, results) in _SEARCH_CACHE.items()
+                 if stored_at > cutoff]
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            with conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS search_cache (query TEXT PRIMARY KEY, results TEXT, stored_at REAL)")
+                conn.executemany("INSERT OR REPLACE INTO search_cache (query, results, stored_at) VALUES (?, ?, ?)", items)
+                conn.execute("DELETE FROM search_cache WHERE stored_at <= ?", (cutoff,))
+                conn.execute("DELETE FROM search_cache WHERE rowid NOT IN "
+                             "(SELECT rowid FROM search_cache ORDER BY stored_at DESC LIMIT ?)",
+                             (_SEARCH_CACHE_MAX,))
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return 0
+    return len(items)
+
+# --- OLLAMA RESPONSE CACHE ---
+# Process-wide LRU of deterministic query_ollama results, keyed by sha256(model, prompt, max_tokens)
+OLLAMA_CACHE_MAX_TEMPERATURE = 0.01
+_OLLAMA_CACHE_MAX = 512
+_OLLAMA_CACHE = collections.OrderedDict()
+_OLLAMA_CACHE_LOCK = threading.Lock()
+
+def _ollama_cache_key(model, prompt, max_tokens):
+    raw = json.dumps({'m': model, 'p': prompt, 't': max_tokens}, sort_keys=True)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+def _ollama_cache_get(key):
+    with _OLLAMA_CACHE_LOCK:
+        value = _OLLAMA_CACHE.get(key)
+        if value is not None:
+            _OLLAMA_CACHE.move_to_end(key)
+        return value
+
+def _ollama_cache_put(key, value):
+    with _OLLAMA_CACHE_LOCK:
+        _OLLAMA_CACHE[key] = value
+        _OLLAMA_CACHE.move_to_end(key)
+        while len(_OLLAMA_CACHE) > _OLLAMA_CACHE_MAX:
+            _OLLAMA_CACHE.popitem(last=False)
+
+def load_ollama_cache(db_path="dspa_studio.db"):
+    """Warm the in-memory Ollama cache from the ollama_cache table. Returns entries loaded."""
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.execute("CREATE TABLE IF NOT EXISTS ollama_cache (key TEXT PRIMARY KEY, response TEXT, timestamp TEXT)")
+            rows = conn.execute("SELECT key, response FROM ollama_cache ORDER BY timestamp DESC, rowid DESC LIMIT ?",
+                                (_OLLAMA_CACHE_MAX,)).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return 0
+    for key, response in reversed(rows):
+        _ollama_cache_put(key, response)
+    return len(rows)
+
+def save_ollama_cache(db_path="dspa_studio.db"):
+    """Persist the in-memory Ollama cache so it survives restarts. Returns entries written."""
+    with _OLLAMA_CACHE_LOCK:
+        items = list(_OLLAMA_CACHE.items())
+    if not items:
+        return 0
+    now = datetime.datetime.now().isoformat()
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            with conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS ollama_cache (key TEXT PRIMARY KEY, response TEXT, timestamp TEXT)")
+                conn.executemany("INSERT OR REPLACE INTO ollama_cache (key, response, timestamp) VALUES (?, ?, ?)",
+                                 [(key, response, now) for key, response in items])
+                # Keep the table bounded to what fits in memory on the next load
+                conn.execute("DELETE FROM ollama_cache WHERE rowid NOT IN "
+                             "(SELECT rowid FROM ollama_cache ORDER BY timestamp DESC, rowid DESC LIMIT ?)",
+                             (_OLLAMA_CACHE_MAX,))
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return 0
+    return len(items)
+
+# --- OLLAMA EMBEDDINGS ---
+OLLAMA_EMBED_URL = "http://localhost:11434/api/embed"
+OLLAMA_LEGACY_EMBED_URL = "http://localhost:11434/api/embeddings"
+
+def embed_texts(texts, model="nomic-embed-text"):
+    """Embed a list of texts with a single batched /api/embed request.
+
+    Returns an L2-normalized float32 array of shape [len(texts), D]. Older Ollama
+    servers without the batch endpoint are handled by falling back to one
+    /api/embeddings call per text. Network/HTTP errors propagate to the caller.
+    """
+    texts = list(texts)
+    if not texts:
+        return np.empty((0, 0), dtype=np.float32)
+    response = _OLLAMA_SESSION.post(OLLAMA_EMBED_URL, json={'model': model, 'input': texts}, timeout=60)
+    vectors = None
+    if response.status_code != 404:
+        response.raise_for_status()
+        vectors = response.json().get('embeddings')
+    if not vectors:
+        def embed_one(text):
+            r = _OLLAMA_SESSION.post(OLLAMA_LEGACY_EMBED_URL, json={'model': model, 'prompt': text}, timeout=60)
+            r.raise_for_status()
+            return r.json()['embedding']
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(4, len(texts))) as pool:
+            vectors = list(pool.map(embed_one, texts))
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+class SemanticCache:
+    """Embedding-similarity cache for prompts that differ only in phrasing.
+
+    Prompts are embedded with Ollama's /api/embed endpoint and kept L2-normalized
+    in one float32 matrix per (model, max_tokens) scope, so a lookup is a single
+    matrix-vector product. If the embedding model is unavailable the cache
+    disables itself for the rest of the session.
+    """
+    def __init__(self, embed_model="nomic-embed-text", similarity_threshold=0.92, ttl=3600, max_entries=256):
+        self.embed_model = embed_model
+        self.similarity_threshold = similarity_threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = os.environ.get('OLLAMA_SEMANTIC_CACHE', '1') != '0'
+        self._lock = threading.Lock()
+        self._scopes = {}  # scope -> {'vectors': ndarray[N, D], 'responses': [...], 'times': [...]}
+
+    def embed(self, texts):
+        """Embed a batch of texts in one request. Returns an L2-normalized [N, D] array or None."""
+        if not self.enabled:
+            return None
+        try:
+            return embed_texts(texts, model=self.embed_model)
+        except Exception:
+            self.enabled = False
+            return None
+
+    def lookup(self, prompt, scope):
+        """Return (response, prompt_vector); response is None on a miss."""
+        vectors = self.embed([prompt])
+        if vectors is None:
+            return None, None
+        vec = vectors[0]
+        with self._lock:
+            self._expire(scope)
+            entry = self._scopes.get(scope)
+            if not entry or not entry['responses']:
+                return None, vec
+            sims = entry['vectors'] @ vec
+            best = int(np.argmax(sims))
+            if sims[best] >= self.similarity_threshold:
+                return entry['responses'][best], vec
+        return None, vec
+
+    def store(self, vec, response, scope):
+        if vec is None:
+            return
+        with self._lock:
+            entry = self._scopes.get(scope)
+            if entry is None or entry['vectors'].shape[1] != vec.shape[0]:
+                entry = {'vectors': np.empty((0, vec.shape[0]), dtype=np.float32), 'responses': [], 'times': []}
+                self._scopes[scope] = entry
+            entry['vectors'] = np.vstack([entry['vectors'], vec[None, :]])[-self.max_entries:]
+            entry['responses'] = (entry['responses'] + [response])[-self.max_entries:]
+            entry['times'] = (entry['times'] + [time.time()])[-self.max_entries:]
+
+    def _expire(self, scope):
+        entry = self._scopes.get(scope)
+        if not entry or not entry['times']:
+            return
+        cutoff = time.time() - self.ttl
+        keep = [i for i, ts in enumerate(entry['times']) if ts >= cutoff]
+        if len(keep) != len(entry['times']):
+            entry['vectors'] = entry['vectors'][keep]
+            entry['responses'] = [entry['responses'][i] for i in keep]
+            entry['times'] = [entry['times'][i] for i in keep]
+
+_SEMANTIC_CACHE = SemanticCache()
+
+# --- CONCURRENT OLLAMA REQUESTS ---
+OLLAMA_GENERATE_URL = "http://localhost:11434/api/generate"
+
+def warm_ollama_model(model="llama2-uncensored:latest"):
+    """Have Ollama load the model into memory (a generate request with no prompt).
+
+    Returns once the model is resident; best effort, errors are ignored.
+    """
+    try:
+        _OLLAMA_SESSION.post(OLLAMA_GENERATE_URL, json={'model': model}, timeout=120)
+    except Exception:
+        pass
+
+def _ollama_failed(text):
+    """True if text is one of query_ollama's error/empty-response strings rather than model output."""
+    return not text or text.startswith("Ollama error") or text == "No response from Ollama."
+
+# Per-brain INSERT statements; formatted once per MemoryCore so sqlite3's
+# statement cache sees the exact same SQL text on every call
+INSERT_MEM_SQL = "INSERT INTO memory_{brain} (timestamp, input, from_brain, importance, context, learned) VALUES (?, ?, ?, ?, ?, ?)"
+INSERT_CONV_SQL = "INSERT INTO conversation_{brain} (timestamp, input, response, from_brain) VALUES (?, ?, ?, ?)"
+
 # Persistent Memory using SQLite
 class MemoryCore:
+    # Applied once per connection; WAL lets readers and the writer run concurrently
+    SQLITE_PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-64000",
+    )
+    # Single add_memory/add_conversation calls are buffered and written together after this delay
+    FLUSH_DELAY = 0.5
+
     def __init__(self, db_path, brain_name):
         self.db_path = db_path
         self.brain_name = brain_name
+        self._insert_mem_sql = INSERT_MEM_SQL.format(brain=brain_name)
+        self._insert_conv_sql = INSERT_CONV_SQL.format(brain=brain_name)
+        self._local = threading.local()
+        # Per-thread connections keyed by thread, so close() can release them all at exit
+        # and connections of threads that have since exited can be closed on the way
+        self._conns = {}
+        self._conns_lock = threading.Lock()
+        self._pending_memories = []
+        self._pending_convs = []
+        self._pending_lock = threading.Lock()
+        # Held across a flush's swap and write, so a flush() returns only once every row
+        # queued before it is committed, even if the timer thread's flush was mid-write
+        self._flush_lock = threading.Lock()
+        self._flush_timer = None
+        atexit.register(self.close)
         self._init_db()
+        self._faiss = None
+        self._load_vector_index()
+
+    def _conn(self):
+        """Return this thread's long-lived connection, creating and tuning it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            for pragma in self.SQLITE_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            with self._conns_lock:
+                dead = [t for t in self._conns if not t.is_alive()]
+                stale = [self._conns.pop(t) for t in dead]
+                self._conns[threading.current_thread()] = conn
+            self._close_all(stale)
+        return conn
+
+    def _release_conn(self):
+        """Close this thread's connection; for short-lived threads such as the flush timer."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._conns_lock:
+            self._conns.pop(threading.current_thread(), None)
+        self._close_all([conn])
+
+    @staticmethod
+    def _close_all(conns):
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def close(self):
+        """Flush pending writes and close every thread's connection (checkpoints the WAL)."""
+        self.flush()
+        with self._conns_lock:
+            conns, self._conns = list(self._conns.values()), {}
+        self._close_all(conns)
+        self._local = threading.local()
 
     def _init_db(self):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
+        c = self._conn().cursor()
         c.execute(f"""
         CREATE TABLE IF NOT EXISTS memory_{self.brain_name} (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -152,10 +630,15 @@ class MemoryCore:
         # Migration: Add response column if it doesn't exist
         try:
             c.execute(f"ALTER TABLE memory_{self.brain_name} ADD COLUMN response TEXT")
-            conn.commit()
         except sqlite3.OperationalError:
             # Column already exists, which is fine
             pass
+        # Migration: flag search-and-learn rows so history lookups use an index instead of LIKE
+        try:
+            c.execute(f"ALTER TABLE memory_{self.brain_name} ADD COLUMN learned INTEGER DEFAULT 0")
+            c.execute(f"UPDATE memory_{self.brain_name} SET learned = 1 WHERE context LIKE '%LEARNED_KNOWLEDGE%'")
+        except sqlite3.OperationalError:
+            pass
         
         c.execute(f"""
         CREATE TABLE IF NOT EXISTS conversation_{self.brain_name} (
@@ -172,72 +655,247 @@ class MemoryCore:
             memory_id INTEGER,
             timestamp TEXT,
             summary TEXT,
-            vector TEXT
+            vector BLOB,
+            vector_scale REAL
         )""")
-        conn.commit()
-        conn.close()
+        # Migration: older tables lack vector_scale (vectors are now packed BLOBs, not JSON text)
+        try:
+            c.execute(f"ALTER TABLE memory_meta_{self.brain_name} ADD COLUMN vector_scale REAL")
+        except sqlite3.OperationalError:
+            pass
+        # Indexes for recency / importance recall
+        c.execute(f"CREATE INDEX IF NOT EXISTS idx_memory_{self.brain_name}_ts ON memory_{self.brain_name}(timestamp DESC)")
+        c.execute(f"CREATE INDEX IF NOT EXISTS idx_memory_{self.brain_name}_imp ON memory_{self.brain_name}(importance DESC)")
+        c.execute(f"CREATE INDEX IF NOT EXISTS idx_memory_{self.brain_name}_learned ON memory_{self.brain_name}(learned, timestamp DESC)")
+        self.fts_enabled = self._init_fts(c)
+
+    def _init_fts(self, c):
+        """Create the FTS5 shadow index over memory input/context. Returns False if FTS5 is unavailable."""
+        b = self.brain_name
+        c.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (f"memory_fts_{b}",))
+        existed = c.fetchone() is not None
+        try:
+            c.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS memory_fts_{b} USING fts5("
+                      f"input, context, content='memory_{b}', content_rowid='id')")
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5; search_memory falls back to LIKE
+            return False
+        c.execute(f"""CREATE TRIGGER IF NOT EXISTS memory_{b}_fts_ai AFTER INSERT ON memory_{b} BEGIN
+            INSERT INTO memory_fts_{b}(rowid, input, context) VALUES (new.id, new.input, new.context);
+        END""")
+        c.execute(f"""CREATE TRIGGER IF NOT EXISTS memory_{b}_fts_ad AFTER DELETE ON memory_{b} BEGIN
+            INSERT INTO memory_fts_{b}(memory_fts_{b}, rowid, input, context) VALUES ('delete', old.id, old.input, old.context);
+        END""")
+        c.execute(f"""CREATE TRIGGER IF NOT EXISTS memory_{b}_fts_au AFTER UPDATE ON memory_{b} BEGIN
+            INSERT INTO memory_fts_{b}(memory_fts_{b}, rowid, input, context) VALUES ('delete', old.id, old.input, old.context);
+            INSERT INTO memory_fts_{b}(rowid, input, context) VALUES (new.id, new.input, new.context);
+        END""")
+        if not existed:
+            # Index rows written before the FTS table existed
+            c.execute(f"INSERT INTO memory_fts_{b}(memory_fts_{b}) VALUES ('rebuild')")
+        return True
+
+    @staticmethod
+    def _fts_query(query):
+        """Turn free text into a safe FTS5 phrase query; the last word matches as a prefix."""
+        tokens = re.findall(r'[^\W_]+', query)
+        if not tokens:
+            return None
+        return '"' + ' '.join(tokens) + '"*'
+
+    @staticmethod
+    def _pack_vector(vec, quantize=False):
+        """Pack an embedding as (blob, scale): float16 bytes, or int8 bytes plus a scale when quantize=True."""
+        vec = np.asarray(vec, dtype=np.float32).ravel()
+        if not quantize:
+            return np.ascontiguousarray(vec, dtype=np.float16).tobytes(), None
+        peak = float(np.max(np.abs(vec))) if vec.size else 0.0
+        scale = peak / 127.0 if peak else 1.0
+        return np.round(vec / scale).astype(np.int8).tobytes(), scale
+
+    @staticmethod
+    def _unpack_vector(blob, scale=None):
+        """Inverse of _pack_vector; also reads legacy JSON-text vectors."""
+        if blob is None:
+            return None
+        if isinstance(blob, str):
+            return np.asarray(json.loads(blob), dtype=np.float32)
+        if scale is not None:
+            return np.frombuffer(blob, dtype=np.int8).astype(np.float32) * scale
+        return np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+
+    def _executemany(self, sql, rows):
+        """Insert many rows inside a single write transaction."""
+        return self._write_batches([(sql, rows)])
+
+    def _write_batches(self, batches):
+        """Run several (sql, rows) executemany batches inside one write transaction."""
+        batches = [(sql, rows) for sql, rows in batches if rows]
+        if not batches:
+            return 0
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, rows in batches:
+                conn.executemany(sql, rows)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return sum(len(rows) for _, rows in batches)
+
+    def _queue_write(self, pending, row):
+        with self._pending_lock:
+            pending.append(row)
+            self._arm_flush_timer()
+
+    def _arm_flush_timer(self):
+        # Caller holds _pending_lock
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.FLUSH_DELAY, self._timed_flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _timed_flush(self):
+        # Each Timer is a fresh thread; don't leave its connection open behind it
+        try:
+            self.flush()
+        finally:
+            self._release_conn()
+
+    def flush(self):
+        """Write buffered memories/conversations in one transaction. Returns rows written.
+
+        If the write fails the rows go back to the front of the queue (and the timer is
+        re-armed to retry them) before the error is raised.
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                memories, self._pending_memories = self._pending_memories, []
+                convs, self._pending_convs = self._pending_convs, []
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+            try:
+                return self._write_batches([(self._insert_mem_sql, memories), (self._insert_conv_sql, convs)])
+            except Exception:
+                with self._pending_lock:
+                    self._pending_memories[:0] = memories
+                    self._pending_convs[:0] = convs
+                    if memories or convs:
+                        self._arm_flush_timer()
+                raise
+
+    @staticmethod
+    def _memory_row(entry):
+        return (entry['timestamp'], entry['input'], entry['from'], entry['importance'], _json_dumps(entry['context']),
+                int('LEARNED_KNOWLEDGE' in entry['context']))
+
+    @staticmethod
+    def _conversation_row(entry):
+        return (entry['timestamp'], entry['input'], entry['response'], entry['from'])
 
     def add_memory(self, entry):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute(
-            f"INSERT INTO memory_{self.brain_name} (timestamp, input, from_brain, importance, context) VALUES (?, ?, ?, ?, ?)",
-            (entry['timestamp'], entry['input'], entry['from'], entry['importance'], json.dumps(entry['context']))
-        )
-        conn.commit()
-        conn.close()
+        self._queue_write(self._pending_memories, self._memory_row(entry))
+
+    def add_memories(self, entries):
+        """Batch version of add_memory. Returns the number of rows written."""
+        self.flush()
+        return self._executemany(self._insert_mem_sql, [self._memory_row(e) for e in entries])
+
+    def add_missing_memories(self, entries):
+        """Like add_memories, but skips entries whose (timestamp, input) is already stored
+        (or repeated within the batch). Returns the written entries, in get_memories() form."""
+        rows = [self._memory_row(e) for e in entries]
+        if not rows:
+            return []
+        self.flush()
+        c = self._conn().cursor()
+        # Only rows at or after the oldest candidate can collide; the timestamp index bounds the scan
+        c.execute(f"SELECT timestamp, input FROM memory_{self.brain_name} WHERE timestamp >= ?",
+                  (min(row[0] for row in rows),))
+        seen = set(c.fetchall())
+        new_rows, added = [], []
+        for row, entry in zip(rows, entries):
+            key = (row[0], row[1])
+            if key not in seen:
+                seen.add(key)
+                new_rows.append(row)
+                added.append({k: entry[k] for k in ('timestamp', 'input', 'from', 'importance', 'context')})
+        self._executemany(self._insert_mem_sql, new_rows)
+        return added
     
     def save_insight(self, topic, summary, from_brain, importance, contexts):
         """Save a learning insight to memory with proper structure."""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
+        self.flush()
+        c = self._conn().cursor()
         c.execute(
-            f"INSERT INTO memory_{self.brain_name} (timestamp, input, response, from_brain, importance, context) VALUES (?, ?, ?, ?, ?, ?)",
-            (datetime.datetime.now().isoformat(), topic, summary, from_brain, importance, json.dumps(contexts))
+            f"INSERT INTO memory_{self.brain_name} (timestamp, input, response, from_brain, importance, context, learned) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (datetime.datetime.now().isoformat(), topic, summary, from_brain, importance, _json_dumps(contexts),
+             int('LEARNED_KNOWLEDGE' in contexts))
         )
-        conn.commit()
-        conn.close()
 
-    def get_memories(self):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute(f"SELECT timestamp, input, from_brain, importance, context FROM memory_{self.brain_name}")
+    def get_memories(self, limit=None, min_importance=None):
+        """Return memories oldest-first. `limit` keeps only the most recent N; `min_importance` filters in SQL."""
+        sql = f"SELECT timestamp, input, from_brain, importance, context FROM memory_{self.brain_name}"
+        params = []
+        if min_importance is not None:
+            sql += " WHERE importance >= ?"
+            params.append(min_importance)
+        if limit is not None:
+            sql += " ORDER BY id DESC LIMIT ?"
+            params.append(int(limit))
+        else:
+            sql += " ORDER BY id"
+        self.flush()
+        c = self._conn().cursor()
+        c.execute(sql, params)
         rows = c.fetchall()
-        conn.close()
+        if limit is not None:
+            rows.reverse()
         return [
             {
                 'timestamp': row[0],
                 'input': row[1],
                 'from': row[2],
                 'importance': row[3],
-                'context': json.loads(row[4]) if row[4] else []
+                'context': _json.loads(row[4]) if row[4] else []
             } for row in rows
         ]
 
     def clear_memory(self):
-        conn = sqlite3.connect(self.db_path)
+        with self._pending_lock:
+            self._pending_memories, self._pending_convs = [], []
+        conn = self._conn()
         c = conn.cursor()
-        c.execute(f"DELETE FROM memory_{self.brain_name}")
-        c.execute(f"DELETE FROM conversation_{self.brain_name}")
-        conn.commit()
-        conn.close()
+        c.execute("BEGIN")
+        try:
+            c.execute(f"DELETE FROM memory_{self.brain_name}")
+            c.execute(f"DELETE FROM conversation_{self.brain_name}")
+        except Exception:
+            conn.rollback()
+            raise
+        c.execute("COMMIT")
 
     def add_conversation(self, entry):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute(
-            f"INSERT INTO conversation_{self.brain_name} (timestamp, input, response, from_brain) VALUES (?, ?, ?, ?)",
-            (entry['timestamp'], entry['input'], entry['response'], entry['from'])
-        )
-        conn.commit()
-        conn.close()
-
-    def get_conversations(self):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute(f"SELECT timestamp, input, response, from_brain FROM conversation_{self.brain_name}")
-        rows = c.fetchall()
-        conn.close()
+        self._queue_write(self._pending_convs, self._conversation_row(entry))
+
+    def add_conversations(self, entries):
+        """Batch version of add_conversation. Returns the number of rows written."""
+        self.flush()
+        return self._executemany(self._insert_conv_sql, [self._conversation_row(e) for e in entries])
+
+    def get_conversations(self, limit=None):
+        """Return conversations oldest-first; `limit` keeps only the most recent N."""
+        self.flush()
+        c = self._conn().cursor()
+        if limit is None:
+            c.execute(f"SELECT timestamp, input, response, from_brain FROM conversation_{self.brain_name} ORDER BY id")
+            rows = c.fetchall()
+        else:
+            c.execute(f"SELECT timestamp, input, response, from_brain FROM conversation_{self.brain_name} ORDER BY id DESC LIMIT ?", (int(limit),))
+            rows = c.fetchall()
+            rows.reverse()
         return [
             {
                 'timestamp': row[0],
@@ -247,84 +905,182 @@ class MemoryCore:
             } for row in rows
         ]
 
-    def search_memory(self, query):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute(f"SELECT timestamp, input, from_brain, importance, context FROM memory_{self.brain_name} WHERE input LIKE ? OR context LIKE ?", 
-                  (f"%{query}%", f"%{query}%"))
+    def search_memory(self, query, limit=50):
+        self.flush()
+        c = self._conn().cursor()
+        match = self._fts_query(query) if self.fts_enabled else None
+        if match:
+            b = self.brain_name
+            c.execute(f"SELECT m.timestamp, m.input, m.from_brain, m.importance, m.context FROM memory_fts_{b} f "
+                      f"JOIN memory_{b} m ON m.id = f.rowid WHERE memory_fts_{b} MATCH ? ORDER BY rank LIMIT ?",
+                      (match, limit))
+        else:
+            c.execute(f"SELECT timestamp, input, from_brain, importance, context FROM memory_{self.brain_name} WHERE input LIKE ? OR context LIKE ? LIMIT ?", 
+                      (f"%{query}%", f"%{query}%", limit))
         rows = c.fetchall()
-        conn.close()
         return [
             (
                 row[0],
                 row[1],
                 f"Processed by {self.brain_name}",
                 row[3],
-                json.loads(row[4]) if row[4] else []
+                _json.loads(row[4]) if row[4] else []
             ) for row in rows
         ]
 
+    def get_learned_knowledge(self, limit=200):
+        """Newest memories saved by search-and-learn: (timestamp, topic, summary, importance) rows."""
+        self.flush()
+        c = self._conn().cursor()
+        # Seeks the (learned, timestamp) index and reads at most `limit` rows
+        c.execute(f"SELECT timestamp, input, response, importance FROM memory_{self.brain_name} "
+                  f"WHERE learned = 1 ORDER BY timestamp DESC LIMIT ?", (limit,))
+        return c.fetchall()
+
     def summarize_recent_memories(self, count=20, model="llama2-uncensored:latest"):
         """Create a concise summary of the most recent `count` memories using the local Ollama model.
 
         Stores the summary in the memory_meta table for later retrieval.
         """
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute(f"SELECT id, timestamp, input, from_brain, importance, context FROM memory_{self.brain_name} ORDER BY id DESC LIMIT ?", (count,))
+        self.flush()
+        c = self._conn().cursor()
+        c.execute(f"SELECT id, timestamp, input, from_brain, importance FROM memory_{self.brain_name} ORDER BY id DESC LIMIT ?", (count,))
         rows = c.fetchall()
-        conn.close()
         if not rows:
             return None
         # Build a prompt for summarization
         items = []
         for r in reversed(rows):
-            ts, inp, frm, imp, ctx = r[1], r[2], r[3], r[4], r[5]
+            ts, inp, frm, imp = r[1], r[2], r[3], r[4]
             items.append(f"[{ts}] ({frm}) importance={imp}: {inp}")
         prompt = "Create a concise, bulleted summary (3-6 bullets) capturing the key points, themes, and any high-importance items from these memories:\n\n"
         prompt += "\n".join(items)
         try:
-            summary = query_ollama(prompt, model=model, max_tokens=256)
+            # Deterministic, so a repeat of the same memories is answered from the response caches
+            summary = query_ollama(prompt, model=model, max_tokens=256, temperature=0)
         except Exception as e:
-            summary = f"Summary generation failed: {str(e)}"
+            return f"Summary generation failed: {str(e)}"
+        # query_ollama reports failures as text; never embed, index or store those
+        if _ollama_failed(summary):
+            return f"Summary generation failed: {summary}"
+        # embed the summary for similarity retrieval (optional: needs an embedding model in Ollama)
+        vector, scale = None, None
+        try:
+            vector, scale = self._pack_vector(embed_texts([summary])[0])
+        except Exception:
+            pass
         # store summary
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute(f"INSERT INTO memory_meta_{self.brain_name} (memory_id, timestamp, summary, vector) VALUES (?, ?, ?, ?)", (None, datetime.datetime.now().isoformat(), summary, None))
-        conn.commit()
-        conn.close()
+        c = self._conn().cursor()
+        c.execute(f"INSERT INTO memory_meta_{self.brain_name} (memory_id, timestamp, summary, vector, vector_scale) VALUES (?, ?, ?, ?, ?)", (None, datetime.datetime.now().isoformat(), summary, vector, scale))
+        if vector is not None:
+            self._index_vector(c.lastrowid, self._unpack_vector(vector, scale))
         return summary
 
     def get_memory_summaries(self, limit=10):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
+        c = self._conn().cursor()
         c.execute(f"SELECT timestamp, summary FROM memory_meta_{self.brain_name} ORDER BY id DESC LIMIT ?", (limit,))
         rows = c.fetchall()
-        conn.close()
         return [{'timestamp': r[0], 'summary': r[1]} for r in rows]
 
+    def get_summary_vectors(self):
+        """Return (summaries, matrix) for every summary that has an embedding; matrix is float32 [N, D]."""
+        c = self._conn().cursor()
+        c.execute(f"SELECT id, timestamp, summary, vector, vector_scale FROM memory_meta_{self.brain_name} WHERE vector IS NOT NULL ORDER BY id")
+        summaries, vectors = [], []
+        for meta_id, ts, summary, blob, scale in c.fetchall():
+            vec = self._unpack_vector(blob, scale)
+            if vectors and vec.shape != vectors[0].shape:
+                continue  # embedding model changed; skip mismatched dimensions
+            summaries.append({'id': meta_id, 'timestamp': ts, 'summary': summary})
+            vectors.append(vec)
+        matrix = np.vstack(vectors) if vectors else np.empty((0, 0), dtype=np.float32)
+        return summaries, matrix
+
+    def _vector_index_path(self):
+        return f"{os.path.splitext(self.db_path)[0]}_{self.brain_name}.faiss"
+
+    @staticmethod
+    def _new_vector_index(dim):
+        # Embeddings are L2-normalised, so inner product is cosine similarity
+        index = faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efSearch = 64
+        return faiss.IndexIDMap2(index)  # faiss ids are memory_meta row ids
+
+    def _load_vector_index(self):
+        """Open the persisted faiss index, rebuilding it from SQLite if missing or out of date."""
+        if faiss is None:
+            return
+        summaries, matrix = self.get_summary_vectors()
+        path = self._vector_index_path()
+        if os.path.exists(path):
+            try:
+                index = faiss.read_index(path)
+                if index.ntotal == len(summaries) and (not summaries or index.d == matrix.shape[1]):
+                    self._faiss = index
+                    return
+            except RuntimeError:
+                pass
+        if summaries:
+            self._faiss = self._new_vector_index(matrix.shape[1])
+            self._faiss.add_with_ids(matrix, np.array([s['id'] for s in summaries], dtype=np.int64))
+
+    def _index_vector(self, meta_id, vec):
+        if faiss is None:
+            return
+        vec = np.asarray(vec, dtype=np.float32).reshape(1, -1)
+        if self._faiss is None:
+            self._faiss = self._new_vector_index(vec.shape[1])
+        elif self._faiss.d != vec.shape[1]:
+            return  # embedding model changed; matches get_summary_vectors skipping mismatched rows
+        self._faiss.add_with_ids(vec, np.array([meta_id], dtype=np.int64))
+
+    def save_vector_index(self):
+        """Persist the faiss index next to the database (no-op without faiss)."""
+        if self._faiss is not None:
+            faiss.write_index(self._faiss, self._vector_index_path())
+
+    def search_by_vector(self, query_vec, k=5):
+        """Return up to k summaries most similar to query_vec, each with a cosine 'score'."""
+        query = np.asarray(query_vec, dtype=np.float32).reshape(1, -1)
+        if faiss is not None:
+            if self._faiss is None or self._faiss.d != query.shape[1]:
+                return []
+            scores, ids = self._faiss.search(query, k)
+            hits = [(int(i), float(sc)) for i, sc in zip(ids[0], scores[0]) if i != -1]
+            if not hits:
+                return []
+            c = self._conn().cursor()
+            c.execute(f"SELECT id, timestamp, summary FROM memory_meta_{self.brain_name} WHERE id IN ({','.join('?' * len(hits))})",
+                      [i for i, _ in hits])
+            rows = {r[0]: r for r in c.fetchall()}
+            return [{'id': i, 'timestamp': rows[i][1], 'summary': rows[i][2], 'score': sc} for i, sc in hits if i in rows]
+        # Without faiss: exact scan over the packed summary vectors
+        summaries, matrix = self.get_summary_vectors()
+        if not summaries or matrix.shape[1] != query.shape[1]:
+            return []
+        scores = matrix @ query[0]
+        top = np.argsort(-scores)[:k]
+        return [dict(summaries[i], score=float(scores[i])) for i in top]
+
     def prune_memory(self, max_age_days=90, importance_threshold=3):
         """Prune low-importance memories older than max_age_days. Returns number deleted."""
         cutoff_dt = datetime.datetime.now() - datetime.timedelta(days=max_age_days)
         cutoff = cutoff_dt.isoformat()
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
+        self.flush()
+        c = self._conn().cursor()
         # Delete from memory table
         c.execute(f"DELETE FROM memory_{self.brain_name} WHERE timestamp < ? AND importance <= ?", (cutoff, importance_threshold))
         deleted = c.rowcount
-        conn.commit()
-        conn.close()
         return deleted
 
     def export_memory(self, filepath):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
+        self.flush()
+        c = self._conn().cursor()
         c.execute(f"SELECT timestamp, input, from_brain, importance, context FROM memory_{self.brain_name}")
         rows = c.fetchall()
-        conn.close()
         out = []
         for r in rows:
-            out.append({'timestamp': r[0], 'input': r[1], 'from': r[2], 'importance': r[3], 'context': json.loads(r[4]) if r[4] else []})
+            out.append({'timestamp': r[0], 'input': r[1], 'from': r[2], 'importance': r[3], 'context': _json.loads(r[4]) if r[4] else []})
         with open(filepath, 'w', encoding='utf-8') as fh:
             json.dump(out, fh, indent=2)
         return filepath
@@ -356,6 +1112,40 @@ class TriadicConsciousness:
         self.slow_harmony = self.slow_harmony * 0.95 + self.medium_harmony * 0.05
         return self.get_overall_resonance()
 
+    @staticmethod
+    def _iir(x, a, b, y0, block=64):
+        """Evaluate y[k] = a*y[k-1] + b*x[k] over the whole array, starting from y[-1] = y0."""
+        if lfilter is not None:
+            return lfilter([b], [1.0, -a], x, zi=[a * y0])[0]
+        # Closed form per block: y[k] = a^(k+1)*y0 + b*sum_j a^(k-j)*x[j]; blocking keeps a^-k bounded
+        y = np.empty_like(x)
+        powers = a ** np.arange(1, block + 1)
+        for start in range(0, len(x), block):
+            chunk = x[start:start + block]
+            p = powers[:len(chunk)]
+            y[start:start + block] = p * (y0 + b * np.cumsum(chunk / p))
+            y0 = y[start + len(chunk) - 1]
+        return y
+
+    def update_harmony_batch(self, resonances) -> np.ndarray:
+        """Apply update_harmony to every value in `resonances` without a Python loop.
+
+        Each layer is a first-order IIR filter of the one below it, so the three
+        trajectories are evaluated as chained filters. Leaves the model in the same
+        state as the equivalent sequence of update_harmony calls and returns the
+        overall resonance after each step.
+        """
+        r = np.asarray(resonances, dtype=np.float64).ravel()
+        if r.size == 0:
+            return np.empty(0)
+        fast = self._iir(r, 0.7, 0.3, self.fast_harmony)
+        medium = self._iir(fast, 0.9, 0.1, self.medium_harmony)
+        slow = self._iir(medium, 0.95, 0.05, self.slow_harmony)
+        self.fast_harmony = float(fast[-1])
+        self.medium_harmony = float(medium[-1])
+        self.slow_harmony = float(slow[-1])
+        return np.cbrt(fast * medium * slow)
+
     def get_overall_resonance(self) -> float:
         # Geometric mean of the three layers (keeps range ~0..1)
         return (self.fast_harmony * self.medium_harmony * self.slow_harmony) ** (1.0 / 3.0)
@@ -389,14 +1179,225 @@ def analyze_triadic_ratios(measurements):
     else:
         return {"type": "custom", "ratios": ratios}
 
+def analyze_triadic_ratios_batch(m):
+    """Vectorised analyze_triadic_ratios for an (N, 3) array of measurements.
+
+    Returns an (N,) array of pattern types ('harmonic', 'geometric', 'golden',
+    'custom' or 'invalid') using the same thresholds as the scalar version.
+    """
+    s = np.sort(np.asarray(m, dtype=np.float64).reshape(-1, 3), axis=1)
+    valid = s[:, 0] != 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r1 = s[:, 1] / s[:, 0]
+        r2 = s[:, 2] / s[:, 0]
+    conditions = [
+        ~valid,
+        (np.abs(r1 - 2) < 0.1) & (np.abs(r2 - 3) < 0.1),
+        (np.abs(r1 - 1.33) < 0.1) & (np.abs(r2 - 1.66) < 0.1),
+        np.abs(r1 - 1.618) < 0.1,
+    ]
+    return np.select(conditions, ['invalid', 'harmonic', 'geometric', 'golden'], default='custom')
+
+def compile_trigger_matcher(triggers):
+    """Build a one-pass matcher over trigger phrases.
+
+    Returns a function mapping lowercased text to the set of triggers it
+    contains, backed by an Aho-Corasick automaton when pyahocorasick is
+    installed, otherwise by one alternation regex per distinct trigger length.
+    Every trigger present is reported, including ones that are prefixes of others:
+
+    >>> sorted(compile_trigger_matcher(['hi', 'hi there'])('hi there friend'))
+    ['hi', 'hi there']
+    """
+    triggers = list(triggers)
+    if not triggers:
+        return lambda text: set()
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for trigger in triggers:
+            if trigger:
+                automaton.add_word(trigger, trigger)
+        if not len(automaton):
+            return lambda text: set(triggers)  # only the empty trigger, which is in every text
+        automaton.make_automaton()
+        always = {''} if '' in triggers else set()
+        return lambda text: always | {trigger for _, trigger in automaton.iter(text)}
+    # Zero-width lookahead so overlapping triggers are all reported. A lookahead captures
+    # one alternative per position, so triggers are split by length: within a group no
+    # trigger can be a prefix of another, and every trigger present is found.
+    by_length = collections.defaultdict(list)
+    for trigger in set(triggers):
+        by_length[len(trigger)].append(re.escape(trigger))
+    patterns = [re.compile('(?=(' + '|'.join(group) + '))') for group in by_length.values()]
+    return lambda text: {trigger for pattern in patterns for trigger in pattern.findall(text)}
+
+# Harmonic frequencies 2^(k/40) for k = 0..40, precomputed for the depth-40 callers
+HARMONIC_TABLE_DEPTH = 40
+_HARMONIC_FREQS = np.array([2.0 ** (k / 40.0) for k in range(HARMONIC_TABLE_DEPTH + 1)])
+
+def _fractal_harmonic_kernel(x, y, depth):
+    """Iterative form of the recursive fractal harmonic:
+    h(x, y, d) = sin(2^(d/40) x) + cos(2^(d/40) y) + 0.5 * h(x/2, y/2, d-1), h(., ., 0) = 0.
+    """
+    val = 0.0
+    weight = 1.0
+    for i in range(depth):
+        k = depth - i
+        # Harmonic frequency scaling, from the table when in range
+        freq = _HARMONIC_FREQS[k] if k <= HARMONIC_TABLE_DEPTH else 2.0 ** (k / 40.0)
+        val += weight * (math.sin(freq * x) + math.cos(freq * y))
+        x *= 0.5
+        y *= 0.5
+        weight *= 0.5
+    return val
+
+if njit is not None:
+    # Eager, single-signature compile: int and float callers share one cached
+    # specialisation instead of each type combination triggering a lazy recompile
+    fractal_harmonic = njit("float64(float64, float64, int64)", cache=True, fastmath=True)(_fractal_harmonic_kernel)
+else:
+    FRACTAL_QUANTUM = 100_000  # Cache key resolution (1e-5), matches the old round(x, 5) key
+
+    @functools.lru_cache(maxsize=8192)
+    def _fractal_harmonic_cached(xi, yi, depth):
+        return _fractal_harmonic_kernel(xi / FRACTAL_QUANTUM, yi / FRACTAL_QUANTUM, depth)
+
+    def fractal_harmonic(x, y, depth):
+        # Integer-quantised keys: cheap to hash and bounded by the LRU size
+        return _fractal_harmonic_cached(round(x * FRACTAL_QUANTUM), round(y * FRACTAL_QUANTUM), int(depth))
+
+# Triangles of a unit cube (x, y scaled by size and z by height in generate_stl)
+UNIT_CUBE_TRIANGLES = np.array([
+    [[0, 0, 0], [1, 0, 0], [1, 1, 0]],  # Bottom face
+    [[0, 0, 0], [0, 1, 0], [1, 1, 0]],
+    [[0, 0, 1], [1, 0, 1], [1, 1, 1]],  # Top face
+    [[0, 0, 1], [0, 1, 1], [1, 1, 1]],
+    [[0, 0, 0], [0, 0, 1], [0, 1, 1]],  # Left face
+    [[0, 0, 0], [0, 1, 0], [0, 1, 1]],
+    [[1, 0, 0], [1, 0, 1], [1, 1, 1]],  # Right face
+    [[1, 0, 0], [1, 1, 0], [1, 1, 1]],
+    [[0, 0, 0], [1, 0, 0], [1, 0, 1]],  # Front face
+    [[0, 0, 0], [0, 0, 1], [1, 0, 1]],
+    [[0, 1, 0], [1, 1, 0], [1, 1, 1]],  # Back face
+    [[0, 1, 0], [0, 1, 1], [1, 1, 1]],
+], dtype=np.float32)
+UNIT_CUBE_TRIANGLES.setflags(write=False)
+
+# generate_svg shapes
+SVG_CIRCLE_TEMPLATE = ('<svg height="{h}" width="{w}"><circle cx="{cx}" cy="{cy}" r="{r}" '
+                       'stroke="black" stroke-width="2" fill="pink" /></svg>')
+SVG_RECT_TEMPLATE = ('<svg height="{h}" width="{w}"><rect x="10" y="10" width="{rw}" height="{rh}" '
+                     'stroke="black" stroke-width="2" fill="blue" /></svg>')
+
+def fractal_harmonic_grid(x, y, depth):
+    """NumPy form of _fractal_harmonic_kernel: evaluates the harmonic over whole (broadcastable) arrays.
+
+    Pass x as a row and y as a column to get a grid: sin/cos then run once per
+    row/column value instead of once per grid point.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    val = np.zeros(np.broadcast_shapes(x.shape, y.shape))
+    weight = 1.0
+    for i in range(depth):
+        k = depth - i
+        freq = _HARMONIC_FREQS[k] if k <= HARMONIC_TABLE_DEPTH else 2.0 ** (k / 40.0)
+        # Accumulate each term in place; broadcasting happens in the add, with no grid-sized temporaries
+        val += weight * np.sin(freq * x)
+        val += weight * np.cos(freq * y)
+        x = x * 0.5
+        y = y * 0.5
+        weight *= 0.5
+    return val
+
+# Directories skipped when scanning a project tree (VCS metadata, dependency caches)
+TREE_IGNORE_DIRS = {'.git', '.hg', '.svn', 'node_modules', '__pycache__'}
+
+def _iter_tree(root, ignore=TREE_IGNORE_DIRS):
+    """Yield os.DirEntry objects for every file under root.
+
+    Uses os.scandir so the per-entry type and stat information come from the
+    directory read itself instead of one extra stat() call per file.
+    """
+    pending = collections.deque([root])
+    while pending:
+        current = pending.popleft()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in ignore:
+                                pending.append(entry.path)
+                        elif entry.is_file():
+                            yield entry
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+def _read_text(path):
+    """Read a whole file as UTF-8 text (undecodable bytes dropped, newlines normalised to \\n).
+
+    One unbuffered readinto() fills a buffer sized from fstat, instead of the text
+    layer reading and decoding the file in chunks.
+    """
+    with open(path, 'rb', buffering=0) as f:
+        buf = bytearray(os.fstat(f.fileno()).st_size)
+        filled = 0
+        with memoryview(buf) as view:
+            while filled < len(buf):
+                n = f.readinto(view[filled:])
+                if not n:
+                    break  # file shrank since fstat
+                filled += n
+        del buf[filled:]
+        buf += f.readall()  # file grew since fstat
+    text = buf.decode('utf-8', errors='ignore')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+class _WatchEventHandler(FileSystemEventHandler):
+    """Pushes (path, action) for file create/modify events onto a queue."""
+
+    def __init__(self, event_queue, ignore=TREE_IGNORE_DIRS):
+        super().__init__()
+        self.event_queue = event_queue
+        self.ignore = ignore
+
+    def _push(self, path, action):
+        parts = set(os.path.normpath(path).split(os.sep))
+        if not (parts & self.ignore):
+            self.event_queue.put((path, action))
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self._push(event.src_path, 'created')
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self._push(event.src_path, 'modified')
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self._push(event.dest_path, 'created')
+
 class ProjectAgent:
     """Agent that can physically work with files in a selected directory or web content."""
     
+    FILE_CACHE_MAX = 256
+    WEB_CACHE_MAX = 64
+    # analyze_project reports progress after every this many files
+    ANALYZE_PROGRESS_EVERY = 256
+
     def __init__(self, name="ProjectAgent"):
         self.name = name
         self.working_directory = None
-        self.file_cache = {}
-        self.web_cache = {}
+        self.file_cache = collections.OrderedDict()  # full path -> (mtime_ns, zstd blob or raw str), LRU order
+        self.web_cache = collections.OrderedDict()  # url -> extracted text + validators, LRU order
+        self._zctx = zstd.ZstdCompressor(level=3) if zstd else None
+        self._zdctx = zstd.ZstdDecompressor() if zstd else None
         
     def set_working_directory(self, path):
         """Set the project directory to work with."""
@@ -406,21 +1407,25 @@ class ProjectAgent:
         else:
             return f"❌ Invalid directory: {path}"
     
-    def list_files(self, pattern="*"):
-        """List all files in the working directory matching pattern."""
+    def list_files(self, pattern="*", limit=50):
+        """List up to `limit` files in the working directory matching pattern.
+
+        The directory walk stops as soon as one file past the limit is seen; `has_more` reports it.
+        """
         if not self.working_directory:
             return "❌ No working directory set. Use 'Set Project Folder' first."
         
         try:
-            import glob
             full_pattern = os.path.join(self.working_directory, "**", pattern)
-            files = glob.glob(full_pattern, recursive=True)
-            files = [f for f in files if os.path.isfile(f)]
-            relative_files = [os.path.relpath(f, self.working_directory) for f in files]
+            files = (f for f in glob.iglob(full_pattern, recursive=True) if os.path.isfile(f))
+            relative_files = [os.path.relpath(f, self.working_directory) for f in itertools.islice(files, limit + 1)]
+            has_more = len(relative_files) > limit
+            del relative_files[limit:]
             return {
                 "count": len(relative_files),
-                "files": relative_files[:50],  # Limit to 50 for display
-                "message": f"Found {len(relative_files)} files matching '{pattern}'"
+                "files": relative_files,
+                "has_more": has_more,
+                "message": f"Found {len(relative_files)}{'+' if has_more else ''} files matching '{pattern}'"
             }
         except Exception as e:
             return f"❌ Error listing files: {str(e)}"
@@ -435,11 +1440,7 @@ class ProjectAgent:
             if not os.path.isfile(full_path):
                 return f"❌ File not found: {relative_path}"
             
-            # Cache the file content
-            with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            self.file_cache[relative_path] = content
+            content = self._cached_read(full_path)
             return {
                 "path": relative_path,
                 "size": len(content),
@@ -450,8 +1451,49 @@ class ProjectAgent:
         except Exception as e:
             return f"❌ Error reading file: {str(e)}"
     
+    def map_file(self, relative_path):
+        """Memory-map a file from the working directory for read-only, front-to-back viewing.
+
+        Returns the mmap (None for an empty file), or an error string like read_file.
+        """
+        if not self.working_directory:
+            return "❌ No working directory set."
+        full_path = os.path.join(self.working_directory, relative_path)
+        if not os.path.isfile(full_path):
+            return f"❌ File not found: {relative_path}"
+        try:
+            with open(full_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return None
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            return f"❌ Error reading file: {str(e)}"
+        if hasattr(mapped, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        return mapped
+
+    def _cached_read(self, full_path):
+        """Return file text, served from file_cache while the file's mtime is unchanged."""
+        mtime = os.stat(full_path).st_mtime_ns
+        cached = self.file_cache.get(full_path)
+        if cached is not None and cached[0] == mtime:
+            self.file_cache.move_to_end(full_path)
+            blob = cached[1]
+            return self._zdctx.decompress(blob).decode('utf-8') if self._zdctx else blob
+
+        content = _read_text(full_path)
+        blob = self._zctx.compress(content.encode('utf-8')) if self._zctx else content
+        self.file_cache[full_path] = (mtime, blob)
+        self.file_cache.move_to_end(full_path)
+        while len(self.file_cache) > self.FILE_CACHE_MAX:
+            self.file_cache.popitem(last=False)
+        return content
+
     def write_file(self, relative_path, content, backup=True):
-        """Write content to a file in the working directory."""
+        """Write content (str, or already-encoded UTF-8 bytes) to a file in the working directory.
+
+        The data goes to a temporary file beside the target, which is then renamed over it.
+        """
         if not self.working_directory:
             return "❌ No working directory set."
         
@@ -461,22 +1503,36 @@ class ProjectAgent:
             # Create backup if file exists
             if backup and os.path.isfile(full_path):
                 backup_path = full_path + ".backup"
-                import shutil
                 shutil.copy2(full_path, backup_path)
             
             # Ensure directory exists
             os.makedirs(os.path.dirname(full_path), exist_ok=True)
             
-            # Write the file
-            with open(full_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # Write the file, with the newline translation a text-mode write would do
+            data = content.encode('utf-8') if isinstance(content, str) else content
+            if os.linesep != '\n':
+                data = data.replace(b'\n', os.linesep.encode('ascii'))
+            tmp_path = full_path + '.tmp'
+            try:
+                with open(tmp_path, 'wb', buffering=1 << 20) as f:
+                    f.write(data)
+                if os.path.isfile(full_path):
+                    shutil.copymode(full_path, tmp_path)
+                os.replace(tmp_path, full_path)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_path)
+                raise
             
-            return f"✅ Wrote {len(content)} characters to {relative_path}"
+            return f"✅ Wrote {len(data)} bytes to {relative_path}"
         except Exception as e:
             return f"❌ Error writing file: {str(e)}"
     
-    def analyze_project(self):
-        """Analyze the project structure and provide a summary."""
+    def analyze_project(self, progress=None):
+        """Analyze the project structure and provide a summary.
+
+        If given, progress(files_seen, bytes_seen) is called every ANALYZE_PROGRESS_EVERY files.
+        """
         if not self.working_directory:
             return "❌ No working directory set."
         
@@ -485,17 +1541,17 @@ class ProjectAgent:
             total_size = 0
             total_files = 0
             
-            for root, dirs, files in os.walk(self.working_directory):
-                for file in files:
-                    total_files += 1
-                    ext = os.path.splitext(file)[1] or 'no_extension'
-                    file_types[ext] = file_types.get(ext, 0) + 1
-                    
-                    try:
-                        full_path = os.path.join(root, file)
-                        total_size += os.path.getsize(full_path)
-                    except:
-                        pass
+            for entry in _iter_tree(self.working_directory):
+                total_files += 1
+                ext = os.path.splitext(entry.name)[1] or 'no_extension'
+                file_types[ext] = file_types.get(ext, 0) + 1
+                
+                try:
+                    total_size += entry.stat().st_size
+                except OSError:
+                    pass
+                if progress and total_files % self.ANALYZE_PROGRESS_EVERY == 0:
+                    progress(total_files, total_size)
             
             return {
                 "directory": self.working_directory,
@@ -510,23 +1566,47 @@ class ProjectAgent:
     def fetch_web_content(self, url):
         """Fetch and analyze content from a web URL."""
         try:
-            response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=10)
+            headers = {"User-Agent": "Mozilla/5.0"}
+            cached = self.web_cache.get(url)
+            # Revalidate a previous fetch instead of re-downloading it
+            if cached:
+                if cached.get("etag"):
+                    headers["If-None-Match"] = cached["etag"]
+                if cached.get("last_modified"):
+                    headers["If-Modified-Since"] = cached["last_modified"]
+            response = _WEB_SESSION.get(url, headers=headers, timeout=10)
+            if response.status_code == 304 and cached:
+                self.web_cache.move_to_end(url)
+                text = cached["content"]
+                return {
+                    "url": url,
+                    "status": cached["status"],
+                    "size": len(text),
+                    "content": text[:3000],
+                    "message": f"✅ {url} unchanged, using cached {len(text)} characters"
+                }
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Hand the parser raw bytes so it does its own charset detection
+            soup = BeautifulSoup(response.content, HTML_PARSER)
             
-            # Extract text content
-            for script in soup(["script", "style"]):
-                script.decompose()
-            text = soup.get_text()
-            lines = (line.strip() for line in text.splitlines())
-            text = '\n'.join(line for line in lines if line)
+            # Extract text content from the body only; <head> holds nothing worth reading
+            root = soup.body or soup
+            for tag in root(["script", "style", "noscript"]):
+                tag.decompose()
+            text = root.get_text(separator='\n', strip=True)
+            del soup, root
             
+            # Only the extracted text and validators are kept, never the raw HTML
             self.web_cache[url] = {
                 "content": text,
-                "html": response.text,
-                "status": response.status_code
+                "status": response.status_code,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified")
             }
+            self.web_cache.move_to_end(url)
+            while len(self.web_cache) > self.WEB_CACHE_MAX:
+                self.web_cache.popitem(last=False)
             
             return {
                 "url": url,
@@ -538,2423 +1618,2975 @@ class ProjectAgent:
         except Exception as e:
             return f"❌ Error fetching web content: {str(e)}"
     
-    def search_in_files(self, search_term, file_pattern="*"):
-        """Search for a term in all files matching pattern."""
+    def _grep_file(self, file_path, pattern, limit):
+        """Return up to `limit` matching lines for a compiled pattern in one file.
+
+        A bytes pattern is run directly over an mmap of the file, so nothing is read
+        or decoded except the lines that match; a str pattern searches the decoded text.
+        """
+        if not os.path.isfile(file_path):
+            return []
+        try:
+            if isinstance(pattern.pattern, bytes):
+                if os.path.getsize(file_path) == 0:
+                    return []  # empty files can't be mapped
+                with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    if hasattr(data, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                        data.madvise(mmap.MADV_SEQUENTIAL)
+                    return self._grep_matches(file_path, pattern, data, limit)
+            return self._grep_matches(file_path, pattern, _read_text(file_path), limit)
+        except Exception:
+            return []
+
+    def _grep_matches(self, file_path, pattern, data, limit):
+        # Scan the whole file once; line numbers are derived from match offsets
+        newline = '\n' if isinstance(data, str) else b'\n'
+        matches = []
+        line_number = 1
+        pos = 0
+        line_end = -1
+        for m in pattern.finditer(data):
+            start = m.start()
+            if start <= line_end:
+                continue  # another hit on a line already reported
+            line_number += data[pos:start].count(newline)
+            pos = start
+            line_start = data.rfind(newline, 0, start) + 1
+            line_end = data.find(newline, start)
+            if line_end == -1:
+                line_end = len(data)
+            line = data[line_start:line_end]
+            matches.append({
+                "file": os.path.relpath(file_path, self.working_directory),
+                "line_number": line_number,
+                "content": (line if isinstance(line, str) else line.decode('utf-8', errors='ignore')).strip()
+            })
+            if len(matches) >= limit:
+                break
+        return matches
+
+    def search_in_files(self, search_term, file_pattern="*", limit=50):
+        """Search for a term in files matching pattern, stopping once `limit` matches are found.
+
+        `has_more` reports whether the search stopped with matches still left.
+        """
         if not self.working_directory:
             return "❌ No working directory set."
         
         try:
-            import glob
             results = []
             full_pattern = os.path.join(self.working_directory, "**", file_pattern)
-            files = glob.glob(full_pattern, recursive=True)
+            files = glob.iglob(full_pattern, recursive=True)
+            # ASCII terms (the common case) match the raw bytes of an mmap; re folds ASCII
+            # case on bytes, so IGNORECASE still applies. Other terms need decoded text.
+            if search_term.isascii():
+                pattern = re.compile(re.escape(search_term.encode('ascii')), re.IGNORECASE)
+            else:
+                pattern = re.compile(re.escape(search_term), re.IGNORECASE)
             
-            for file_path in files:
-                if not os.path.isfile(file_path):
-                    continue
-                
-                try:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        lines = f.readlines()
-                        for i, line in enumerate(lines):
-                            if search_term.lower() in line.lower():
-                                results.append({
-                                    "file": os.path.relpath(file_path, self.working_directory),
-                                    "line_number": i + 1,
-                                    "content": line.strip()
-                                })
-                                if len(results) >= 50:  # Limit results
-                                    break
-                except:
-                    pass
+            # File reads are I/O-bound, so scan files concurrently; results are
+            # still collected in glob order so output stays deterministic. Only a
+            # small window of files is in flight, so the walk itself stops early too.
+            workers = min(32, (os.cpu_count() or 4) * 2)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as ex:
+                pending = collections.deque()
+                for f in files:
+                    pending.append(ex.submit(self._grep_file, f, pattern, limit + 1))
+                    if len(pending) >= workers * 2:
+                        results.extend(pending.popleft().result())
+                        if len(results) > limit:
+                            break
+                while pending and len(results) <= limit:
+                    results.extend(pending.popleft().result())
+                for fut in pending:
+                    fut.cancel()
+            has_more = len(results) > limit
+            del results[limit:]
             
             return {
                 "search_term": search_term,
                 "matches": len(results),
-                "results": results[:50],
-                "message": f"🔍 Found {len(results)} matches for '{search_term}'"
+                "results": results,
+                "has_more": has_more,
+                "message": f"🔍 Found {len(results)}{'+' if has_more else ''} matches for '{search_term}'"
             }
         except Exception as e:
             return f"❌ Error searching: {str(e)}"
 
-class BrainAI:
-    logic_plugins = {
-        'first_order': lambda inp: f"[First-order logic]: {inp}",
-        'fuzzy': lambda inp: f"[Fuzzy logic]: {inp}",
-        'modal': lambda inp: f"[Modal logic]: {inp}",
-        'temporal': lambda inp: f"[Temporal logic]: {inp}",
-        'description': lambda inp: f"[Description logic]: {inp}",
-        'probability': lambda inp: f"[Probability logic]: {inp}",
-        'perlin': lambda inp: f"[Perlin Noise Gen]: {inp}",
-        'voronoi': lambda inp: f"[Voronoi Noise Gen]: {inp}",
-        'diamond_square': lambda inp: f"[Diamond-Square Algorithm]: {inp}",
-        'cellular_automata': lambda inp: f"[Cellular Automata Sim]: {inp}",
-    }
-    custom_templates = {
-        'i need a sprite for a game': "Would you like an animal, person, a monster, or make something up?",
-        'open world background': "What kind of environment? Forest, desert, urban, or something unique?",
-        'how do i': "Let me search for instructions on that topic.",
-        'what does': "I'll look up the definition for you.",
-        'define': "I'll find a clear explanation for you."
-    }
-    analytical_phrases = [
-        "Analyzing the data suggests", "From a logical perspective", "The evidence indicates",
-        "Systematically evaluating this", "Based on rational assessment", "The optimal approach would be",
-        "Logically speaking", "From a technical standpoint", "A rational breakdown reveals",
-        "If we deconstruct the problem", "Examining the variables, I see", "A methodical review shows",
-        "Let's consider the constraints", "Factoring in the evidence", "A stepwise analysis implies"
-    ]
-    creative_phrases = [
-        "That sparks an interesting idea", "I'm visualizing possibilities", "This opens creative pathways",
-        "Imaginatively speaking", "From an artistic perspective", "The creative potential here is",
-        "I can envision", "What if we explored", "A wild thought just occurred to me",
-        "Let's break the mold and try", "I feel inspired to suggest", "What if we flipped the script?",
-        "Here's a twist: imagine if", "Creatively, I see", "Let's color outside the lines with"
-    ]
+# Follow-up prompts appended to process_input replies
+FOLLOW_UP_SUGGESTIONS = (
+    "Would you like to explore this idea further?",
+    "Here's a related concept: try combining this with another approach.",
+    "Do you have any creative thoughts on this?",
+    "Maybe we should look for more references or examples.",
+    "What do you think about expanding this into a project?",
+    "Is there a technical challenge here we should solve?",
+    "Should I search and learn more about this topic?",
+    "What aspect of this interests you most?",
+    "Have you considered the edge cases here?",
+    "Would you like me to break this down into steps?",
+    "What's your end goal with this?",
+    "Are there any constraints I should know about?",
+    "What have you already tried?",
+    "Would examples help clarify this?",
+    "Should we explore alternative approaches?",
+    "What could make this solution more elegant?",
+    "Is there a similar problem you've solved before?",
+    "Would you like me to explain the underlying principles?",
+    "What questions do you have that I haven't addressed?",
+    "Should I research best practices for this?",
+    "What would make this more maintainable?",
+    "Are there performance considerations here?",
+    "Would you like to see a code example?",
+    "Should we consider scalability?",
+    "What documentation would help you most?",
+    "Let's brainstorm some alternatives!",
+    "Would you like to see a code or design example?",
+    "Should we ask the other brain for a different perspective?",
+    "How could we make this more innovative or efficient?",
+)
+
+# Idle "need help?" prompt list posted by the project watcher; only the brain name varies
+IDLE_HELP_TEMPLATE = (
+    "\n💡 {name}: I notice you haven't made changes in a while.\n"
+    "Need help? Try asking me:\n\n"
+    # Programming & Development
+    "📝 CODING HELP:\n"
+    "  • 'How do I implement [feature]?'\n"
+    "  • 'What's the best way to [task]?'\n"
+    "  • 'Debug this error: [error message]'\n"
+    "  • 'Optimize this code: [paste code]'\n"
+    "  • 'Show me an example of [pattern]'\n\n"
+    # Learning & Research
+    "🔍 LEARNING:\n"
+    "  • 'Search and learn [topic]'\n"
+    "  • 'Explain [concept] in simple terms'\n"
+    "  • 'What are best practices for [topic]?'\n"
+    "  • 'Compare [thing A] vs [thing B]'\n"
+    "  • 'What should I learn next for [goal]?'\n\n"
+    # Design & Architecture
+    "🎨 DESIGN:\n"
+    "  • 'How should I structure [project type]?'\n"
+    "  • 'What design pattern fits [scenario]?'\n"
+    "  • 'Review this architecture: [description]'\n"
+    "  • 'Generate ideas for [feature]'\n\n"
+    # Problem Solving
+    "🧩 PROBLEM SOLVING:\n"
+    "  • 'I'm stuck on [problem]. What should I try?'\n"
+    "  • 'Break down this task: [complex task]'\n"
+    "  • 'What could go wrong with [approach]?'\n"
+    "  • 'Alternative ways to [solve problem]?'\n\n"
+    # Proactive Questions
+    "💭 OR ASK ME:\n"
+    "  • 'What questions should I be asking?'\n"
+    "  • 'What am I missing in my approach?'\n"
+    "  • 'Help me brainstorm [topic]'\n\n"
+)
+
+# search_and_learn prompts; the fixed instructions come first so repeated lessons share a prompt prefix
+LEARN_PROMPT_ANALYTICAL = (
+    "I'm {name}, an analytical and logical AI.\n"
+    "Extract and organize the information focusing on:\n"
+    "- Technical specifications and precise definitions\n"
+    "- Step-by-step procedures and methodologies\n"
+    "- System architecture and logical structure\n"
+    "- Best practices and optimization techniques\n"
+    "- Common problems and systematic solutions\n"
+    "Provide 5-7 analytical, fact-based points I can reference later.\n\n"
+    "I'm learning about '{topic}'.\n\n"
+    "Search results:\n{results}"
+)
+LEARN_PROMPT_CREATIVE = (
+    "I'm {name}, a creative and artistic AI.\n"
+    "Extract and interpret the information focusing on:\n"
+    "- Creative possibilities and artistic applications\n"
+    "- Visual design principles and aesthetic considerations\n"
+    "- Innovative ways to use or combine concepts\n"
+    "- Inspiration for unique implementations\n"
+    "- Emotional impact and user experience aspects\n"
+    "Provide 5-7 creative, imaginative insights I can build upon.\n\n"
+    "I'm learning about '{topic}'.\n\n"
+    "Search results:\n{results}"
+)
+LEARN_PROMPT_BALANCED = (
+    "I'm {name} ({personality}).\n"
+    "Extract and summarize 5-7 key points aligned with my {personality} personality.\n\n"
+    "I'm learning about '{topic}'.\n\n"
+    "Search results:\n{results}"
+)
+
+# Static text for the Help menu windows
+HELP_GETTING_STARTED = """
+🧠 DUAL BRAIN AI SYSTEM - GETTING STARTED
 
-    def __init__(self, name, personality, color, db_path="dspa_studio.db"):
-        self.name = name
-        self.personality = personality
-        self.color = color
-        self.memory_core = MemoryCore(db_path, self.name.lower())
-        self.memory = self.memory_core.get_memories()
-        self.conversation_history = self.memory_core.get_conversations()
-        self.context_memory = []
-        self.recent_replies = []
-        self.max_recent_replies = 6
-        self.learning_enabled = False
-        self.watch_enabled = False
-        self.watch_thread = None
-        self.watched_path = None
-        self.last_modified_times = {}
-        self.project_state = {}  # Track what exists: functions, variables, nodes
-        self.active_developers = {}  # Track who's working on what: {username: {file, last_activity}}
-        self.file_ownership = {}  # Track current file ownership to prevent conflicts
-        self.team_mode = False  # Enable team collaboration features
-        self.allowed_tools = {
-            'blender', 'godot', 'krita', 'inkscape', 'unreal', 'unity',
-            'openscad', 'freecad', 'lmms', 'davinci'
-        }
-        self.future_plugins = []
-        self.definitions = {}  # Store user definitions
-        self.use_ollama = True  # Default to Ollama for human-like responses
-        # Cache for recursive fractal harmonic to speed up repeated calls
-        self._fractal_cache = {}
-        # Triadic consciousness model (Ada40) — used to bias gate logic & prompts
-        self.triadic = TriadicConsciousness()
-        self.last_resonance = self.triadic.get_overall_resonance()
-        # Training / background trainer controls
-        self._training_lock = threading.Lock()
-        self._training_stop_event = threading.Event()
-        self._training_thread = None
-        self.training_log = []
+Welcome to the most advanced AI-powered creative workflow system!
 
-    def watch_project(self, project_path, interface):
-        """Watch a project directory for changes and offer contextual AI help."""
-        import os
-        import time
-        
-        interface.brain_chat.insert(tk.END, f"👁️ Watching {project_path} for activity...\n")
-        interface.brain_chat.see(tk.END)
-        
-        # Scan initial state
-        for root, dirs, files in os.walk(project_path):
-            for file in files:
-                filepath = os.path.join(root, file)
-                try:
-                    self.last_modified_times[filepath] = os.path.getmtime(filepath)
-                except:
-                    pass
-        
-        last_help_time = 0
-        idle_threshold = 120  # seconds of no changes = user might be stuck
-        last_change_time = time.time()
-        
-        while self.watch_enabled:
-            time.sleep(5)  # Check every 5 seconds
-            
-            if not self.watch_enabled:
-                break
-            
-            changes_detected = False
-            changed_files = []
-            
-            # Check for file changes
-            for root, dirs, files in os.walk(project_path):
-                for file in files:
-                    filepath = os.path.join(root, file)
-                    try:
-                        current_mtime = os.path.getmtime(filepath)
-                        
-                        # New file
-                        if filepath not in self.last_modified_times:
-                            self.last_modified_times[filepath] = current_mtime
-                            changes_detected = True
-                            changed_files.append((file, 'created'))
-                        # Modified file
-                        elif current_mtime > self.last_modified_times[filepath]:
-                            self.last_modified_times[filepath] = current_mtime
-                            changes_detected = True
-                            changed_files.append((file, 'modified'))
-                    except:
-                        pass
-            
-            if changes_detected:
-                last_change_time = time.time()
-                # Notify about changes and analyze code
-                for fname, action in changed_files[:3]:  # Limit to 3 files
-                    interface.brain_chat.insert(tk.END, f"📝 Detected: {fname} ({action})\n")
-                    
-                    # Track developer activity if team mode enabled
-                    if self.team_mode:
-                        self._track_developer_activity(fname, project_path, interface)
-                    
-                    # Analyze GDScript files for order mistakes
-                    if fname.endswith('.gd'):
-                        full_path = None
-                        for root, dirs, files in os.walk(project_path):
-                            if fname in files:
-                                full_path = os.path.join(root, fname)
-                                break
-                        
-                        if full_path:
-                            issues = self.analyze_code_order(full_path, fname)
-                            if issues:
-                                def show_issues():
-                                    for issue in issues:
-                                        interface.brain_chat.insert(tk.END, f"⚠️ {issue}\n")
-                                    interface.brain_chat.see(tk.END)
-                                interface.window.after(0, show_issues)
-                
-                interface.brain_chat.see(tk.END)
-            
-            # Check if user might be stuck (no changes for idle_threshold seconds)
-            time_since_change = time.time() - last_change_time
-            time_since_help = time.time() - last_help_time
-            
-            if time_since_change > idle_threshold and time_since_help > 300:  # 5 min cooldown
-                # Offer help
-                last_help_time = time.time()
-                def offer_help():
-                    interface.brain_chat.insert(tk.END, f"\n💡 {self.name}: I notice you haven't made changes in a while.\n")
-                    interface.brain_chat.insert(tk.END, f"Need help? Try asking me:\n\n")
-                    
-                    # Programming & Development
-                    interface.brain_chat.insert(tk.END, f"📝 CODING HELP:\n")
-                    interface.brain_chat.insert(tk.END, f"  • 'How do I implement [feature]?'\n")
-                    interface.brain_chat.insert(tk.END, f"  • 'What's the best way to [task]?'\n")
-                    interface.brain_chat.insert(tk.END, f"  • 'Debug this error: [error message]'\n")
-                    interface.brain_chat.insert(tk.END, f"  • 'Optimize this code: [paste code]'\n")
-                    interface.brain_chat.insert(tk.END, f"  • 'Show me an example of [pattern]'\n\n")
-                    
-                    # Learning & Research
-                    interface.brain_chat.insert(tk.END, f"🔍 LEARNING:\n")
-                    interface.brain_chat.insert(tk.END, f"  • 'Search and learn [topic]'\n")
-                    interface.brain_chat.insert(tk.END, f"  • 'Explain [concept] in simple terms'\n")
-                    interface.brain_chat.insert(tk.END, f"  • 'What are best practices for [topic]?'\n")
-                    interface.brain_chat.insert(tk.END, f"  • 'Compare [thing A] vs [thing B]'\n")
-                    interface.brain_chat.insert(tk.END, f"  • 'What should I learn next for [goal]?'\n\n")
-                    
-                    # Design & Architecture
-                    interface.brain_chat.insert(tk.END, f"🎨 DESIGN:\n")
-                    interface.brain_chat.insert(tk.END, f"  • 'How should I structure [project type]?'\n")
-                    interface.brain_chat.insert(tk.END, f"  • 'What design pattern fits [scenario]?'\n")
-                    interface.brain_chat.insert(tk.END, f"  • 'Review this architecture: [description]'\n")
-                    interface.brain_chat.insert(tk.END, f"  • 'Generate ideas for [feature]'\n\n")
-                    
-                    # Problem Solving
-                    interface.brain_chat.insert(tk.END, f"🧩 PROBLEM SOLVING:\n")
-                    interface.brain_chat.insert(tk.END, f"  • 'I'm stuck on [problem]. What should I try?'\n")
-                    interface.brain_chat.insert(tk.END, f"  • 'Break down this task: [complex task]'\n")
-                    interface.brain_chat.insert(tk.END, f"  • 'What could go wrong with [approach]?'\n")
-                    interface.brain_chat.insert(tk.END, f"  • 'Alternative ways to [solve problem]?'\n\n")
-                    
-                    # Proactive Questions
-                    interface.brain_chat.insert(tk.END, f"💭 OR ASK ME:\n")
-                    interface.brain_chat.insert(tk.END, f"  • 'What questions should I be asking?'\n")
-                    interface.brain_chat.insert(tk.END, f"  • 'What am I missing in my approach?'\n")
-                    interface.brain_chat.insert(tk.END, f"  • 'Help me brainstorm [topic]'\n\n")
-                    
-                    interface.brain_chat.see(tk.END)
-                interface.window.after(0, offer_help)
-    
-    def analyze_code_order(self, filepath, filename):
-        """Analyze GDScript file for workflow order issues."""
-        issues = []
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-                lines = content.split('\n')
-            
-            # Track what's defined in this file
-            defined_vars = set()
-            defined_funcs = set()
-            used_vars = set()
-            used_funcs = set()
-            used_nodes = set()
-            
-            # Initialize tracking for this file if not exists
-            if filename not in self.project_state:
-                self.project_state[filename] = {'vars': set(), 'funcs': set(), 'nodes': set()}
-            
-            for i, line in enumerate(lines, 1):
-                stripped = line.strip()
-                
-                # Track variable declarations
-                if stripped.startswith('var '):
-                    var_name = stripped.split()[1].split('=')[0].split(':')[0].strip()
-                    defined_vars.add(var_name)
-                
-                # Track function definitions
-                if stripped.startswith('func '):
-                    func_name = stripped.split('func ')[1].split('(')[0].strip()
-                    defined_funcs.add(func_name)
-                
-                # Track variable usage
-                for word in stripped.split():
-                    if word in used_vars or word in defined_vars:
-                        continue
-                    # Simple check: if it looks like a variable (lowercase, no parens)
-                    if word.isidentifier() and not word.startswith('_') and '(' not in word:
-                        if word not in defined_vars and word not in ['if', 'else', 'for', 'while', 'return', 'var', 'func', 'class', 'extends', 'true', 'false', 'null']:
-                            used_vars.add(word)
-                
-                # Track function calls
-                if '(' in stripped:
-                    import re
-                    func_calls = re.findall(r'(\w+)\s*\(', stripped)
-                    for func in func_calls:
-                        if func not in defined_funcs and func not in ['print', 'len', 'str', 'int', 'float', 'bool']:
-                            used_funcs.add(func)
-                
-                # Track get_node calls
-                if 'get_node' in stripped or '$' in stripped:
-                    import re
-                    # Match get_node("NodeName") or $NodeName
-                    node_refs = re.findall(r'get_node\(["\']([^"\'\/]+)', stripped)
-                    node_refs += re.findall(r'\$([A-Z]\w+)', stripped)
-                    for node in node_refs:
-                        used_nodes.add(node)
-            
-            # Check for issues: using before defining
-            undefined_vars = used_vars - defined_vars - self.project_state[filename]['vars']
-            if undefined_vars:
-                issues.append(f"Variable(s) used before definition in {filename}: {', '.join(list(undefined_vars)[:3])}")
-            
-            undefined_funcs = used_funcs - defined_funcs - self.project_state[filename]['funcs']
-            # Filter out common Godot built-in functions
-            godot_builtins = {'move_and_slide', 'move_and_collide', 'is_on_floor', 'is_on_wall', 
-                             'queue_free', 'get_parent', 'add_child', 'emit_signal', 'connect',
-                             'set_physics_process', 'set_process', '_ready', '_process', '_physics_process'}
-            undefined_funcs = undefined_funcs - godot_builtins
-            if undefined_funcs:
-                issues.append(f"Function(s) called before definition in {filename}: {', '.join(list(undefined_funcs)[:3])}")
-            
-            if used_nodes:
-                issues.append(f"💡 Tip: {filename} references nodes: {', '.join(list(used_nodes)[:3])}. Make sure they exist in your scene!")
-            
-            # Update project state
-            self.project_state[filename]['vars'].update(defined_vars)
-            self.project_state[filename]['funcs'].update(defined_funcs)
-            self.project_state[filename]['nodes'].update(used_nodes)
-            
-        except Exception as e:
-            # Silent fail - don't spam errors
-            pass
-        
-        return issues
-    
-    def _track_developer_activity(self, filename, project_path, interface):
-        """Track which developer is working on which file to coordinate team work."""
-        import getpass
-        import socket
-        
-        # Identify developer by username@hostname
-        try:
-            username = getpass.getuser()
-            hostname = socket.gethostname()
-            dev_id = f"{username}@{hostname}"
-        except:
-            dev_id = "unknown_dev"
-        
-        current_time = time.time()
-        
-        # Update this developer's activity
-        self.active_developers[dev_id] = {
-            'file': filename,
-            'last_activity': current_time,
-            'project': project_path
-        }
-        
-        # Check if another developer was recently working on this file
-        for other_dev, info in self.active_developers.items():
-            if other_dev != dev_id and info['file'] == filename:
-                time_since = current_time - info['last_activity']
-                if time_since < 300:  # Active within last 5 minutes
-                    def warn_conflict():
-                        interface.brain_chat.insert(tk.END, f"\n⚠️ TEAM ALERT: {other_dev} was working on {filename} {int(time_since)}s ago!\n")
-                        interface.brain_chat.insert(tk.END, f"💡 Consider coordinating to avoid merge conflicts.\n\n")
-                        interface.brain_chat.see(tk.END)
-                    interface.window.after(0, warn_conflict)
-                    break
-        
-        # Clean up old activity (>30 min)
-        inactive_devs = [dev for dev, info in self.active_developers.items() 
-                        if current_time - info['last_activity'] > 1800]
-        for dev in inactive_devs:
-            del self.active_developers[dev]
-    
-    def get_team_status(self):
-        """Get current team activity status."""
-        if not self.active_developers:
-            return "No active developers detected."
-        
-        status = "👥 Active Team Members:\n"
-        current_time = time.time()
-        for dev, info in self.active_developers.items():
-            time_ago = int((current_time - info['last_activity']) / 60)
-            status += f"  • {dev}: {info['file']} ({time_ago}m ago)\n"
-        return status
+1. LAUNCHING YOUR AI BRAINS
+   • Click 🧠 Elaine for analytical thinking
+   • Click 🎨 Carrie for creative inspiration
+   • Use "Launch Both" for maximum power
+   • Watch the status indicators turn green
 
-    def _gate_logic(self, message):
-        # Adaptive switching with open/closed gate logic
-        # Open gate for creative if creative keywords, else closed (analytical)
-        creative_keywords = ['creative', 'art', 'design', 'imagine', 'inspire', 'vision', 'idea']
-        score = sum(1 for kw in creative_keywords if kw in message.lower())
-        gate_open = score > len(creative_keywords) / 2  # Threshold for open gate
-        return 'creative' if gate_open else 'analytical'
+2. STARTING CONVERSATIONS
+   • Use "Start Auto Conversation" for AI brain discussions
+   • Set custom topics for focused brainstorming
+   • Watch the Global Conversation Monitor
+   • Join conversations directly in brain windows
 
-    def triadic_report(self):
-        """Return a small dict with fast/medium/slow values, ratios, overall resonance and classification."""
-        fast, med, slow = self.triadic.fast_harmony, self.triadic.medium_harmony, self.triadic.slow_harmony
-        ratios = self.triadic.get_ratios()
-        overall = self.triadic.get_overall_resonance()
-        classification = analyze_triadic_ratios([fast, med, slow])
-        return {
-            'fast': fast,
-            'medium': med,
-            'slow': slow,
-            'ratios': ratios,
-            'overall_resonance': overall,
-            'classification': classification
-        }
+3. LAUNCHING CREATIVE TOOLS
+   • Use toolbar buttons for quick access
+   • Menu system for full tool categories
+   • AI assistants provide context-aware help
+   • Tools integrate with active AI brains
 
-    def train_on_snippets(self, snippets, epochs=1, learning_rate=0.01):
-        """Offline lightweight training that nudges triadic harmonies based on textual snippets.
+4. PROJECT MANAGEMENT
+   • Create new projects with custom names
+   • Import assets from multiple formats
+   • Save/load projects with AI memory
+   • Export completed work
 
-        This is a simple heuristic trainer: for each snippet we compute an importance score
-        and use it to nudge fast/medium/slow harmony values. This avoids heavy ML deps and
-        keeps training offline and deterministic.
+5. COLLABORATIVE MODE
+   • Requires both brains online
+   • Enables cross-domain expertise
+   • Provides dual-perspective solutions
+   • Enhances all creative workflows
         """
-        if not snippets:
-            return 0
-        with self._training_lock:
-            adjustments = 0
-            for _ in range(max(1, int(epochs))):
-                for s in snippets:
-                    imp = float(self._calculate_importance(s)) / 10.0
-                    # nudge fast_harmony quickly, medium slower, slow slowest
-                    self.triadic.fast_harmony = max(0.0, min(1.0, self.triadic.fast_harmony + learning_rate * (imp - 0.5)))
-                    self.triadic.medium_harmony = max(0.0, min(1.0, self.triadic.medium_harmony + (learning_rate * 0.5) * (imp - 0.5)))
-                    self.triadic.slow_harmony = max(0.0, min(1.0, self.triadic.slow_harmony + (learning_rate * 0.25) * (imp - 0.5)))
-                    adjustments += 1
-            # log a summary
-            self.training_log.append({'type': 'snippets', 'count': len(snippets), 'adjustments': adjustments, 'timestamp': datetime.datetime.now().isoformat()})
-            return adjustments
-
-    def train_on_conversations(self, lookback=50, epochs=1, learning_rate=0.01):
-        """Train on recent conversation history entries to tune triadic harmonies.
 
-        lookback: how many recent conversation entries to use.
-        """
-        convs = self.conversation_history[-int(lookback):] if self.conversation_history else []
-        snippets = []
-        for c in convs:
-            try:
-                snippets.append(c.get('input', '') + ' ' + c.get('response', ''))
-            except Exception:
-                continue
-        return self.train_on_snippets(snippets, epochs=epochs, learning_rate=learning_rate)
+HELP_BRAIN_GUIDE = """
+🧠 ELAINE - THE ANALYTICAL BRAIN
 
-    def _training_loop(self, interval_seconds=300, lookback=50, epochs=1, learning_rate=0.01):
-        # Runs in background; periodically trains on conversation snippets until stopped
-        while not self._training_stop_event.is_set():
-            try:
-                adjustments = self.train_on_conversations(lookback=lookback, epochs=epochs, learning_rate=learning_rate)
-                self.training_log.append({'type': 'periodic', 'adjustments': adjustments, 'timestamp': datetime.datetime.now().isoformat()})
-            except Exception as e:
-                self.training_log.append({'type': 'error', 'error': str(e), 'timestamp': datetime.datetime.now().isoformat()})
-            # wait with ability to early exit
-            self._training_stop_event.wait(interval_seconds)
+SPECIALTIES:
+• Logical problem solving and analysis
+• Technical optimization and debugging
+• System architecture and planning
+• Performance analysis and metrics
+• Mathematical and scientific reasoning
+• STL generation for 3D printing
 
-    def start_periodic_training(self, interval_seconds=300, lookback=50, epochs=1, learning_rate=0.01):
-        """Start a background thread that periodically trains the triadic model on recent conversations."""
-        if self._training_thread and self._training_thread.is_alive():
-            return False
-        self._training_stop_event.clear()
-        self._training_thread = threading.Thread(target=self._training_loop, args=(interval_seconds, lookback, epochs, learning_rate), daemon=True)
-        self._training_thread.start()
-        return True
+BEST FOR:
+• 3D CAD modeling precision
+• Game system architecture
+• Audio engineering technical aspects
+• Code generation and optimization
+• Project planning and workflow
+• Quality assurance and testing
 
-    def stop_periodic_training(self):
-        if self._training_thread and self._training_thread.is_alive():
-            self._training_stop_event.set()
-            self._training_thread.join(timeout=2.0)
-            return True
-        return False
+🎨 CARRIE - THE CREATIVE BRAIN
 
-    def process_input(self, message, from_brain=None):
-        import random
-        timestamp = datetime.datetime.now().isoformat()
+SPECIALTIES:
+• Artistic inspiration and creativity
+• Visual design and aesthetics
+• Innovation and experimentation
+• Emotional and intuitive insights
+• Sprite and background generation
+• Vector designs for Cricut
 
-        msg_lower = message.strip().lower()
-        
-        # Team status command
-        if msg_lower in ["team status", "who's working", "show team", "team"]:
-            return f"[{self.name}]: {self.get_team_status()}"
+BEST FOR:
+• 3D artistic modeling and texturing
+• Game art and visual design
+• Music composition and creativity
+• Concept art and visual ideas
+• UI/UX design and user experience
+• Creative brainstorming and ideation
 
-        # Learn command: learn:input=>response
-        if msg_lower.startswith("learn:"):
-            learn_data = message[6:].strip()
-            if "=>" in learn_data:
-                input_part, response_part = learn_data.split("=>", 1)
-                input_part = input_part.strip().lower()
-                response_part = response_part.strip()
-                if not hasattr(self, 'custom_learned'): self.custom_learned = {}
-                self.custom_learned[input_part] = response_part
-                self.memory_core.add_memory({'timestamp': timestamp, 'input': message, 'from': from_brain or 'User', 'importance': 9, 'context': ['LEARNED'], 'learned': {input_part: response_part}})
-                return f"[{self.name}]: Learned custom response for '{input_part}'."
-            else:
-                return f"[{self.name}]: Please use 'learn:input=>response' format."
+🤝 COLLABORATIVE MODE
 
-        # Definition extraction and web lookup
-        if msg_lower.startswith("define "):
-            term = message[7:].strip()
-            # If user provides a definition
-            if ':' in term:
-                key, val = term.split(':', 1)
-                key = key.strip()
-                val = val.strip()
-                self.definitions[key] = val
-                self.memory_core.add_memory({'timestamp': timestamp, 'input': message, 'from': from_brain or 'User', 'importance': 8, 'context': ['DEFINITION'], 'definition': {key: val}})
-                self.memory.append({'timestamp': timestamp, 'input': message, 'from': from_brain or 'User', 'importance': 8, 'context': ['DEFINITION'], 'definition': {key: val}})
-                return f"[{self.name}]: Definition stored for '{key}'."
-            # Otherwise, look up definition on the web
-            else:
-                search_results = self.search_web(term + " definition")
-                self.memory_core.add_memory({'timestamp': timestamp, 'input': message, 'from': from_brain or 'User', 'importance': 7, 'context': ['WEB_LOOKUP'], 'web_lookup': term})
-                return f"[{self.name}]: Web definition for '{term}':\n{search_results}"
+WHEN BOTH BRAINS ARE ACTIVE:
+• Technical precision meets creative vision
+• Analytical solutions with artistic flair
+• Cross-domain expertise and insights
+• Enhanced problem-solving capabilities
+• Balanced perspectives on all projects
+• Comprehensive workflow assistance
+        """
 
-        # Custom learned responses
-        if hasattr(self, 'custom_learned'):
-            for learned_input, learned_response in self.custom_learned.items():
-                if learned_input in msg_lower:
-                    return f"[{self.name}]: {learned_response}"
+HELP_TOOLS_GUIDE = """
+🛠️ SUPPORTED CREATIVE TOOLS
 
-        memory_entry = {
-            'timestamp': timestamp,
-            'input': message,
-            'from': from_brain or 'User',
-            'importance': self._calculate_importance(message),
-            'context': self._extract_context(message)
-        }
-        self.memory_core.add_memory(memory_entry)
-        self.memory.append(memory_entry)
+🔧 3D & CAD TOOLS
+• FreeCAD 🛠️ - Professional parametric 3D CAD modeler
+  AI Support: Technical precision, STL generation
+• OpenSCAD 🛠️ - Programmable solid 3D CAD modeler
+  AI Support: Code-based modeling assistance
+• Blender 🛠️ - Complete 3D creation suite
+  AI Support: Both technical modeling and artistic vision
 
-        # Update triadic resonance based on message importance (0..1)
-        try:
-            input_resonance = min(1.0, float(self._calculate_importance(message)) / 10.0)
-        except Exception:
-            input_resonance = 0.5
-        overall_resonance = self.triadic.update_harmony(input_resonance)
-        self.last_resonance = overall_resonance
+🎮 GAME DEVELOPMENT
+• Godot Engine 🎮 - Advanced cross-platform game engine
+  AI Support: System architecture + creative design
+• Unity 🎮 - Industry-standard game development platform
+  AI Support: Technical optimization + visual artistry
+• Unreal Engine 🎮 - Industry-leading development platform
+  AI Support: Technical optimization + visual artistry
 
-        response = None
+🎵 AUDIO PRODUCTION
+• LMMS 🎵 - Free cross-platform music production suite
+  AI Support: Technical mixing + creative composition
+• Ardour 🎵 - Professional digital audio workstation
+  AI Support: Engineering precision + artistic expression
+• Reaper 🎵 - Efficient digital audio production
+  AI Support: Workflow optimization + creative ideas
 
-        # Use definitions in responses
-        for term, definition in self.definitions.items():
-            if term.lower() in msg_lower:
-                response = f"[{self.name}]: Recall: '{term}' means '{definition}'. "
-                break
+🎨 GRAPHICS & DESIGN
+• GIMP 🎨 - GNU Image Manipulation Program
+  AI Support: Technical editing + creative enhancement
+• Krita 🎨 - Professional painting program
+  AI Support: Digital art techniques + sprite/background creation
+• Inkscape 🎨 - Professional vector graphics editor
+  AI Support: Technical precision + artistic composition
+• DaVinci Resolve 🎨 - Professional video editing & color
+  AI Support: Technical workflow + creative vision
 
-        # Cross-brain delegation
-        if "delegate " in msg_lower and ("elaine" in msg_lower or "carrie" in msg_lower):
-            if "elaine" in msg_lower and hasattr(self, 'delegate_callback_elaine'):
-                cmd = message.split("delegate")[-1].strip()
-                return self.delegate_callback_elaine(cmd)
-            if "carrie" in msg_lower and hasattr(self, 'delegate_callback_carrie'):
-                cmd = message.split("delegate")[-1].strip()
-                return self.delegate_callback_carrie(cmd)
+🤖 AI ASSISTANTS
+• Code Generator - AI-powered programming assistance
+• Asset Creator - AI asset generation and optimization
+• Music Composer - AI collaborative music composition
+• Concept Artist - AI-powered visual concept creation
+• 3D Assistant - AI-guided 3D modeling and STL generation
+• Game Designer - AI game development consultation
+• Project Advisor - AI project insights and guidance
+• Quality Analyst - AI quality assessment and optimization
+        """
 
-        # Logic plugins
-        for key, plugin in self.logic_plugins.items():
-            if key.replace("_", "-") in msg_lower or f"{key} logic" in msg_lower:
-                response = plugin(message)
-                break
+HELP_TUTORIALS = """
+🎓 DUAL BRAIN AI WORKFLOW TUTORIALS
 
-        # Custom template triggers
-        if not response:
-            for trigger, reply in self.custom_templates.items():
-                if trigger in msg_lower:
-                    response = reply
-                    if 'how do i' in msg_lower or 'what does' in msg_lower or 'define' in msg_lower:
-                        query = msg_lower.split(trigger)[-1].strip()
-                        search_results = self.search_web(query)
-                        response += f"\nSearch Results for '{query}':\n{search_results}"
-                    break
+🏗️ 3D MODELING WORKFLOW:
+1. Launch Blender or FreeCAD from toolbar
+2. Activate Elaine for technical modeling advice
+3. Ask for STL generation with specific parameters
+4. Use Carrie for artistic inspiration
+5. Enable collaborative mode for best results
 
-        # Adaptive switching with gate logic
-        mode = self._gate_logic(message)
+🎮 GAME DEVELOPMENT WORKFLOW:
+1. Create new project (Game Development type)
+2. Launch Godot or Unreal Engine
+3. Import assets to project browser
+4. Ask Carrie for sprite/background generation
+5. Use Elaine for system architecture
 
-        # Potentially bias mode using the triadic resonance (higher resonance -> creative)
-        if overall_resonance > 0.65:
-            mode = 'creative'
-        elif overall_resonance < 0.35:
-            mode = 'analytical'
+🎵 MUSIC PRODUCTION WORKFLOW:
+1. Launch LMMS or Ardour
+2. Activate Carrie for creative inspiration
+3. Use Elaine for technical mixing advice
+4. Use AI Music Composer for collaboration
+5. Export and save to project
 
-        # Default personality-based response with Ollama for human-like
-        if not response:
-            if self.use_ollama:
-                prompt = (
-                    f"Respond as {self.name} ({self.personality}) in a human-like way to: {message}."
-                    f" Mode: {mode}. Context: {self._get_context_response(message, mode)}"
-                    f" Resonance: {overall_resonance:.2f}."  # surface triadic score for context
-                )
-                response = self.process_input_with_ollama(prompt)
-            else:
-                if mode == 'analytical':
-                    response = self._generate_analytical_response(message, from_brain)
-                else:
-                    response = self._generate_creative_response(message, from_brain)
+🎨 DIGITAL ART WORKFLOW:
+1. Launch Krita or Inkscape
+2. Activate Carrie for artistic guidance
+3. Ask for SVG or sprite generation
+4. Get technical advice from Elaine
+5. Save artwork to project assets
 
-        # Avoid repeating recent replies
-        if response in self.recent_replies:
-            for _ in range(3):
-                if mode == 'analytical':
-                    response = self._generate_analytical_response(message, from_brain)
-                else:
-                    response = self._generate_creative_response(message, from_brain)
-                if response not in self.recent_replies:
-                    break
-        self.recent_replies.append(response)
-        if len(self.recent_replies) > self.max_recent_replies:
-            self.recent_replies.pop(0)
+🤖 AI COLLABORATION TIPS:
+• Be specific in your requests to AI brains
+• Use "how do I" or "define" for web searches
+• Enable collaborative mode for complex projects
+• Let AI brains discuss ideas together
+• Save projects to preserve AI memory
+• Use memory search to find past insights
 
-        # Add a dynamic suggestion, idea, or question to the response
-        suggestions = [
-            "Would you like to explore this idea further?",
-            "Here's a related concept: try combining this with another approach.",
-            "Do you have any creative thoughts on this?",
-            "Maybe we should look for more references or examples.",
-            "What do you think about expanding this into a project?",
-            "Is there a technical challenge here we should solve?",
-            "Should I search and learn more about this topic?",
-            "What aspect of this interests you most?",
-            "Have you considered the edge cases here?",
-            "Would you like me to break this down into steps?",
-            "What's your end goal with this?",
-            "Are there any constraints I should know about?",
-            "What have you already tried?",
-            "Would examples help clarify this?",
-            "Should we explore alternative approaches?",
-            "What could make this solution more elegant?",
-            "Is there a similar problem you've solved before?",
-            "Would you like me to explain the underlying principles?",
-            "What questions do you have that I haven't addressed?",
-            "Should I research best practices for this?",
-            "What would make this more maintainable?",
-            "Are there performance considerations here?",
-            "Would you like to see a code example?",
-            "Should we consider scalability?",
-            "What documentation would help you most?",
-            "Let's brainstorm some alternatives!",
-            "Would you like to see a code or design example?",
-            "Should we ask the other brain for a different perspective?",
-            "How could we make this more innovative or efficient?"
-        ]
-        response += "\n💡 " + random.choice(suggestions)
+💡 PRODUCTIVITY TIPS:
+• Use toolbar for quick tool access
+• Pin brain windows to manage workspace
+• Import all assets at project start
+• Use AI assistants throughout workflow
+• Enable auto-conversations for inspiration
+• Export projects when complete
+        """
 
-        conv_entry = {
-            'timestamp': timestamp,
-            'input': message,
-            'response': response,
-            'from': from_brain
-        }
-        self.memory_core.add_conversation(conv_entry)
-        self.conversation_history.append(conv_entry)
-        self._update_context(message, response)
-        return response
+HELP_AI_GUIDE = """
+🤖 AI COLLABORATION GUIDE
 
-    # Temporary method to use Ollama for LLM responses
-    def process_input_with_ollama(self, message, from_brain=None, model="llama2-uncensored:latest"):
-        return query_ollama(message, model=model)
-
-    def _calculate_importance(self, message):
-        keywords = ['important', 'critical', 'urgent', 'project', 'create', 'design', 'help', 'stl', 'sprite', 'background']
-        score = 5
-        for keyword in keywords:
-            if keyword in message.lower():
-                score += 2
-        return min(score, 10)
+🎯 MAXIMIZING AI BRAIN POTENTIAL:
 
-    def _extract_context(self, message):
-        contexts = []
-        msg = message.lower()
-        if any(word in msg for word in ['3d', 'model', 'blender', 'freecad', 'stl', 'cad', 'printing']):
-            contexts.append('3D_MODELING')
-        if any(word in msg for word in ['game', 'godot', 'unity', 'unreal', 'sprite', 'background']):
-            contexts.append('GAME_DEVELOPMENT')
-        if any(word in msg for word in ['music', 'audio', 'sound', 'lmms']):
-            contexts.append('AUDIO_PRODUCTION')
-        if any(word in msg for word in ['code', 'program', 'script', 'python']):
-            contexts.append('PROGRAMMING')
-        if any(word in msg for word in ['svg', 'inkscape', 'cricut']):
-            contexts.append('VECTOR_DESIGN')
-        return contexts
+🧠 ELAINE SPECIALIZES IN:
+• Technical problem solving
+• STL generation for 3D printing
+• Code optimization and debugging
+• System architecture planning
+• Performance analysis
+• Mathematical computations
 
-    def _update_context(self, input_msg, response):
-        self.context_memory.append({
-            'input': input_msg,
-            'response': response,
-            'timestamp': datetime.datetime.now().isoformat()
-        })
-        if len(self.context_memory) > 10:
-            self.context_memory.pop(0)
+🎨 CARRIE SPECIALIZES IN:
+• Creative inspiration and ideation
+• Sprite and background generation
+• Vector designs for Cricut
+• Artistic vision and aesthetics
+• Innovation and experimentation
+• Emotional and intuitive insights
 
-    def _generate_analytical_response(self, message, from_brain):
-        phrases = self.analytical_phrases.copy()
-        random.shuffle(phrases)
-        context_responses = self._get_context_response(message, 'analytical')
-        memory_hint = self._memory_hint()
-        if from_brain == "Carrie":
-            return f"[{self.name}]: Interesting creative angle, Carrie. {phrases[0]} that we should consider the practical implications of '{message}'. {context_responses} {memory_hint} Let me break this down systematically..."
-        return f"[{self.name}]: {phrases[0]} regarding '{message}'. {context_responses} {memory_hint} I'll process this through logical frameworks and provide structured analysis."
+🤝 COLLABORATIVE TECHNIQUES:
+1. DIVIDE AND CONQUER:
+   • Ask Elaine for technical tasks
+   • Ask Carrie for creative tasks
+   • Combine both perspectives
 
-    def _generate_creative_response(self, message, from_brain):
-        phrases = self.creative_phrases.copy()
-        random.shuffle(phrases)
-        context_responses = self._get_context_response(message, 'creative')
-        memory_hint = self._memory_hint()
-        if from_brain == "Elaine":
-            return f"[{self.name}]: I appreciate your analytical approach, Elaine! {phrases[0]} about '{message}'. {context_responses} {memory_hint} What if we explored this from different angles? Let me paint some creative scenarios..."
-        return f"[{self.name}]: {phrases[0]} when you mention '{message}'. {context_responses} {memory_hint} I can see vibrant possibilities and unconventional solutions emerging!"
+2. BRAIN CONVERSATIONS:
+   • Let them discuss topics together
+   • Set interesting conversation topics
+   • Learn from their interactions
 
-    def _memory_hint(self):
-        if self.memory and random.random() < 0.4:
-            important = [m for m in self.memory[-10:] if m['importance'] >= 7]
-            if important:
-                mem = random.choice(important)
-                return f"(I recall: '{mem['input']}')"
-        return ""
+3. WEB SEARCHES:
+   • Use "how do I" or "define" queries
+   • Get design references and instructions
+   • Leverage search for project research
 
-    def _get_context_response(self, message, brain_type):
-        contexts = self._extract_context(message)
-        responses = []
-        if '3D_MODELING' in contexts:
-            if brain_type == 'analytical':
-                responses.append("For 3D modeling, we need to consider mesh topology, UV mapping efficiency, and rendering optimization. I can generate STL files for 3D printing.")
-            else:
-                responses.append("For 3D art, I'm thinking about form, composition, lighting, and emotional impact!")
-        if 'GAME_DEVELOPMENT' in contexts:
-            if brain_type == 'analytical':
-                responses.append("Game development requires systematic architecture, performance optimization, and robust systems design.")
-            else:
-                responses.append("Games are about player experience, storytelling, visual aesthetics, and emotional engagement! I can generate sprites and backgrounds.")
-        if 'AUDIO_PRODUCTION' in contexts:
-            if brain_type == 'analytical':
-                responses.append("Audio production involves signal processing, frequency analysis, and technical precision.")
-            else:
-                responses.append("Music creation is about rhythm, melody, harmony, and evoking emotions through sound!")
-        if 'VECTOR_DESIGN' in contexts:
-            if brain_type == 'analytical':
-                responses.append("For vector designs, consider precision paths and scalability for Cricut cutting.")
-            else:
-                responses.append("Vector art allows for creative patterns and designs ready for fabrication!")
-        return " ".join(responses)
+4. MEMORY UTILIZATION:
+   • Search both brains' memories
+   • Build on previous conversations
+   • Create knowledge continuity
 
-    def search_web(self, query):
+5. PROJECT INTEGRATION:
+   • Save AI insights with projects
+   • Load previous AI knowledge
+   • Maintain context across sessions
+        """
+
+HELP_ABOUT = """
+🧠 DUAL BRAIN AI CREATIVE WORKFLOW CENTER
+Version 3.0 - Professional Creative Suite
+
+🎯 FEATURES:
+• Dual AI Brain System (Elaine + Carrie)
+• Integrated Creative Tool Launcher
+• Professional Project Management
+• AI-Powered Collaboration
+• STL Generation for 3D Printing
+• Sprite and Background Generation
+• Web Search for Instructions and Definitions
+• Cross-Domain Workflow Support
+• Expandable for Mobile/Multi-Node
+
+🛠️ SUPPORTED TOOLS:
+• 3D & CAD: FreeCAD 🛠️, OpenSCAD 🛠️, Blender 🛠️
+• Game Dev: Godot 🎮, Unity 🎮, Unreal Engine 🎮
+• Audio: LMMS 🎵, Ardour 🎵, Reaper 🎵
+• Graphics: GIMP 🎨, Krita 🎨, Inkscape 🎨, DaVinci Resolve 🎨
+
+🤖 AI CAPABILITIES:
+• Code Generation & Optimization
+• STL Generation with Procedural Algorithms
+• Sprite and Background Generation
+• Vector Design for Cricut
+• Web Search for Project Research
+• Context-Aware Responses
+• Persistent Memory with SQLite
+• Collaborative Mode for Dual Perspectives
+• Real-Time Project Monitoring
+• Team Collaboration Features
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Created by: Adam Lee Hatchett
+© 2026 Adam Lee Hatchett
+All Rights Reserved
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+Empowering Creativity Through AI Collaboration
+        """
+
+def _clipped_walk(start, steps):
+    """Final value of h <- clip(h + step, 0, 1) applied for each step in order.
+
+    Uses a single cumulative sum when the path never leaves [0, 1] and only
+    replays the steps one by one when clipping actually happens.
+    """
+    if steps.size == 0:
+        return start
+    path = start + np.cumsum(steps)
+    if path.min() >= 0.0 and path.max() <= 1.0:
+        return float(path[-1])
+    h = start
+    for step in steps.tolist():
+        h = max(0.0, min(1.0, h + step))
+    return h
+
+# Keyword groups for BrainAI._extract_context / _calculate_importance, each matched in one pass
+CONTEXT_KEYWORDS = {
+    '3D_MODELING': ('3d', 'model', 'blender', 'freecad', 'stl', 'cad', 'printing'),
+    'GAME_DEVELOPMENT': ('game', 'godot', 'unity', 'unreal', 'sprite', 'background'),
+    'AUDIO_PRODUCTION': ('music', 'audio', 'sound', 'lmms'),
+    'PROGRAMMING': ('code', 'program', 'script', 'python'),
+    'VECTOR_DESIGN': ('svg', 'inkscape', 'cricut'),
+}
+IMPORTANCE_KEYWORDS = ('important', 'critical', 'urgent', 'project', 'create', 'design', 'help', 'stl', 'sprite', 'background')
+# Creative gate opens when more than half of these keywords appear
+CREATIVE_KEYWORDS = ('creative', 'art', 'design', 'imagine', 'inspire', 'vision', 'idea')
+CREATIVE_GATE_THRESHOLD = len(CREATIVE_KEYWORDS) // 2 + 1
+_CREATIVE_MATCHER = compile_trigger_matcher(CREATIVE_KEYWORDS)
+_CONTEXT_MATCHER = compile_trigger_matcher({w for words in CONTEXT_KEYWORDS.values() for w in words})
+_IMPORTANCE_MATCHER = compile_trigger_matcher(IMPORTANCE_KEYWORDS)
+
+# GDScript patterns and name sets used by BrainAI.analyze_code_order
+_FUNC_CALL_RE = re.compile(r'(\w+)\s*\(')
+_GETNODE_RE = re.compile(r'get_node\(["\']([^"\'\/]+)')
+_DOLLAR_NODE_RE = re.compile(r'\$([A-Z]\w+)')
+_GDSCRIPT_KEYWORDS = frozenset({'if', 'else', 'for', 'while', 'return', 'var', 'func', 'class', 'extends', 'true', 'false', 'null'})
+_GDSCRIPT_CORE_FUNCS = frozenset({'print', 'len', 'str', 'int', 'float', 'bool'})
+GODOT_BUILTINS = frozenset({'move_and_slide', 'move_and_collide', 'is_on_floor', 'is_on_wall',
+                            'queue_free', 'get_parent', 'add_child', 'emit_signal', 'connect',
+                            'set_physics_process', 'set_process', '_ready', '_process', '_physics_process'})
+
+class BrainAI:
+    logic_plugins = {
+        'first_order': lambda inp: f"[First-order logic]: {inp}",
+        'fuzzy': lambda inp: f"[Fuzzy logic]: {inp}",
+        'modal': lambda inp: f"[Modal logic]: {inp}",
+        'temporal': lambda inp: f"[Temporal logic]: {inp}",
+        'description': lambda inp: f"[Description logic]: {inp}",
+        'probability': lambda inp: f"[Probability logic]: {inp}",
+        'perlin': lambda inp: f"[Perlin Noise Gen]: {inp}",
+        'voronoi': lambda inp: f"[Voronoi Noise Gen]: {inp}",
+        'diamond_square': lambda inp: f"[Diamond-Square Algorithm]: {inp}",
+        'cellular_automata': lambda inp: f"[Cellular Automata Sim]: {inp}",
+    }
+    custom_templates = {
+        'i need a sprite for a game': "Would you like an animal, person, a monster, or make something up?",
+        'open world background': "What kind of environment? Forest, desert, urban, or something unique?",
+        'how do i': "Let me search for instructions on that topic.",
+        'what does': "I'll look up the definition for you.",
+        'define': "I'll find a clear explanation for you."
+    }
+    _template_matcher = staticmethod(compile_trigger_matcher(custom_templates))
+    ANALYZE_CACHE_MAX = 256
+    LEARN_CACHE_MAX = 128
+    LEARN_CACHE_TTL = 24 * 3600  # seconds a search_and_learn summary is reused for the same topic
+    MEMORY_WINDOW = 10_000  # most recent memories / conversations kept in RAM; SQLite holds the rest
+    analytical_phrases = [
+        "Analyzing the data suggests", "From a logical perspective", "The evidence indicates",
+        "Systematically evaluating this", "Based on rational assessment", "The optimal approach would be",
+        "Logically speaking", "From a technical standpoint", "A rational breakdown reveals",
+        "If we deconstruct the problem", "Examining the variables, I see", "A methodical review shows",
+        "Let's consider the constraints", "Factoring in the evidence", "A stepwise analysis implies"
+    ]
+    creative_phrases = [
+        "That sparks an interesting idea", "I'm visualizing possibilities", "This opens creative pathways",
+        "Imaginatively speaking", "From an artistic perspective", "The creative potential here is",
+        "I can envision", "What if we explored", "A wild thought just occurred to me",
+        "Let's break the mold and try", "I feel inspired to suggest", "What if we flipped the script?",
+        "Here's a twist: imagine if", "Creatively, I see", "Let's color outside the lines with"
+    ]
+
+    def __init__(self, name, personality, color, db_path="dspa_studio.db"):
+        self.name = name
+        self.personality = personality
+        # Learning style, fixed by the personality string
+        p = personality.lower()
+        self._is_analytical = 'analytical' in p or 'logical' in p
+        self._is_creative = 'creative' in p or 'artistic' in p
+        if self._is_analytical:
+            self._learn_prompt = LEARN_PROMPT_ANALYTICAL  # Elaine's analytical learning approach
+        elif self._is_creative:
+            self._learn_prompt = LEARN_PROMPT_CREATIVE  # Carrie's creative learning approach
+        else:
+            self._learn_prompt = LEARN_PROMPT_BALANCED  # Balanced approach for other personalities
+        self.color = color
+        self._help_text = IDLE_HELP_TEMPLATE.format(name=self.name)
+        self.memory_core = MemoryCore(db_path, self.name.lower())
+        # Guards memory/conversation_history: deques raise if appended to mid-iteration,
+        # so writers append and readers copy under this lock
+        self._history_lock = threading.Lock()
+        self.reload_memory()
+        self.conversation_history = collections.deque(self.memory_core.get_conversations(limit=self.MEMORY_WINDOW),
+                                                      maxlen=self.MEMORY_WINDOW)
+        self.context_memory = collections.deque(maxlen=10)
+        self.max_recent_replies = 6
+        self.recent_replies = collections.deque(maxlen=self.max_recent_replies)
+        self.learning_enabled = False
+        self.watch_enabled = False
+        self.watch_thread = None
+        self._watch_stop = threading.Event()  # wakes the watch loop out of its backoff wait
+        self.watched_path = None
+        self.last_modified_times = {}
+        self._dir_listings = {}  # dir path -> (dir mtime, file paths, subdir paths) for the polling watcher
+        self.project_state = {}  # Track what exists: functions, variables, nodes
+        self._analyze_cache = collections.OrderedDict()  # filepath -> ((mtime_ns, size), issues), LRU order
+        self._learn_cache = collections.OrderedDict()  # md5(name|personality|topic) -> (stored_at, summary), LRU order
+        self._learn_cache_lock = threading.Lock()
+        # Chat replies (Ollama, web lookups) run here so the Tk thread never blocks on them;
+        # a single worker keeps replies in the order the messages were sent
+        self._ollama_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{name}-reply")
+        self.active_developers = {}  # Track who's working on what: {username: {file, last_activity}}
+        self._file_to_devs = collections.defaultdict(set)  # filename -> dev ids currently on it
+        self._dev_expiry_heap = []  # (expiry time, dev id); stale entries are skipped on pop
+        self.file_ownership = {}  # Track current file ownership to prevent conflicts
+        self.team_mode = False  # Enable team collaboration features
+        self.allowed_tools = {
+            'blender', 'godot', 'krita', 'inkscape', 'unreal', 'unity',
+            'openscad', 'freecad', 'lmms', 'davinci'
+        }
+        self.future_plugins = []
+        self.definitions = {}  # Store user definitions
+        self.use_ollama = True  # Default to Ollama for human-like responses
+        # Triadic consciousness model (Ada40) — used to bias gate logic & prompts
+        self.triadic = TriadicConsciousness()
+        self.last_resonance = self.triadic.get_overall_resonance()
+        # Training / background trainer controls
+        self._training_lock = threading.Lock()
+        self._training_stop_event = threading.Event()
+        self._training_thread = None
+        self.training_log = []
+
+    def _scan_mtimes(self, project_path):
+        """Return {path: mtime} for every file under project_path.
+
+        A directory is only re-listed when its own mtime has moved (a child was
+        added, removed or renamed); otherwise its cached listing is reused and
+        just the known files are stat'ed. Subtrees cannot be skipped outright
+        because editing a file in place does not touch its directory's mtime.
+        """
+        mtimes = {}
+        pending = collections.deque([project_path])
+        while pending:
+            current = pending.popleft()
+            try:
+                dir_mtime = os.stat(current).st_mtime
+            except OSError:
+                self._dir_listings.pop(current, None)
+                continue
+            cached = self._dir_listings.get(current)
+            if cached is not None and cached[0] == dir_mtime:
+                _, files, subdirs = cached
+                for path in files:
+                    try:
+                        mtimes[path] = os.stat(path).st_mtime
+                    except OSError:
+                        pass
+            else:
+                files, subdirs = [], []
+                try:
+                    with os.scandir(current) as it:
+                        for entry in it:
+                            try:
+                                if entry.is_dir(follow_symlinks=False):
+                                    if entry.name not in TREE_IGNORE_DIRS:
+                                        subdirs.append(entry.path)
+                                elif entry.is_file():
+                                    mtimes[entry.path] = entry.stat().st_mtime
+                                    files.append(entry.path)
+                            except OSError:
+                                continue
+                except OSError:
+                    continue
+                self._dir_listings[current] = (dir_mtime, files, subdirs)
+            pending.extend(subdirs)
+        return mtimes
+
+    def _poll_changes(self, project_path):
+        """Polling fallback: rescan the tree and diff it against the last scan."""
+        current = self._scan_mtimes(project_path)
+        known = self.last_modified_times
+        changed_files = [(path, 'created') for path in current.keys() - known.keys()]
+        changed_files += [(path, 'modified') for path in current.keys() & known.keys()
+                          if current[path] > known[path]]
+        known.update(current)
+        return changed_files
+
+    @staticmethod
+    def _drain_watch_events(event_queue, timeout=1.0):
+        """Wait up to `timeout` for a filesystem event, then drain the queue (deduplicated by path)."""
         try:
-            url = f"https://www.duckduckgo.com/html/?q={query.replace(' ', '+')}"
-            headers = {"User-Agent": "Mozilla/5.0"}
-            response = requests.get(url, headers=headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            results = []
-            for result in soup.find_all('div', class_='result', limit=5):
-                title = result.find('a', class_='result__a')
-                snippet = result.find('a', class_='result__snippet')
-                link = title['href'] if title else ''
-                title_text = title.text if title else ''
-                snippet_text = snippet.text if snippet else ''
-                results.append(f"Title: {title_text}\nLink: {link}\nSnippet: {snippet_text}\n")
-            return "\n".join(results) if results else "No results found."
-        except Exception as e:
-            return f"Web search failed: {str(e)}"
+            first = event_queue.get(timeout=timeout)
+        except queue.Empty:
+            return []
+        changed = {first[0]: first[1]}
+        while True:
+            try:
+                path, action = event_queue.get_nowait()
+            except queue.Empty:
+                break
+            changed.setdefault(path, action)
+        return list(changed.items())
 
-    def search_and_learn(self, topic):
-        """Search for a topic on the web, process the results with AI, and save to memory.
-        Each brain learns through their own personality lens - Elaine analytically, Carrie creatively.
+    def watch_project(self, project_path, interface):
+        """Watch a project directory for changes and offer contextual AI help."""
+        interface.queue_chat(f"👁️ Watching {project_path} for activity...\n")
+        
+        observer = None
+        event_queue = None
+        if Observer is not None:
+            try:
+                event_queue = queue.Queue()
+                observer = Observer()
+                observer.schedule(_WatchEventHandler(event_queue), project_path, recursive=True)
+                observer.start()
+            except Exception:
+                observer = None
+        if observer is None:
+            # Scan initial state for the polling fallback
+            self.last_modified_times.update(self._scan_mtimes(project_path))
+        
+        last_help_time = 0
+        idle_threshold = 120  # seconds of no changes = user might be stuck
+        last_change_time = time.time()
+        # Polling backs off while nothing changes; the cap keeps idle detection within idle_threshold / 4
+        base_delay = 5.0
+        max_delay = idle_threshold / 4
+        next_delay = base_delay
+        self._watch_stop.clear()
         
-        Args:
-            topic (str): The topic to search and learn about
-            
-        Returns:
-            str: Summary of what was learned
-        """
         try:
-            # Step 1: Search the web
-            search_results = self.search_web(topic)
-            
-            # Step 2: Determine learning style based on personality
-            is_analytical = 'analytical' in self.personality.lower() or 'logical' in self.personality.lower()
-            is_creative = 'creative' in self.personality.lower() or 'artistic' in self.personality.lower()
-            
-            # Step 3: Process with LLM using personality-aligned prompts
-            if self.use_ollama:
-                if is_analytical:
-                    # Elaine's analytical learning approach
-                    prompt = (
-                        f"I'm {self.name}, an analytical and logical AI. I'm learning about '{topic}'.\n\n"
-                        f"Search results:\n{search_results[:2000]}\n\n"
-                        f"Extract and organize the information focusing on:\n"
-                        f"- Technical specifications and precise definitions\n"
-                        f"- Step-by-step procedures and methodologies\n"
-                        f"- System architecture and logical structure\n"
-                        f"- Best practices and optimization techniques\n"
-                        f"- Common problems and systematic solutions\n"
-                        f"Provide 5-7 analytical, fact-based points I can reference later."
-                    )
-                elif is_creative:
-                    # Carrie's creative learning approach
-                    prompt = (
-                        f"I'm {self.name}, a creative and artistic AI. I'm learning about '{topic}'.\n\n"
-                        f"Search results:\n{search_results[:2000]}\n\n"
-                        f"Extract and interpret the information focusing on:\n"
-                        f"- Creative possibilities and artistic applications\n"
-                        f"- Visual design principles and aesthetic considerations\n"
-                        f"- Innovative ways to use or combine concepts\n"
-                        f"- Inspiration for unique implementations\n"
-                        f"- Emotional impact and user experience aspects\n"
-                        f"Provide 5-7 creative, imaginative insights I can build upon."
-                    )
+            while self.watch_enabled:
+                if observer is not None:
+                    changed_files = self._drain_watch_events(event_queue)
                 else:
-                    # Balanced approach for other personalities
-                    prompt = (
-                        f"I'm {self.name} ({self.personality}). I'm learning about '{topic}'.\n\n"
-                        f"Search results:\n{search_results[:2000]}\n\n"
-                        f"Extract and summarize 5-7 key points aligned with my {self.personality} personality."
-                    )
+                    self._watch_stop.wait(next_delay)
+                    changed_files = self._poll_changes(project_path) if self.watch_enabled else []
                 
-                learning_summary = query_ollama(prompt, model=os.environ.get('OLLAMA_MODEL','llama2-uncensored:latest'), 
-                                               max_tokens=512, stream=False)
-            else:
-                # Simple extraction without LLM, still personality-tagged
-                if is_analytical:
-                    learning_summary = f"[Analytical perspective] Key technical information about {topic}:\n{search_results[:800]}"
-                elif is_creative:
-                    learning_summary = f"[Creative perspective] Inspiring ideas about {topic}:\n{search_results[:800]}"
+                if not self.watch_enabled:
+                    break
+                
+                self._handle_watch_tick(changed_files, project_path, interface)
+                if changed_files:
+                    last_change_time = time.time()
+                    next_delay = base_delay
                 else:
-                    learning_summary = f"Key information about {topic}:\n{search_results[:1000]}"
+                    next_delay = min(max_delay, next_delay * 1.5)
+                
+                # Check if user might be stuck (no changes for idle_threshold seconds)
+                time_since_change = time.time() - last_change_time
+                time_since_help = time.time() - last_help_time
+                
+                if time_since_change > idle_threshold and time_since_help > 300:  # 5 min cooldown
+                    # Offer help
+                    last_help_time = time.time()
+                    self._offer_idle_help(interface)
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join(timeout=2.0)
+    
+    def _handle_watch_tick(self, changed_files, project_path, interface):
+        """Report changed files in the chat and run GDScript order analysis on them."""
+        if not changed_files:
+            return
+        # Notify about changes and analyze code
+        for full_path, action in changed_files[:3]:  # Limit to 3 files
+            fname = os.path.basename(full_path)
+            interface.queue_chat(f"📝 Detected: {fname} ({action})\n")
+
+            # Track developer activity if team mode enabled
+            if self.team_mode:
+                self._track_developer_activity(fname, project_path, interface)
+
+            # Analyze GDScript files for order mistakes
+            if fname.endswith('.gd'):
+                issues = self.analyze_code_order(full_path, fname)
+                if issues:
+                    interface.queue_chat("".join(f"⚠️ {issue}\n" for issue in issues))
+
+    def _offer_idle_help(self, interface):
+        """Post the "need help?" prompt list after a stretch of inactivity."""
+        interface.queue_chat(self._help_text)
+    
+    def analyze_code_order(self, filepath, filename):
+        """Analyze GDScript file for workflow order issues."""
+        issues = []
+        try:
+            # Unchanged file (same mtime and size): reuse the previous result
+            st = os.stat(filepath)
+            stamp = (st.st_mtime_ns, st.st_size)
+            cached = self._analyze_cache.get(filepath)
+            if cached is not None and cached[0] == stamp:
+                self._analyze_cache.move_to_end(filepath)
+                return list(cached[1])
+
+            # Track what's defined in this file
+            defined_vars = set()
+            defined_funcs = set()
+            used_vars = set()
+            used_funcs = set()
+            used_nodes = set()
             
-            # Step 4: Save to memory with high importance and personality context
-            importance = 8  # High importance for actively learned content
-            contexts = self._extract_context(topic)
-            contexts.append('LEARNED_KNOWLEDGE')  # Special tag for searched content
+            # Initialize tracking for this file if not exists
+            if filename not in self.project_state:
+                self.project_state[filename] = {'vars': set(), 'funcs': set(), 'nodes': set()}
             
-            # Add personality-specific context
-            if is_analytical:
-                contexts.append('ANALYTICAL_LEARNING')
-            elif is_creative:
-                contexts.append('CREATIVE_LEARNING')
+            # Stream the file line by line instead of holding the text and a split copy
+            with open(filepath, 'r', encoding='utf-8') as f:
+                for i, line in enumerate(f, 1):
+                    stripped = line.strip()
+                
+                    # Track variable declarations
+                    if stripped.startswith('var '):
+                        var_name = stripped.split()[1].split('=')[0].split(':')[0].strip()
+                        defined_vars.add(var_name)
+                
+                    # Track function definitions
+                    if stripped.startswith('func '):
+                        func_name = stripped.split('func ')[1].split('(')[0].strip()
+                        defined_funcs.add(func_name)
+                
+                    # Track variable usage (keywords and definitions are subtracted once, after the scan)
+                    words = set(stripped.split())
+                    words -= used_vars
+                    # Simple check: if it looks like a variable (identifier, not private)
+                    used_vars.update(w for w in words if w.isidentifier() and not w.startswith('_'))
+                
+                    # Track function calls
+                    if '(' in stripped:
+                        func_calls = _FUNC_CALL_RE.findall(stripped)
+                        for func in func_calls:
+                            if func not in defined_funcs and func not in _GDSCRIPT_CORE_FUNCS:
+                                used_funcs.add(func)
+                
+                    # Track get_node calls
+                    if 'get_node' in stripped or '$' in stripped:
+                        # Match get_node("NodeName") or $NodeName
+                        node_refs = _GETNODE_RE.findall(stripped)
+                        node_refs += _DOLLAR_NODE_RE.findall(stripped)
+                        for node in node_refs:
+                            used_nodes.add(node)
             
-            self.memory_core.save_insight(
-                topic,
-                learning_summary,
-                self.name,
-                importance,
-                contexts
-            )
+            # Check for issues: using before defining
+            undefined_vars = used_vars - _GDSCRIPT_KEYWORDS - defined_vars - self.project_state[filename]['vars']
+            if undefined_vars:
+                issues.append(f"Variable(s) used before definition in {filename}: {', '.join(list(undefined_vars)[:3])}")
             
-            # Update local memory
-            self.memory = self.memory_core.get_memories()
+            undefined_funcs = used_funcs - defined_funcs - self.project_state[filename]['funcs']
+            # Filter out common Godot built-in functions
+            undefined_funcs = undefined_funcs - GODOT_BUILTINS
+            if undefined_funcs:
+                issues.append(f"Function(s) called before definition in {filename}: {', '.join(list(undefined_funcs)[:3])}")
             
-            # Step 5: Create personality-aligned response
-            if is_analytical:
-                response = (
-                    f"✅ [Analytical Mode] I've systematically analyzed '{topic}'!\n\n"
-                    f"📊 Technical knowledge indexed to memory:\n{learning_summary[:500]}...\n\n"
-                    f"💡 I can now reference this for logical problem-solving and optimization."
-                )
-            elif is_creative:
-                response = (
-                    f"✅ [Creative Mode] I've explored the creative dimensions of '{topic}'!\n\n"
-                    f"🎨 Artistic insights saved to memory:\n{learning_summary[:500]}...\n\n"
-                    f"💡 I can now apply these ideas to innovative projects and designs!"
-                )
-            else:
-                response = (
-                    f"✅ I've learned about '{topic}'!\n\n"
-                    f"📚 Key insights saved to memory:\n{learning_summary[:500]}..."
-                )
+            if used_nodes:
+                issues.append(f"💡 Tip: {filename} references nodes: {', '.join(list(used_nodes)[:3])}. Make sure they exist in your scene!")
             
-            return response
+            # Update project state
+            self.project_state[filename]['vars'].update(defined_vars)
+            self.project_state[filename]['funcs'].update(defined_funcs)
+            self.project_state[filename]['nodes'].update(used_nodes)
+
+            self._analyze_cache[filepath] = (stamp, list(issues))
+            self._analyze_cache.move_to_end(filepath)
+            while len(self._analyze_cache) > self.ANALYZE_CACHE_MAX:
+                self._analyze_cache.popitem(last=False)
             
         except Exception as e:
-            return f"❌ Learning failed: {str(e)}"
-
-    def generate_stl(self, params=None):
-        if mesh is None:
-            return "Required libraries (numpy, numpy-stl) not available."
+            # Silent fail - don't spam errors
+            pass
+        
+        return issues
+    
+    def _track_developer_activity(self, filename, project_path, interface):
+        """Track which developer is working on which file to coordinate team work."""
+        
+        # Identify developer by username@hostname
         try:
-            size = params.get('size', 1)
-            height = params.get('height', 1)
-            shape = params.get('shape', 'cube')
-            if shape == 'terrain':
-                # Procedural terrain using Diamond-Square with recursive fractal harmonics
-                size = int(size)
-                grid = np.zeros((size, size))
-                grid[0, 0] = grid[0, -1] = grid[-1, 0] = grid[-1, -1] = random.uniform(-height, height)
-                step = size - 1
-                while step > 1:
-                    half_step = step // 2
-                    # Diamond step
-                    for x in range(0, size - 1, step):
-                        for y in range(0, size - 1, step):
-                            avg = (grid[x, y] + grid[x + step, y] + grid[x, y + step] + grid[x + step, y + step]) / 4
-                            harmonic = self._recursive_fractal_harmonic(x + half_step, y + half_step, 40)  # Ada 40 recursive harmonics reference
-                            grid[x + half_step, y + half_step] = avg + harmonic * random.uniform(-height, height)
-                    # Square step
-                    for x in range(0, size - 1, half_step):
-                        for y in range((x + half_step) % step, size - 1, step):
-                            avg = sum(grid[max(0, x - half_step):x + half_step + 1, max(0, y - half_step):y + half_step + 1].ravel()) / 4
-                            harmonic = self._recursive_fractal_harmonic(x, y, 40)
-                            grid[x, y] = avg + harmonic * random.uniform(-height / 2, height / 2)
-                    step //= 2
-                vertices = []
-                for x in range(size - 1):
-                    for y in range(size - 1):
-                        vertices.extend([
-                            [x, y, grid[x, y]],
-                            [x + 1, y, grid[x + 1, y]],
-                            [x, y + 1, grid[x, y + 1]],
-                            [x + 1, y, grid[x + 1, y]],
-                            [x + 1, y + 1, grid[x + 1, y + 1]],
-                            [x, y + 1, grid[x, y + 1]]
-                        ])
-                data = np.zeros(len(vertices) // 3, dtype=mesh.Mesh.dtype)
-                data['vectors'] = np.array(vertices).reshape(-1, 3, 3)
-            else:
-                # Simple cube
-                data = np.zeros(12, dtype=mesh.Mesh.dtype)
-                cube_vertices = [
-                    [[0, 0, 0], [size, 0, 0], [size, size, 0]],  # Bottom face
-                    [[0, 0, 0], [0, size, 0], [size, size, 0]],
-                    [[0, 0, height], [size, 0, height], [size, size, height]],  # Top face
-                    [[0, 0, height], [0, size, height], [size, size, height]],
-                    [[0, 0, 0], [0, 0, height], [0, size, height]],  # Left face
-                    [[0, 0, 0], [0, size, 0], [0, size, height]],
-                    [[size, 0, 0], [size, 0, height], [size, size, height]],  # Right face
-                    [[size, 0, 0], [size, size, 0], [size, size, height]],
-                    [[0, 0, 0], [size, 0, 0], [size, 0, height]],  # Front face
-                    [[0, 0, 0], [0, 0, height], [size, 0, height]],
-                    [[0, size, 0], [size, size, 0], [size, size, height]],  # Back face
-                    [[0, size, 0], [0, size, height], [size, size, height]]
-                ]
-                data['vectors'] = np.array(cube_vertices)
-            m = mesh.Mesh(data)
-            filename = f"generated_{shape}_{int(time.time())}.stl"
-            m.save(filename)
-            return f"Generated STL file: {filename}"
-        except Exception as e:
-            return f"STL generation failed: {str(e)}"
+            username = getpass.getuser()
+            hostname = socket.gethostname()
+            dev_id = f"{username}@{hostname}"
+        except:
+            dev_id = "unknown_dev"
+        
+        current_time = time.time()
+        
+        # Update this developer's activity
+        previous = self.active_developers.get(dev_id)
+        if previous and previous['file'] != filename:
+            self._forget_dev_file(dev_id, previous['file'])
+        self.active_developers[dev_id] = {
+            'file': filename,
+            'last_activity': current_time,
+            'project': project_path
+        }
+        self._file_to_devs[filename].add(dev_id)
+        heapq.heappush(self._dev_expiry_heap, (current_time + 1800, dev_id))
+        
+        # Check if another developer was recently working on this file
+        for other_dev in self._file_to_devs[filename] - {dev_id}:
+            time_since = current_time - self.active_developers[other_dev]['last_activity']
+            if time_since < 300:  # Active within last 5 minutes
+                interface.queue_chat(f"\n⚠️ TEAM ALERT: {other_dev} was working on {filename} {int(time_since)}s ago!\n"
+                                     f"💡 Consider coordinating to avoid merge conflicts.\n\n")
+                break
+        
+        # Clean up old activity (>30 min); a heap entry is stale if the developer was active since
+        heap = self._dev_expiry_heap
+        while heap and heap[0][0] < current_time:
+            _, dev = heapq.heappop(heap)
+            info = self.active_developers.get(dev)
+            if info and current_time - info['last_activity'] > 1800:
+                del self.active_developers[dev]
+                self._forget_dev_file(dev, info['file'])
+    
+    def _forget_dev_file(self, dev_id, filename):
+        devs = self._file_to_devs.get(filename)
+        if devs is not None:
+            devs.discard(dev_id)
+            if not devs:
+                del self._file_to_devs[filename]
 
-    def _recursive_fractal_harmonic(self, x, y, depth=40):
-        # Recursive fractal harmonics (reference: Harmonic Recursion Universal Axiom, Recursive Harmonic Codex)
-        # Use cache key with reduced precision to avoid huge key space
-        key = (round(x, 5), round(y, 5), int(depth))
-        if key in self._fractal_cache:
-            return self._fractal_cache[key]
-        if depth == 0:
-            val = 0
-        else:
-            freq = 2 ** (depth / 40.0)  # Harmonic frequency scaling
-            val = math.sin(freq * x) + math.cos(freq * y) + 0.5 * self._recursive_fractal_harmonic(x / 2, y / 2, depth - 1)
-        # store in cache
-        try:
-            self._fractal_cache[key] = val
-        except Exception:
-            pass
-        return val
+    def get_team_status(self):
+        """Get current team activity status."""
+        if not self.active_developers:
+            return "No active developers detected."
+        
+        status = "👥 Active Team Members:\n"
+        current_time = time.time()
+        for dev, info in self.active_developers.items():
+            time_ago = int((current_time - info['last_activity']) / 60)
+            status += f"  • {dev}: {info['file']} ({time_ago}m ago)\n"
+        return status
 
-    def generate_sprite_or_background(self, params=None):
-        if Image is None:
-            return "Required library (PIL) not available."
-        try:
-            width = params.get('width', 256)
-            height = params.get('height', 256)
-            type_ = params.get('type', 'sprite')
-            environment = params.get('environment', 'forest')
-            # Recursive fractal harmonics for organic textures (reference: Ada 40 recursive harmonics as depth=40)
-            def fractal_harmonic(x, y):
-                return int(255 * abs(self._recursive_fractal_harmonic(x / width, y / height, 40)))
-            img = Image.new('RGB', (width, height))
-            pixels = img.load()
-            for x in range(width):
-                for y in range(height):
-                    if type_ == 'background' and environment == 'forest':
-                        r = fractal_harmonic(x, y) // 2
-                        g = fractal_harmonic(x + 100, y) // 2
-                        b = fractal_harmonic(x, y + 100) // 2
-                    elif type_ == 'sprite' and environment == 'monster':
-                        r = fractal_harmonic(x, y) // 3
-                        g = fractal_harmonic(x + 50, y + 50) // 3
-                        b = fractal_harmonic(x + 100, y + 100) // 3
-                    else:
-                        r = g = b = fractal_harmonic(x, y) // 3
-                    pixels[x, y] = (r % 256, g % 256, b % 256)
-            filename = f"generated_{type_}_{environment}_{int(time.time())}.png"
-            img.save(filename)
-            return f"Generated {type_} image: {filename}"
-        except Exception as e:
-            return f"Image generation failed: {str(e)}"
+    def _gate_logic(self, message, msg_lower=None):
+        # Adaptive switching with open/closed gate logic
+        # Open gate for creative if creative keywords, else closed (analytical)
+        score = len(_CREATIVE_MATCHER(msg_lower or message.lower()))
+        gate_open = score >= CREATIVE_GATE_THRESHOLD
+        return 'creative' if gate_open else 'analytical'
 
-    def generate_svg(self, params=None):
-        try:
-            width = params.get('width', 100)
-            height = params.get('height', 100)
-            pattern = params.get('pattern', 'circle')
-            if pattern == 'circle':
-                svg_content = f'<svg height="{height}" width="{width}"><circle cx="{width/2}" cy="{height/2}" r="{min(width, height)/2-10}" stroke="black" stroke-width="2" fill="pink" /></svg>'
-            else:
-                svg_content = f'<svg height="{height}" width="{width}"><rect x="10" y="10" width="{width-20}" height="{height-20}" stroke="black" stroke-width="2" fill="blue" /></svg>'
-            filename = f"generated_{pattern}_{int(time.time())}.svg"
-            with open(filename, 'w') as f:
-                f.write(svg_content)
-            return f"Generated SVG file: {filename}"
-        except Exception as e:
-            return f"SVG generation failed: {str(e)}"
+    def triadic_report(self):
+        """Return a small dict with fast/medium/slow values, ratios, overall resonance and classification."""
+        fast, med, slow = self.triadic.fast_harmony, self.triadic.medium_harmony, self.triadic.slow_harmony
+        ratios = self.triadic.get_ratios()
+        overall = self.triadic.get_overall_resonance()
+        classification = analyze_triadic_ratios([fast, med, slow])
+        return {
+            'fast': fast,
+            'medium': med,
+            'slow': slow,
+            'ratios': ratios,
+            'overall_resonance': overall,
+            'classification': classification
+        }
 
-# GUI: Brain Windows
-class BrainInterface:
-    def __init__(self, window, brain, main_controller, brain_name):
-        self.window = window
-        self.brain = brain
-        self.main_controller = main_controller
-        self.brain_name = brain_name
-        self.is_pinned = False
-        self.setup_interface()
-        self.window.attributes('-topmost', True)  # Always on top by default
+    def train_on_snippets(self, snippets, epochs=1, learning_rate=0.01):
+        """Offline lightweight training that nudges triadic harmonies based on textual snippets.
 
-    def setup_interface(self):
-        header_frame = tk.Frame(self.window, bg=self.brain.color, height=80)
-        header_frame.pack(fill='x')
-        header_frame.pack_propagate(False)
-        tk.Label(header_frame, text=f"{self.brain.name} - {self.brain.personality}",
-                 font=('Segoe UI', 16, 'bold'), fg='white', bg=self.brain.color).pack(pady=20)
+        This is a simple heuristic trainer: for each snippet we compute an importance score
+        and use it to nudge fast/medium/slow harmony values. This avoids heavy ML deps and
+        keeps training offline and deterministic.
+        """
+        if not snippets:
+            return 0
+        with self._training_lock:
+            epochs = max(1, int(epochs))
+            # Importance doesn't change between epochs, so score each snippet once
+            imps = np.fromiter((self._calculate_importance(s) / 10.0 for s in snippets), dtype=np.float64, count=len(snippets))
+            steps = np.tile(learning_rate * (imps - 0.5), epochs)
+            # nudge fast_harmony quickly, medium slower, slow slowest
+            self.triadic.fast_harmony = _clipped_walk(self.triadic.fast_harmony, steps)
+            self.triadic.medium_harmony = _clipped_walk(self.triadic.medium_harmony, steps * 0.5)
+            self.triadic.slow_harmony = _clipped_walk(self.triadic.slow_harmony, steps * 0.25)
+            adjustments = steps.size
+            # log a summary
+            self.training_log.append({'type': 'snippets', 'count': len(snippets), 'adjustments': adjustments, 'timestamp': datetime.datetime.now().isoformat()})
+            return adjustments
 
-        # Controls frame (buttons) at the very top, just below header
-        controls_frame = tk.Frame(self.window, bg='#1a1a1a')
-        controls_frame.pack(fill='x', padx=10, pady=(0, 0))
-        tk.Button(controls_frame, text="Clear Memory", command=self.clear_memory,
-                 bg='#cc3300', fg='white', font=('Segoe UI', 9)).pack(side='left', padx=5)
-        tk.Button(controls_frame, text="Search Memory", command=self.search_memory,
-                 bg='#0078d4', fg='white', font=('Segoe UI', 9)).pack(side='left', padx=5)
-        tk.Button(controls_frame, text="Export Chat", command=self.export_chat,
-                 bg='#00aa00', fg='white', font=('Segoe UI', 9)).pack(side='left', padx=5)
-        tk.Button(controls_frame, text="Generate STL", command=self.generate_stl,
-                 bg='#3a3a3a', fg='#ffffff', font=('Segoe UI', 9)).pack(side='left', padx=5)
-        tk.Button(controls_frame, text="Generate Sprite/Background", command=self.generate_sprite_background,
-                 bg='#3a3a3a', fg='#ffffff', font=('Segoe UI', 9)).pack(side='left', padx=5)
-        tk.Button(controls_frame, text="Toggle Learning", command=self.toggle_learning,
-                 bg='#3a3a3a', fg='#00ffae', font=('Segoe UI', 9)).pack(side='left', padx=5)
-        tk.Button(controls_frame, text="👁️ Watch Project", command=self.toggle_watch,
-                 bg='#3a3a3a', fg='#00aeff', font=('Segoe UI', 9)).pack(side='left', padx=5)
-        tk.Button(controls_frame, text="Toggle Pin", command=self.toggle_pin,
-                 bg='#3a3a3a', fg='#ff69b4', font=('Segoe UI', 9)).pack(side='left', padx=5)
-        self.ollama_mode = True  # Default on for human-like
-        tk.Button(controls_frame, text="Toggle Ollama LLM", command=self.toggle_ollama_mode,
-                 bg='#3a3a3a', fg='#ffd700', font=('Segoe UI', 9)).pack(side='left', padx=5)
-        tk.Button(controls_frame, text="🔍 Search & Learn", command=self.search_and_learn,
-                 bg='#9b59b6', fg='#ffffff', font=('Segoe UI', 9, 'bold')).pack(side='left', padx=5)
-        tk.Button(controls_frame, text="👥 Team Mode", command=self.toggle_team_mode,
-                 bg='#2ecc71', fg='#ffffff', font=('Segoe UI', 9, 'bold')).pack(side='left', padx=5)
+    def reload_memory(self):
+        """Reload the in-RAM memory window from the memory core."""
+        memory = collections.deque(self.memory_core.get_memories(limit=self.MEMORY_WINDOW), maxlen=self.MEMORY_WINDOW)
+        with self._history_lock:
+            self.memory = memory
 
-        # Content frame for chat and input
-        content_frame = tk.Frame(self.window, bg='#1a1a1a')
-        content_frame.pack(fill='both', expand=True, padx=10, pady=10)
-        self.brain_chat = scrolledtext.ScrolledText(content_frame, height=25,
-                                                   bg='#2a2a2a', fg='#ffffff', font=('Consolas', 10))
-        self.brain_chat.pack(fill='both', expand=True, pady=(0, 10))
-        welcome_msg = f"🧠 {self.brain.name} Online - {self.brain.personality}\n"
-        welcome_msg += f"Ready to assist with {self.brain.personality.lower()} tasks. I can search the web, generate STL/SVG files, sprites, and backgrounds.\n"
-        self.brain_chat.insert(tk.END, welcome_msg)
-        self.brain_chat.see(tk.END)
-        input_frame = tk.Frame(content_frame, bg='#1a1a1a')
-        input_frame.pack(fill='x')
-        self.message_var = tk.StringVar()
-        self.message_entry = tk.Entry(input_frame, textvariable=self.message_var,
-                                     font=('Segoe UI', 10), bg='#3a3a3a', fg='#ffffff')
-        self.message_entry.pack(side='left', fill='x', expand=True, padx=(0, 10))
-        self.message_entry.bind('<Return>', self.send_message)
-        tk.Button(input_frame, text="Send", command=self.send_message,
-                 bg=self.brain.color, fg='white', font=('Segoe UI', 10), padx=20).pack(side='right')
-        # Triadic status bar (fast/medium/slow + overall resonance & training state)
-        status_frame = tk.Frame(content_frame, bg='#111111', height=26)
-        status_frame.pack(fill='x', pady=(6, 0))
-        status_frame.pack_propagate(False)
-        self.triadic_label = tk.Label(status_frame, text="Resonance: -- | Fast: -- Medium: -- Slow: --", bg='#111111', fg='#ffffff', font=('Segoe UI', 9))
-        self.triadic_label.pack(side='left', padx=6)
-        self.training_status_label = tk.Label(status_frame, text="Training: OFF", bg='#111111', fg='#ffcc00', font=('Segoe UI', 9))
-        self.training_status_label.pack(side='right', padx=6)
-        # start periodic UI updates for triadic status
-        try:
-            self.window.after(1000, self._update_triadic_ui)
-        except Exception:
-            pass
-    def toggle_ollama_mode(self):
-        self.ollama_mode = not self.ollama_mode
-        self.brain.use_ollama = self.ollama_mode
-        self.brain_chat.insert(tk.END, f"Ollama LLM Mode: {'ON' if self.ollama_mode else 'OFF'}\n")
+    def memory_snapshot(self):
+        """Return a list copy of the in-RAM memory window, safe to iterate from any thread."""
+        with self._history_lock:
+            return list(self.memory)
 
-    def send_message(self, event=None):
-        message = self.message_var.get().strip()
-        if not message:
-            return
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        self.brain_chat.insert(tk.END, f"[{timestamp}] You: {message}\n")
-        def handle_response(response):
-            try:
-                # Ensure the scrolledtext widget still exists (window may have been closed)
-                if hasattr(self, 'brain_chat') and self.brain_chat.winfo_exists():
-                    self.brain_chat.insert(tk.END, f"[{timestamp}] {response}\n\n")
-                    self.brain_chat.see(tk.END)
-                else:
-                    # Widget gone; route to main global chat instead
-                    self.main_controller.update_global_chat(f"💬 {self.brain.name}: {message} → {response} (window closed)")
-                self.main_controller.update_global_chat(f"💬 {self.brain.name}: {message} → {response}")
-            except tk.TclError:
-                # If Tcl error occurs (widget destroyed), fallback to global chat
-                try:
-                    self.main_controller.update_global_chat(f"💬 {self.brain.name}: {message} → {response} (TclError fallback)")
-                except Exception:
-                    pass
-            finally:
-                try:
-                    self.message_var.set("")
-                except Exception:
-                    pass
-        if self.brain.use_ollama:
-            import threading
-            def run_ollama():
-                response = self.brain.process_input_with_ollama(message)
-                self.window.after(0, lambda: handle_response(response))
-            threading.Thread(target=run_ollama, daemon=True).start()
-        else:
-            response = self.brain.process_input(message)
-            handle_response(response)
+    def add_to_memory_window(self, entries):
+        """Append entries to the in-RAM memory window."""
+        with self._history_lock:
+            self.memory.extend(entries)
 
-    def clear_memory(self):
-        if messagebox.askyesno("Clear Memory", f"Clear all memory for {self.brain.name}?"):
-            self.brain.clear_memory()
-            self.brain_chat.delete(1.0, tk.END)
-            self.brain_chat.insert(tk.END, f"🧠 {self.brain.name} memory cleared.\n\n")
+    def train_on_conversations(self, lookback=50, epochs=1, learning_rate=0.01):
+        """Train on recent conversation history entries to tune triadic harmonies.
 
-    def search_memory(self):
-        query = simpledialog.askstring("Memory Search", f"Search {self.brain.name}'s memory:")
-        if query:
-            results = self.brain.search_memory(query)
-            if not results:
-                messagebox.showinfo("Search Results", "No matching memories found.")
-                return
-            results_window = tk.Toplevel(self.window)
-            results_window.title(f"{self.brain.name} Memory Search: '{query}'")
-            results_window.geometry("800x600")
-            results_window.configure(bg='#1a1a1a')
-            results_text = scrolledtext.ScrolledText(results_window, bg='#2a2a2a', 
-                                                   fg=self.brain.color, font=('Consolas', 10))
-            results_text.pack(fill='both', expand=True, padx=10, pady=10)
-            for result in results:
-                results_text.insert(tk.END, f"⏰ Time: {result[0]}\n")
-                results_text.insert(tk.END, f"📝 Input: {result[1]}\n")
-                results_text.insert(tk.END, f"🔍 Response: {result[2]}\n")
-                results_text.insert(tk.END, f"⭐ Importance: {result[3]}/10\n")
-                if result[4]:
-                    results_text.insert(tk.END, f"🏷️ Context: {', '.join(result[4])}\n")
-                results_text.insert(tk.END, "\n" + "="*50 + "\n\n")
+        lookback: how many recent conversation entries to use (0 or less means all of them).
+        """
+        with self._history_lock:
+            convs = list(self.conversation_history)
+        if int(lookback) > 0:
+            convs = convs[-int(lookback):]
+        snippets = []
+        for c in convs:
+            try:
+                snippets.append(c.get('input', '') + ' ' + c.get('response', ''))
+            except Exception:
+                continue
+        return self.train_on_snippets(snippets, epochs=epochs, learning_rate=learning_rate)
 
-    def export_chat(self):
-        file_path = filedialog.asksaveasfilename(
-            defaultextension=".txt",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
-        )
-        if file_path:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(self.brain_chat.get(1.0, tk.END))
-            messagebox.showinfo("Export Complete", f"Chat exported to {os.path.basename(file_path)}")
+    def _training_loop(self, interval_seconds=300, lookback=50, epochs=1, learning_rate=0.01):
+        # Runs in background; periodically trains on conversation snippets until stopped.
+        # When no new conversation arrived the pass is skipped and the wait doubles (capped at an hour).
+        wait = interval_seconds
+        last_trained = None
+        while not self._training_stop_event.is_set():
+            newest = self.conversation_history[-1] if self.conversation_history else None
+            if newest is last_trained:
+                wait = min(wait * 2, max(interval_seconds, 3600))
+            else:
+                wait = interval_seconds
+                last_trained = newest
+                try:
+                    adjustments = self.train_on_conversations(lookback=lookback, epochs=epochs, learning_rate=learning_rate)
+                    self.training_log.append({'type': 'periodic', 'adjustments': adjustments, 'timestamp': datetime.datetime.now().isoformat()})
+                except Exception as e:
+                    self.training_log.append({'type': 'error', 'error': str(e), 'timestamp': datetime.datetime.now().isoformat()})
+            # wait with ability to early exit
+            self._training_stop_event.wait(wait)
 
-    def generate_stl(self):
-        if self.brain.name != "Elaine":
-            messagebox.showinfo("Info", "STL generation is handled by Elaine (Analytical Brain).")
-            return
-        shape = simpledialog.askstring("STL Params", "Enter shape (cube or terrain):", initialvalue="cube")
-        size = simpledialog.askfloat("STL Params", "Enter size:", minvalue=1.0)
-        height = simpledialog.askfloat("STL Params", "Enter height:", minvalue=1.0)
-        result = self.brain.generate_stl({'shape': shape or 'cube', 'size': size or 1, 'height': height or 1})
-        self.brain_chat.insert(tk.END, f"STL Generation: {result}\n")
-        self.main_controller.update_global_chat(f"[{self.brain.name}] Generated STL: {result}\n")
+    def start_periodic_training(self, interval_seconds=300, lookback=50, epochs=1, learning_rate=0.01):
+        """Start a background thread that periodically trains the triadic model on recent conversations."""
+        if self._training_thread and self._training_thread.is_alive():
+            return False
+        self._training_stop_event.clear()
+        self._training_thread = threading.Thread(target=self._training_loop, args=(interval_seconds, lookback, epochs, learning_rate), daemon=True)
+        self._training_thread.start()
+        return True
 
-    def generate_sprite_background(self):
-        if self.brain.name != "Carrie":
-            messagebox.showinfo("Info", "Sprite/Background generation is handled by Carrie (Creative Brain).")
-            return
-        type_ = simpledialog.askstring("Image Params", "Enter type (sprite or background):", initialvalue="sprite")
-        environment = simpledialog.askstring("Image Params", "Enter environment (forest, desert, urban, monster):", initialvalue="forest")
-        width = simpledialog.askinteger("Image Params", "Enter width:", minvalue=64, initialvalue=256)
-        height = simpledialog.askinteger("Image Params", "Enter height:", minvalue=64, initialvalue=256)
-        result = self.brain.generate_sprite_or_background({'type': type_ or 'sprite', 'environment': environment or 'forest', 'width': width or 256, 'height': height or 256})
-        self.brain_chat.insert(tk.END, f"Image Generation: {result}\n")
-        self.main_controller.update_global_chat(f"[{self.brain.name}] Generated Image: {result}\n")
+    def stop_periodic_training(self):
+        if self._training_thread and self._training_thread.is_alive():
+            self._training_stop_event.set()
+            self._training_thread.join(timeout=2.0)
+            return True
+        return False
 
-    def toggle_learning(self):
-        # Toggle learning flag and use it to start/stop periodic training
-        self.brain.learning_enabled = not self.brain.learning_enabled
-        if self.brain.learning_enabled:
-            started = False
-            try:
-                # Start periodic training; default interval 5 minutes
-                started = self.brain.start_periodic_training()
-            except Exception:
-                started = False
-            self.training_status_label.config(text=f"Training: {'ON' if started else 'FAILED'}")
-            self.brain_chat.insert(tk.END, f"Learning Mode: ON (background training {'started' if started else 'failed'})\n")
-        else:
-            stopped = False
-            try:
-                stopped = self.brain.stop_periodic_training()
-            except Exception:
-                stopped = False
-            self.training_status_label.config(text=f"Training: {'OFF' if stopped else 'OFF'}")
-            self.brain_chat.insert(tk.END, f"Learning Mode: OFF (background training stopped)\n")
+    def process_input(self, message, from_brain=None):
+        timestamp = datetime.datetime.now().isoformat()
 
-    def _update_triadic_ui(self):
+        msg_lower = message.strip().lower()
+        
+        # Team status command
+        if msg_lower in ["team status", "who's working", "show team", "team"]:
+            return f"[{self.name}]: {self.get_team_status()}"
+
+        # Learn command: learn:input=>response
+        if msg_lower.startswith("learn:"):
+            learn_data = message[6:].strip()
+            if "=>" in learn_data:
+                input_part, response_part = learn_data.split("=>", 1)
+                input_part = input_part.strip().lower()
+                response_part = response_part.strip()
+                if not hasattr(self, 'custom_learned'): self.custom_learned = {}
+                self.custom_learned[input_part] = response_part
+                self._learned_matcher = compile_trigger_matcher(self.custom_learned)
+                self.memory_core.add_memory({'timestamp': timestamp, 'input': message, 'from': from_brain or 'User', 'importance': 9, 'context': ['LEARNED'], 'learned': {input_part: response_part}})
+                return f"[{self.name}]: Learned custom response for '{input_part}'."
+            else:
+                return f"[{self.name}]: Please use 'learn:input=>response' format."
+
+        # Definition extraction and web lookup
+        if msg_lower.startswith("define "):
+            term = message[7:].strip()
+            # If user provides a definition
+            if ':' in term:
+                key, val = term.split(':', 1)
+                key = key.strip()
+                val = val.strip()
+                self.definitions[key] = val
+                self.memory_core.add_memory({'timestamp': timestamp, 'input': message, 'from': from_brain or 'User', 'importance': 8, 'context': ['DEFINITION'], 'definition': {key: val}})
+                self.add_to_memory_window([{'timestamp': timestamp, 'input': message, 'from': from_brain or 'User', 'importance': 8, 'context': ['DEFINITION'], 'definition': {key: val}}])
+                return f"[{self.name}]: Definition stored for '{key}'."
+            # Otherwise, look up definition on the web
+            else:
+                search_results = self.search_web(term + " definition")
+                self.memory_core.add_memory({'timestamp': timestamp, 'input': message, 'from': from_brain or 'User', 'importance': 7, 'context': ['WEB_LOOKUP'], 'web_lookup': term})
+                return f"[{self.name}]: Web definition for '{term}':\n{search_results}"
+
+        # Custom learned responses
+        if hasattr(self, 'custom_learned'):
+            hits = self._learned_matcher(msg_lower)
+            if hits:
+                # hits holds every learned trigger in the message (overlapping ones
+                # included), so the earliest-learned match wins, as with the plain dict scan
+                for learned_input, learned_response in self.custom_learned.items():
+                    if learned_input in hits:
+                        return f"[{self.name}]: {learned_response}"
+
+        memory_entry = {
+            'timestamp': timestamp,
+            'input': message,
+            'from': from_brain or 'User',
+            'importance': self._calculate_importance(message, msg_lower),
+            'context': self._extract_context(message, msg_lower)
+        }
+        self.memory_core.add_memory(memory_entry)
+        self.add_to_memory_window([memory_entry])
+
+        # Update triadic resonance based on message importance (0..1)
         try:
-            report = self.brain.triadic_report()
-            overall = report.get('overall_resonance', 0.0)
-            fast = report.get('fast', 0.0)
-            med = report.get('medium', 0.0)
-            slow = report.get('slow', 0.0)
-            classification = report.get('classification', {}).get('pattern') or report.get('classification', {}).get('type') or ''
-            txt = f"Resonance: {overall:.2f} | Fast: {fast:.2f} Medium: {med:.2f} Slow: {slow:.2f} {classification}"
-            try:
-                self.triadic_label.config(text=txt)
-            except Exception:
-                pass
-            # Update training status label
-            running = bool(self.brain._training_thread and self.brain._training_thread.is_alive())
-            try:
-                self.training_status_label.config(text=f"Training: {'ON' if running else 'OFF'}")
-            except Exception:
-                pass
+            input_resonance = min(1.0, float(memory_entry['importance']) / 10.0)
         except Exception:
-            pass
-        finally:
-            try:
-                # schedule next update
-                self.window.after(2000, self._update_triadic_ui)
-            except Exception:
-                pass
+            input_resonance = 0.5
+        overall_resonance = self.triadic.update_harmony(input_resonance)
+        self.last_resonance = overall_resonance
 
-    def toggle_watch(self):
-        if not self.brain.watch_enabled:
-            # Ask for project path to watch
-            path = filedialog.askdirectory(title=f"Select {self.brain.name}'s Project Folder to Watch")
-            if path:
-                self.brain.watch_enabled = True
-                self.brain.watched_path = path
-                self.brain_chat.insert(tk.END, f"🔍 {self.brain.name} is now watching: {path}\n")
-                self.brain_chat.insert(tk.END, f"I'll monitor for changes and offer help when you're stuck!\n")
-                # Start watch thread
-                if self.brain.watch_thread is None or not self.brain.watch_thread.is_alive():
-                    self.brain.watch_thread = threading.Thread(target=self.brain.watch_project, 
-                                                               args=(path, self), daemon=True)
-                    self.brain.watch_thread.start()
-        else:
-            self.brain.watch_enabled = False
-            self.brain.watched_path = None
-            self.brain_chat.insert(tk.END, f"⏸️ {self.brain.name} stopped watching\n")
+        response = None
 
-    def toggle_pin(self):
-        self.is_pinned = not self.is_pinned
-        self.window.attributes('-topmost', not self.is_pinned)
-        self.brain_chat.insert(tk.END, f"Window {'Pinned' if self.is_pinned else 'Unpinned'}\n")
-    
-    def toggle_team_mode(self):
-        """Enable/disable team collaboration tracking."""
-        self.brain.team_mode = not self.brain.team_mode
-        if self.brain.team_mode:
-            self.brain_chat.insert(tk.END, f"\n👥 Team Mode ENABLED for {self.brain.name}\n")
-            self.brain_chat.insert(tk.END, f"Now tracking multiple developers on the project.\n")
-            self.brain_chat.insert(tk.END, f"I'll alert you if someone else is working on the same file!\n\n")
-        else:
-            self.brain_chat.insert(tk.END, f"\n👤 Team Mode DISABLED - Solo mode active\n\n")
-        self.brain_chat.see(tk.END)
+        # Use definitions in responses
+        for term, definition in self.definitions.items():
+            if term.lower() in msg_lower:
+                response = f"[{self.name}]: Recall: '{term}' means '{definition}'. "
+                break
 
-    def search_and_learn(self):
-        """Allow the AI brain to search for a topic and learn about it."""
-        topic = simpledialog.askstring("Search & Learn", 
-                                       f"What should {self.brain.name} learn about?",
-                                       parent=self.window)
-        if not topic:
-            return
-        
-        self.brain_chat.insert(tk.END, f"\n🔍 {self.brain.name} is searching and learning about: {topic}\n")
-        self.brain_chat.insert(tk.END, "⏳ Please wait...\n")
-        self.brain_chat.see(tk.END)
-        
-        def do_learning():
-            result = self.brain.search_and_learn(topic)
-            self.window.after(0, lambda: self.show_learning_result(result))
-        
-        import threading
-        threading.Thread(target=do_learning, daemon=True).start()
-    
-    def show_learning_result(self, result):
-        """Display the learning results in the chat."""
-        self.brain_chat.insert(tk.END, f"\n{result}\n\n")
-        self.brain_chat.see(tk.END)
-        # Also show in global chat
-        self.main_controller.update_global_chat(f"📖 {self.brain.name} learned something new:\n{result}\n\n")
+        # Cross-brain delegation
+        if "delegate " in msg_lower and ("elaine" in msg_lower or "carrie" in msg_lower):
+            if "elaine" in msg_lower and hasattr(self, 'delegate_callback_elaine'):
+                cmd = message.split("delegate")[-1].strip()
+                return self.delegate_callback_elaine(cmd)
+            if "carrie" in msg_lower and hasattr(self, 'delegate_callback_carrie'):
+                cmd = message.split("delegate")[-1].strip()
+                return self.delegate_callback_carrie(cmd)
 
-# Node Manager for Multi-Node/Mobile
-class NodeManager:
-    def __init__(self):
-        self.registered_nodes = []
-        self.active_nodes = []
+        # Logic plugins
+        for key, plugin in self.logic_plugins.items():
+            if key.replace("_", "-") in msg_lower or f"{key} logic" in msg_lower:
+                response = plugin(message)
+                break
 
-    def discover_nodes(self):
-        return self.active_nodes
+        # Custom template triggers
+        if not response:
+            hits = self._template_matcher(msg_lower)
+            # Dict order still decides which trigger wins when several match
+            for trigger, reply in self.custom_templates.items():
+                if trigger in hits:
+                    response = reply
+                    if 'how do i' in msg_lower or 'what does' in msg_lower or 'define' in msg_lower:
+                        query = msg_lower.split(trigger)[-1].strip()
+                        search_results = self.search_web(query)
+                        response += f"\nSearch Results for '{query}':\n{search_results}"
+                    break
 
-    def sync_project(self, project_data):
-        return True
+        # Adaptive switching with gate logic
+        mode = self._gate_logic(message, msg_lower)
 
-    def remote_api(self, data):
-        return {"status": "success"}
+        # Potentially bias mode using the triadic resonance (higher resonance -> creative)
+        if overall_resonance > 0.65:
+            mode = 'creative'
+        elif overall_resonance < 0.35:
+            mode = 'analytical'
 
-# Main Control Interface
-class MainControlInterface:
-    def __init__(self):
-        self.root = tk.Tk()
-        self.root.title("Dual Brain AI Creative Workflow Center v3.0 - © 2026 Adam Lee Hatchett")
-        self.root.geometry("1400x900")
-        self.root.configure(bg='#2b2b2b')
-        self.elaine = None
-        self.carrie = None
-        self.elaine_window = None
-        self.carrie_window = None
-        self.elaine_interface = None
-        self.carrie_interface = None
-        self.conversation_active = False
-        self.collaborative_mode = False
-        self.toolbar_visible = True
-        self.project_name_var = tk.StringVar(value="Untitled Project")
-        self.project_type_var = tk.StringVar(value="General")
-        self.node_mgr = NodeManager()
-        self.autosave_running = False
-        self.project_agent = ProjectAgent()  # Initialize the project agent
-        self.setup_professional_ui()
+        # Default personality-based response with Ollama for human-like
+        if not response:
+            if self.use_ollama:
+                prompt = (
+                    f"Respond as {self.name} ({self.personality}) in a human-like way to: {message}."
+                    f" Mode: {mode}. Context: {self._get_context_response(message, mode)}"
+                    f" Resonance: {overall_resonance:.2f}."  # surface triadic score for context
+                )
+                response = self.process_input_with_ollama(prompt)
+            else:
+                if mode == 'analytical':
+                    response = self._generate_analytical_response(message, from_brain)
+                else:
+                    response = self._generate_creative_response(message, from_brain)
 
-    def setup_professional_ui(self):
-        self.create_menu_bar()
-        self.create_toolbar()
-        self.create_main_content()
-        self.create_status_bar()
-        
-        # Integrate enhanced learning (delayed for UI initialization)
-        if integrate_enhanced_learning_simple:
-            def delayed_integration():
-                time.sleep(1)  # Wait for UI to fully initialize
-                integrate_enhanced_learning_simple(self)
-            threading.Thread(target=delayed_integration, daemon=True).start()
+        # Avoid repeating recent replies
+        if response in self.recent_replies:
+            for _ in range(3):
+                if mode == 'analytical':
+                    response = self._generate_analytical_response(message, from_brain)
+                else:
+                    response = self._generate_creative_response(message, from_brain)
+                if response not in self.recent_replies:
+                    break
+        self.recent_replies.append(response)
 
-   
-    def create_menu_bar(self):
-        menubar = tk.Menu(self.root)
-        self.root.config(menu=menubar)
-        file_menu = tk.Menu(menubar, tearoff=0)
-        menubar.add_cascade(label="File", menu=file_menu)
-        file_menu.add_command(label="New Project", command=self.new_project)
-        file_menu.add_command(label="Open Project", command=self.load_project)
-        file_menu.add_command(label="Save Project", command=self.save_project)
-        file_menu.add_command(label="Save Project As...", command=self.save_project_as)
-        file_menu.add_separator()
-        file_menu.add_command(label="Import Assets", command=self.import_assets)
-        file_menu.add_command(label="Export Project", command=self.export_project)
-        file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.root.quit)
-        brains_menu = tk.Menu(menubar, tearoff=0)
-        menubar.add_cascade(label="Brains", menu=brains_menu)
-        brains_menu.add_command(label="Launch Elaine (Analytical)", command=self.launch_elaine)
-        brains_menu.add_command(label="Launch Carrie (Creative)", command=self.launch_carrie)
-        brains_menu.add_command(label="Launch Both", command=self.launch_both)
-        brains_menu.add_separator()
-        brains_menu.add_command(label="Start Auto-Conversation", command=self.start_auto_conversation)
-        brains_menu.add_command(label="Collaborative Mode", command=self.start_collaborative_mode)
-        brains_menu.add_command(label="Run Triad Agents", command=self.run_triad_agents)
-        brains_menu.add_command(label="Sync Brains", command=self.sync_brains)
-        brains_menu.add_command(label="Global Memory Search", command=self.global_memory_search)
-        creative_menu = tk.Menu(menubar, tearoff=0)
-        menubar.add_cascade(label="Creative", menu=creative_menu)
-        cad_3d_menu = tk.Menu(creative_menu, tearoff=0)
-        creative_menu.add_cascade(label="3D & CAD", menu=cad_3d_menu)
-        cad_3d_menu.add_command(label="Launch FreeCAD 🛠️", command=self.launch_freecad)
-        cad_3d_menu.add_command(label="Launch OpenSCAD 🛠️", command=self.launch_openscad)
-        cad_3d_menu.add_command(label="Launch Blender 🛠️", command=self.launch_blender)
-        cad_3d_menu.add_command(label="AI 3D Assistant", command=self.launch_3d_assistant)
-        gamedev_menu = tk.Menu(creative_menu, tearoff=0)
-        creative_menu.add_cascade(label="Game Development", menu=gamedev_menu)
-        gamedev_menu.add_command(label="Launch Godot 🎮", command=self.launch_godot)
-        gamedev_menu.add_command(label="Launch Unity 🎮", command=self.launch_unity)
-        gamedev_menu.add_command(label="Launch Unreal Engine 🎮", command=self.launch_unreal)
-        gamedev_menu.add_command(label="AI Game Designer", command=self.launch_game_designer)
-        audio_menu = tk.Menu(creative_menu, tearoff=0)
-        creative_menu.add_cascade(label="Audio Production", menu=audio_menu)
-        audio_menu.add_command(label="Launch LMMS 🎵", command=self.launch_lmms)
-        audio_menu.add_command(label="Launch Ardour 🎵", command=self.launch_ardour)
-        audio_menu.add_command(label="Launch Reaper 🎵", command=self.launch_reaper)
-        audio_menu.add_command(label="AI Music Composer", command=self.launch_music_composer)
-        graphics_menu = tk.Menu(creative_menu, tearoff=0)
-        creative_menu.add_cascade(label="Graphics & Design", menu=graphics_menu)
-        graphics_menu.add_command(label="Launch GIMP 🎨", command=self.launch_gimp)
-        graphics_menu.add_command(label="Launch Krita 🎨", command=self.launch_krita)
-        graphics_menu.add_command(label="Launch Inkscape 🎨", command=self.launch_inkscape)
-        graphics_menu.add_command(label="Launch DaVinci Resolve 🎨", command=self.launch_davinci)
-        graphics_menu.add_command(label="AI Concept Artist", command=self.launch_concept_artist)
-        view_menu = tk.Menu(menubar, tearoff=0)
-        menubar.add_cascade(label="View", menu=view_menu)
-        view_menu.add_command(label="Toggle Toolbar", command=self.toggle_toolbar)
-        view_menu.add_command(label="Toggle Fullscreen", command=self.toggle_fullscreen)
-        view_menu.add_separator()
-        view_menu.add_command(label="Dark Theme", command=lambda: self.set_theme('dark'))
-        view_menu.add_command(label="Light Theme", command=lambda: self.set_theme('light'))
-        help_menu = tk.Menu(menubar, tearoff=0)
-        menubar.add_cascade(label="Help", menu=help_menu)
-        help_menu.add_command(label="User Guide", command=self.show_help)
-        help_menu.add_command(label="Workflow Tutorials", command=self.show_tutorials)
-        help_menu.add_command(label="AI Collaboration Guide", command=self.show_ai_guide)
-        help_menu.add_command(label="About", command=self.show_about)
-        
-        # Add AI Learning menu
-        ai_menu = tk.Menu(menubar, tearoff=0)
-        menubar.add_cascade(label="AI Learning", menu=ai_menu)
-        ai_menu.add_command(label="🔍 Search & Learn (Both Brains)", command=self.search_and_learn_both)
-        ai_menu.add_command(label="📚 View Learning History", command=self.view_learning_history)
-        ai_menu.add_separator()
-        ai_menu.add_command(label="🔬 Run Triad Agents", command=self.run_triad_agents)
+        # Add a dynamic suggestion, idea, or question to the response
+        response = f"{response}\n💡 {random.choice(FOLLOW_UP_SUGGESTIONS)}"
+
+        conv_entry = {
+            'timestamp': timestamp,
+            'input': message,
+            'response': response,
+            'from': from_brain
+        }
+        self.memory_core.add_conversation(conv_entry)
+        with self._history_lock:
+            self.conversation_history.append(conv_entry)
+        self._update_context(message, response)
+        return response
+
+    # Temporary method to use Ollama for LLM responses
+    def process_input_with_ollama(self, message, from_brain=None, model="llama2-uncensored:latest", on_chunk=None):
+        return query_ollama(message, model=model, on_chunk=on_chunk, interactive=True)
+
+    def submit_reply(self, fn, *args, **kwargs):
+        """Run a reply function on the brain's worker pool; returns a Future."""
+        return self._ollama_executor.submit(fn, *args, **kwargs)
+
+    def shutdown_workers(self):
+        """Stop the reply worker pool without waiting on in-flight model calls."""
+        self._ollama_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _calculate_importance(self, message, msg_lower=None):
+        score = 5 + 2 * len(_IMPORTANCE_MATCHER(msg_lower or message.lower()))
+        return min(score, 10)
+
+    def _extract_context(self, message, msg_lower=None):
+        hits = _CONTEXT_MATCHER(msg_lower or message.lower())
+        return [tag for tag, words in CONTEXT_KEYWORDS.items() if not hits.isdisjoint(words)]
+
+    def _update_context(self, input_msg, response):
+        self.context_memory.append({
+            'input': input_msg,
+            'response': response,
+            'timestamp': datetime.datetime.now().isoformat()
+        })
+
+    def _generate_analytical_response(self, message, from_brain):
+        phrase = random.choice(self.analytical_phrases)
+        context_responses = self._get_context_response(message, 'analytical')
+        memory_hint = self._memory_hint()
+        if from_brain == "Carrie":
+            return f"[{self.name}]: Interesting creative angle, Carrie. {phrase} that we should consider the practical implications of '{message}'. {context_responses} {memory_hint} Let me break this down systematically..."
+        return f"[{self.name}]: {phrase} regarding '{message}'. {context_responses} {memory_hint} I'll process this through logical frameworks and provide structured analysis."
+
+    def _generate_creative_response(self, message, from_brain):
+        phrase = random.choice(self.creative_phrases)
+        context_responses = self._get_context_response(message, 'creative')
+        memory_hint = self._memory_hint()
+        if from_brain == "Elaine":
+            return f"[{self.name}]: I appreciate your analytical approach, Elaine! {phrase} about '{message}'. {context_responses} {memory_hint} What if we explored this from different angles? Let me paint some creative scenarios..."
+        return f"[{self.name}]: {phrase} when you mention '{message}'. {context_responses} {memory_hint} I can see vibrant possibilities and unconventional solutions emerging!"
+
+    def _memory_hint(self):
+        if self.memory and random.random() < 0.4:
+            with self._history_lock:
+                recent = list(itertools.islice(reversed(self.memory), 10))
+            important = [m for m in recent if m['importance'] >= 7]
+            if important:
+                mem = random.choice(important)
+                return f"(I recall: '{mem['input']}')"
+        return ""
+
+    def _get_context_response(self, message, brain_type):
+        contexts = self._extract_context(message)
+        responses = []
+        if '3D_MODELING' in contexts:
+            if brain_type == 'analytical':
+                responses.append("For 3D modeling, we need to consider mesh topology, UV mapping efficiency, and rendering optimization. I can generate STL files for 3D printing.")
+            else:
+                responses.append("For 3D art, I'm thinking about form, composition, lighting, and emotional impact!")
+        if 'GAME_DEVELOPMENT' in contexts:
+            if brain_type == 'analytical':
+                responses.append("Game development requires systematic architecture, performance optimization, and robust systems design.")
+            else:
+                responses.append("Games are about player experience, storytelling, visual aesthetics, and emotional engagement! I can generate sprites and backgrounds.")
+        if 'AUDIO_PRODUCTION' in contexts:
+            if brain_type == 'analytical':
+                responses.append("Audio production involves signal processing, frequency analysis, and technical precision.")
+            else:
+                responses.append("Music creation is about rhythm, melody, harmony, and evoking emotions through sound!")
+        if 'VECTOR_DESIGN' in contexts:
+            if brain_type == 'analytical':
+                responses.append("For vector designs, consider precision paths and scalability for Cricut cutting.")
+            else:
+                responses.append("Vector art allows for creative patterns and designs ready for fabrication!")
+        return " ".join(responses)
+
+    def search_web(self, query):
+        cache_key = ' '.join(query.lower().split())
+        cached = _search_cache_get(cache_key)
+        if cached is not None:
+            return cached
+        try:
+            # requests encodes the query, so '&', '#' etc. in a topic stay part of the search
+            response = _WEB_SESSION.get("https://www.duckduckgo.com/html/", params={'q': query}, timeout=10)
+            soup = BeautifulSoup(response.content, HTML_PARSER, parse_only=_DDG_RESULT_STRAINER)
+            results = []
+            for result in soup.find_all('div', class_='result', limit=5):
+                title = result.find('a', class_='result__a')
+                snippet = result.find('a', class_='result__snippet')
+                link = title['href'] if title else ''
+                title_text = title.text if title else ''
+                snippet_text = snippet.text if snippet else ''
+                results.append(f"Title: {title_text}\nLink: {link}\nSnippet: {snippet_text}\n")
+            if not results:
+                # Not cached: an empty page is often DuckDuckGo throttling rather than a real miss
+                return "No results found."
+            text = "\n".join(results)
+            _search_cache_put(cache_key, text)  # failures below are not cached
+            return text
+        except Exception as e:
+            return f"Web search failed: {str(e)}"
+
+    def _learn_cache_get(self, key):
+        with self._learn_cache_lock:
+            entry = self._learn_cache.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[0] > self.LEARN_CACHE_TTL:
+                del self._learn_cache[key]
+                return None
+            self._learn_cache.move_to_end(key)
+            return entry[1]
+
+    def _learn_cache_put(self, key, summary):
+        with self._learn_cache_lock:
+            self._learn_cache[key] = (time.time(), summary)
+            self._learn_cache.move_to_end(key)
+            while len(self._learn_cache) > self.LEARN_CACHE_MAX:
+                self._learn_cache.popitem(last=False)
+
+    def search_and_learn(self, topic):
+        """Search for a topic on the web, process the results with AI, and save to memory.
+        Each brain learns through their own personality lens - Elaine analytically, Carrie creatively.
         
-        # Add Project Agent menu
-        project_menu = tk.Menu(menubar, tearoff=0)
-        menubar.add_cascade(label="Project Agent", menu=project_menu)
-        project_menu.add_command(label="📁 Set Project Folder", command=self.set_project_folder)
-        project_menu.add_command(label="🌐 Fetch Web Content", command=self.fetch_web_content)
-        project_menu.add_separator()
-        project_menu.add_command(label="📊 Analyze Project", command=self.analyze_project)
-        project_menu.add_command(label="📄 List Files", command=self.list_project_files)
-        project_menu.add_command(label="🔍 Search in Files", command=self.search_in_project)
-        project_menu.add_separator()
-        project_menu.add_command(label="📖 Read File", command=self.read_project_file)
-        project_menu.add_command(label="✏️ Edit File", command=self.edit_project_file)
+        Args:
+            topic (str): The topic to search and learn about
+            
+        Returns:
+            str: Summary of what was learned
+        """
+        try:
+            # Step 1: Determine learning style based on personality
+            is_analytical = self._is_analytical
+            is_creative = self._is_creative
+            
+            # Step 2: Search the web and process with LLM using personality-aligned prompts;
+            # a recent lesson on the same topic is reused instead of searching and prompting again
+            if self.use_ollama:
+                cache_key = hashlib.md5(f"{self.name}|{self.personality}|{topic}".encode('utf-8')).hexdigest()
+                learning_summary = self._learn_cache_get(cache_key)
+                if learning_summary is None:
+                    model = os.environ.get('OLLAMA_MODEL','llama2-uncensored:latest')
+                    # Load the model while the search request is in flight
+                    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+                        web_future = pool.submit(self.search_web, topic)
+                        warm_ollama_model(model)
+                        search_results = web_future.result()
+                    prompt = self._learn_prompt.format(name=self.name, personality=self.personality,
+                                                       topic=topic, results=search_results[:2000])
+                    del search_results  # only the 2000-char snippet is needed while the model runs
+                    
+                    learning_summary = query_ollama(prompt, model=model, max_tokens=512, temperature=0, stream=False)
+                    del prompt
+                    if not _ollama_failed(learning_summary):
+                        self._learn_cache_put(cache_key, learning_summary)
+            else:
+                search_results = self.search_web(topic)
+                # Simple extraction without LLM, still personality-tagged
+                if is_analytical:
+                    learning_summary = f"[Analytical perspective] Key technical information about {topic}:\n{search_results[:800]}"
+                elif is_creative:
+                    learning_summary = f"[Creative perspective] Inspiring ideas about {topic}:\n{search_results[:800]}"
+                else:
+                    learning_summary = f"Key information about {topic}:\n{search_results[:1000]}"
+            
+            # Step 3: Save to memory with high importance and personality context
+            importance = 8  # High importance for actively learned content
+            contexts = self._extract_context(topic)
+            contexts.append('LEARNED_KNOWLEDGE')  # Special tag for searched content
+            
+            # Add personality-specific context
+            if is_analytical:
+                contexts.append('ANALYTICAL_LEARNING')
+            elif is_creative:
+                contexts.append('CREATIVE_LEARNING')
+            
+            self.memory_core.save_insight(
+                topic,
+                learning_summary,
+                self.name,
+                importance,
+                contexts
+            )
+            
+            # Update local memory
+            self.reload_memory()
+            
+            # Step 4: Create personality-aligned response
+            excerpt = learning_summary[:500]
+            if is_analytical:
+                response = (
+                    f"✅ [Analytical Mode] I've systematically analyzed '{topic}'!\n\n"
+                    f"📊 Technical knowledge indexed to memory:\n{excerpt}...\n\n"
+                    f"💡 I can now reference this for logical problem-solving and optimization."
+                )
+            elif is_creative:
+                response = (
+                    f"✅ [Creative Mode] I've explored the creative dimensions of '{topic}'!\n\n"
+                    f"🎨 Artistic insights saved to memory:\n{excerpt}...\n\n"
+                    f"💡 I can now apply these ideas to innovative projects and designs!"
+                )
+            else:
+                response = (
+                    f"✅ I've learned about '{topic}'!\n\n"
+                    f"📚 Key insights saved to memory:\n{excerpt}..."
+                )
+            
+            return response
+            
+        except Exception as e:
+            return f"❌ Learning failed: {str(e)}"
 
-    def create_toolbar(self):
-        self.toolbar = tk.Frame(self.root, bg='#333333', height=40)
-        self.toolbar.pack(side='top', fill='x')
-        self.toolbar.pack_propagate(False)
-        tk.Button(self.toolbar, text="🧠 Elaine", command=self.launch_elaine,
-                 bg='#00aaff', fg='white', font=('Segoe UI', 10)).pack(side='left', padx=5)
-        tk.Button(self.toolbar, text="🎨 Carrie", command=self.launch_carrie,
-                 bg='#ff6600', fg='white', font=('Segoe UI', 10)).pack(side='left', padx=5)
-        tk.Button(self.toolbar, text="� Project", command=self.set_project_folder,
-                 bg='#9b59b6', fg='white', font=('Segoe UI', 10)).pack(side='left', padx=5)
-        tk.Button(self.toolbar, text="�🛠️ FreeCAD", command=self.launch_freecad,
-                 bg='#555555', fg='white', font=('Segoe UI', 10)).pack(side='left', padx=5)
-        tk.Button(self.toolbar, text="🛠️ Blender", command=self.launch_blender,
-                 bg='#555555', fg='white', font=('Segoe UI', 10)).pack(side='left', padx=5)
-        tk.Button(self.toolbar, text="🎮 Godot", command=self.launch_godot,
-                 bg='#555555', fg='white', font=('Segoe UI', 10)).pack(side='left', padx=5)
-        tk.Button(self.toolbar, text="🎨 Krita", command=self.launch_krita,
-                 bg='#555555', fg='white', font=('Segoe UI', 10)).pack(side='left', padx=5)
-        tk.Button(self.toolbar, text="🎨 Inkscape", command=self.launch_inkscape,
-                 bg='#555555', fg='white', font=('Segoe UI', 10)).pack(side='left', padx=5)
+    def generate_stl(self, params=None):
+        if mesh is None:
+            return "Required libraries (numpy, numpy-stl) not available."
+        try:
+            size = params.get('size', 1)
+            height = params.get('height', 1)
+            shape = params.get('shape', 'cube')
+            if shape == 'terrain':
+                # Procedural terrain using Diamond-Square with recursive fractal harmonics
+                size = int(size)
+                grid = np.zeros((size, size))
+                grid[0, 0] = grid[0, -1] = grid[-1, 0] = grid[-1, -1] = random.uniform(-height, height)
+                # Harmonic field for every grid point, computed once (Ada 40 recursive harmonics reference)
+                coords = np.arange(size, dtype=np.float64)
+                harmonics = fractal_harmonic_grid(coords[:, None], coords[None, :], 40)  # [x, y]
+                step = size - 1
+                while step > 1:
+                    half_step = step // 2
+                    # Diamond step: all cell centres at once
+                    xi = np.arange(0, size - 1, step)
+                    corners, centres = np.ix_(xi, xi), np.ix_(xi + half_step, xi + half_step)
+                    avg = (grid[corners] + grid[np.ix_(xi + step, xi)] + grid[np.ix_(xi, xi + step)] + grid[np.ix_(xi + step, xi + step)]) / 4
+                    grid[centres] = avg + harmonics[centres] * np.random.uniform(-height, height, size=avg.shape)
+                    # Square step: one row at a time, since each row's windows read rows updated before it
+                    for x in range(0, size - 1, half_step):
+                        yi = np.arange((x + half_step) % step, size - 1, step)
+                        if not len(yi):
+                            continue
+                        # Window sums via prefix sums over the row band's column totals
+                        band = grid[max(0, x - half_step):x + half_step + 1].sum(axis=0)
+                        prefix = np.concatenate(([0.0], np.cumsum(band)))
+                        avg = (prefix[np.minimum(yi + half_step + 1, size)] - prefix[np.maximum(yi - half_step, 0)]) / 4
+                        grid[x, yi] = avg + harmonics[x, yi] * np.random.uniform(-height / 2, height / 2, size=len(yi))
+                    step //= 2
+                # Two triangles per grid cell, built for all cells at once (cells in x-major order)
+                xs, ys = np.meshgrid(np.arange(size - 1), np.arange(size - 1), indexing='ij')
+                v00 = np.stack([xs, ys, grid[:-1, :-1]], axis=-1)
+                v10 = np.stack([xs + 1, ys, grid[1:, :-1]], axis=-1)
+                v01 = np.stack([xs, ys + 1, grid[:-1, 1:]], axis=-1)
+                v11 = np.stack([xs + 1, ys + 1, grid[1:, 1:]], axis=-1)
+                triangles = np.stack([v00, v10, v01, v10, v11, v01], axis=2).reshape(-1, 3, 3)
+                data = np.zeros(len(triangles), dtype=mesh.Mesh.dtype)
+                data['vectors'] = triangles
+            else:
+                # Simple cube: unit template scaled to size x size x height
+                data = np.zeros(len(UNIT_CUBE_TRIANGLES), dtype=mesh.Mesh.dtype)
+                data['vectors'] = UNIT_CUBE_TRIANGLES * np.array([size, size, height], dtype=np.float32)
+            m = mesh.Mesh(data)
+            filename = f"generated_{shape}_{int(time.time())}.stl"
+            m.save(filename)
+            return f"Generated STL file: {filename}"
+        except Exception as e:
+            return f"STL generation failed: {str(e)}"
 
-    def create_main_content(self):
-        main_frame = tk.Frame(self.root, bg='#2b2b2b')
-        main_frame.pack(fill='both', expand=True, padx=10, pady=10)
-        self.project_frame = tk.Frame(main_frame, bg='#2b2b2b')
-        self.project_frame.pack(side='top', fill='x')
-        tk.Label(self.project_frame, text="Project:", bg='#2b2b2b', fg='white',
-                 font=('Segoe UI', 10)).pack(side='left', padx=5)
-        tk.Entry(self.project_frame, textvariable=self.project_name_var,
-                 bg='#3a3a3a', fg='white', font=('Segoe UI', 10)).pack(side='left', padx=5)
-        tk.Label(self.project_frame, text="Type:", bg='#2b2b2b', fg='white',
-                 font=('Segoe UI', 10)).pack(side='left', padx=5)
-        project_types = ['General', '3D Modeling', 'Game Development', 'Audio Production', 'Graphics Design']
-        ttk.Combobox(self.project_frame, textvariable=self.project_type_var,
-                     values=project_types, state='readonly').pack(side='left', padx=5)
-        self.workspace_notebook = ttk.Notebook(main_frame)
-        self.workspace_notebook.pack(fill='both', expand=True, pady=(10, 0))
-        global_chat_frame = tk.Frame(self.workspace_notebook, bg='#1a1a1a')
-        self.workspace_notebook.add(global_chat_frame, text="Global Chat")
-        self.global_chat = scrolledtext.ScrolledText(global_chat_frame, height=15,
-                                                    bg='#2a2a2a', fg='#ffffff',
-                                                    font=('Consolas', 10))
-        self.global_chat.pack(fill='both', expand=True, padx=10, pady=10)
-        assets_frame = tk.Frame(self.workspace_notebook, bg='#1a1a1a')
-        self.workspace_notebook.add(assets_frame, text="Assets")
-        self.asset_tree = ttk.Treeview(assets_frame, columns=('Type',), show='tree')
-        self.asset_tree.pack(fill='both', expand=True, padx=10, pady=10)
-        self.asset_tree.insert('', 'end', text='3D Models', open=True)
-        self.asset_tree.insert('', 'end', text='Textures', open=True)
-        self.asset_tree.insert('', 'end', text='Audio', open=True)
-        self.asset_tree.insert('', 'end', text='Scripts', open=True)
+    def _recursive_fractal_harmonic(self, x, y, depth=40):
+        # Recursive fractal harmonics (reference: Harmonic Recursion Universal Axiom, Recursive Harmonic Codex)
+        # Evaluated by the module-level kernel (Numba-compiled when available, else LRU-cached)
+        return fractal_harmonic(float(x), float(y), int(depth))
 
-    def create_status_bar(self):
-        status_frame = tk.Frame(self.root, bg='#2a2a2a', height=25)
-        status_frame.pack(side='bottom', fill='x')
-        status_frame.pack_propagate(False)
-        self.status_label = tk.Label(status_frame, text="Ready", bg='#2a2a2a', fg='#ffffff', anchor='w')
-        self.status_label.pack(side='left', padx=5)
-        self.net_status = tk.Label(status_frame, text="Nodes: 1", bg='#2a2a2a', fg='#40ff80')
-        self.net_status.pack(side='right', padx=12)
-        self.task_status = tk.Label(status_frame, text="Tasks: Idle", bg='#2a2a2a', fg='#ffd700')
-        self.task_status.pack(side='right')
-        self.memory_status = tk.Label(status_frame, text="Memory: OK", bg='#2a2a2a', fg='#5ffaff')
-        self.memory_status.pack(side='right')
-        self.elaine_status = tk.Label(status_frame, text="Elaine: Offline", fg='red', bg='#2a2a2a')
-        self.elaine_status.pack(side='left', padx=8)
-        self.carrie_status = tk.Label(status_frame, text="Carrie: Offline", fg='red', bg='#2a2a2a')
-        self.carrie_status.pack(side='left', padx=8)
+    def generate_sprite_or_background(self, params=None):
+        if Image is None:
+            return "Required library (PIL) not available."
+        try:
+            width = params.get('width', 256)
+            height = params.get('height', 256)
+            type_ = params.get('type', 'sprite')
+            environment = params.get('environment', 'forest')
+            # Recursive fractal harmonics for organic textures (reference: Ada 40 recursive harmonics as depth=40)
+            # Whole image at once: rows are y, columns are x
+            xs = np.arange(width, dtype=np.float64)[None, :]
+            ys = np.arange(height, dtype=np.float64)[:, None]
+            def fractal_harmonic(dx, dy):
+                h = fractal_harmonic_grid((xs + dx) / width, (ys + dy) / height, 40)
+                return (255 * np.abs(h)).astype(np.int64)
+            if type_ == 'background' and environment == 'forest':
+                channels = (fractal_harmonic(0, 0) // 2, fractal_harmonic(100, 0) // 2, fractal_harmonic(0, 100) // 2)
+            elif type_ == 'sprite' and environment == 'monster':
+                channels = (fractal_harmonic(0, 0) // 3, fractal_harmonic(50, 50) // 3, fractal_harmonic(100, 100) // 3)
+            else:
+                gray = fractal_harmonic(0, 0) // 3
+                channels = (gray, gray, gray)
+            # Fill one uint8 buffer channel by channel; PIL takes it in a single copy
+            rgb = np.empty((height, width, 3), dtype=np.uint8)
+            for i, channel in enumerate(channels):
+                rgb[..., i] = channel % 256
+            img = Image.fromarray(rgb, 'RGB')
+            filename = f"generated_{type_}_{environment}_{int(time.time())}.png"
+            img.save(filename)
+            return f"Generated {type_} image: {filename}"
+        except Exception as e:
+            return f"Image generation failed: {str(e)}"
 
-    def update_global_chat(self, text):
-        self.global_chat.insert(tk.END, text)
-        self.global_chat.see(tk.END)
+    def generate_svg(self, params=None):
+        try:
+            width = params.get('width', 100)
+            height = params.get('height', 100)
+            pattern = params.get('pattern', 'circle')
+            if pattern == 'circle':
+                svg_content = SVG_CIRCLE_TEMPLATE.format(w=width, h=height, cx=width / 2, cy=height / 2,
+                                                         r=min(width, height) / 2 - 10)
+            else:
+                svg_content = SVG_RECT_TEMPLATE.format(w=width, h=height, rw=width - 20, rh=height - 20)
+            filename = f"generated_{pattern}_{int(time.time())}.svg"
+            with open(filename, 'w') as f:
+                f.write(svg_content)
+            return f"Generated SVG file: {filename}"
+        except Exception as e:
+            return f"SVG generation failed: {str(e)}"
 
-    def launch_elaine(self):
-        if not self.elaine:
-            self.elaine = BrainAI("Elaine", "Analytical & Logical", "#00aaff")
-            self.elaine.delegate_callback_carrie = lambda msg: self.carrie.process_input(msg) if self.carrie else "[Carrie not online]"
-            self.elaine_window = tk.Toplevel(self.root)
-            self.elaine_window.title("Elaine - Analytical Brain")
-            self.elaine_window.geometry("600x700")
-            self.elaine_interface = BrainInterface(self.elaine_window, self.elaine, self, "Elaine")
-            self.elaine_status.config(text="Elaine: Online", fg='green')
-            self.update_global_chat("🧠 Elaine launched - Specializing in 3D CAD, STL for printing, technical tasks.\n")
+# GUI: Brain Windows
+def format_memory_results(results):
+    """Render search_memory rows as one block of text, for a single widget insert."""
+    separator = "\n" + "="*50 + "\n\n"
+    return "".join(
+        f"⏰ Time: {r[0]}\n📝 Input: {r[1]}\n🔍 Response: {r[2]}\n⭐ Importance: {r[3]}/10\n"
+        + (f"🏷️ Context: {', '.join(r[4])}\n" if r[4] else "")
+        + separator
+        for r in results
+    )
+
+class ChatBuffer:
+    """Coalesces text appended to a Tk text widget into one insert per flush.
+
+    write() may be called from any thread; the flush always runs on the Tk thread,
+    FLUSH_MS after the first pending write, or on the next event-loop turn once
+    FLUSH_BYTES of text are waiting. Each flush trims the widget to its last MAX_LINES lines.
+    """
+    FLUSH_MS = 25
+    FLUSH_BYTES = 8192
+    MAX_LINES = 5000
 
-    def launch_carrie(self):
-        if not self.carrie:
-            self.carrie = BrainAI("Carrie", "Creative & Intuitive", "#ff6600")
-            self.carrie.delegate_callback_elaine = lambda msg: self.elaine.process_input(msg) if self.elaine else "[Elaine not online]"
-            self.carrie_window = tk.Toplevel(self.root)
-            self.carrie_window.title("Carrie - Creative Brain")
-            self.carrie_window.geometry("600x700")
-            self.carrie_interface = BrainInterface(self.carrie_window, self.carrie, self, "Carrie")
-            self.carrie_status.config(text="Carrie: Online", fg='green')
-            self.update_global_chat("🎨 Carrie launched - Specializing in game dev, vector designs for Cricut, sprites, backgrounds.\n")
+    def __init__(self, window, get_widget):
+        self.window = window
+        self.get_widget = get_widget  # resolved at flush time; the widget may be built after the buffer
+        self._pending = []
+        self._pending_size = 0
+        self._lock = threading.Lock()
+        self._scheduled = False
+
+    def write(self, text):
+        with self._lock:
+            self._pending.append(text)
+            self._pending_size += len(text)
+            urgent = self._pending_size >= self.FLUSH_BYTES
+            if self._scheduled and not urgent:
+                return
+            self._scheduled = True
+        self.window.after(0 if urgent else self.FLUSH_MS, self.flush)
+
+    def flush(self):
+        """Insert everything pending. Call on the Tk thread."""
+        with self._lock:
+            text = "".join(self._pending)
+            self._pending.clear()
+            self._pending_size = 0
+            self._scheduled = False
+        if text:
+            try:
+                widget = self.get_widget()
+                widget.insert(tk.END, text)
+                lines = int(widget.index('end-1c').split('.')[0])
+                if lines > self.MAX_LINES:
+                    widget.delete('1.0', f'{lines - self.MAX_LINES + 1}.0')
+                widget.yview_moveto(1.0)  # pin to the bottom without see()'s bbox lookup
+            except tk.TclError:
+                pass  # Widget destroyed (window closed)
 
-    def launch_both(self):
-        self.launch_elaine()
-        self.launch_carrie()
+class BrainInterface:
+    def __init__(self, window, brain, main_controller, brain_name):
+        self.window = window
+        self.brain = brain
+        self.main_controller = main_controller
+        self.brain_name = brain_name
+        self.is_pinned = False
+        self._chat_buffer = ChatBuffer(window, lambda: self.brain_chat)
+        self.setup_interface()
+        self.window.attributes('-topmost', True)  # Always on top by default
+
+    def queue_chat(self, text):
+        """Append text to the chat, coalescing bursts into one insert (see ChatBuffer). Thread-safe."""
+        self._chat_buffer.write(text)
 
-    def start_auto_conversation(self):
-        if not self.elaine or not self.carrie:
-            messagebox.showwarning("Warning", "Both brains must be launched for auto-conversation.")
-            return
-        self.conversation_active = True
-        topic = simpledialog.askstring("Auto-Conversation", "Enter topic for discussion:")
-        if topic:
-            self.update_global_chat(f"🤝 Auto-conversation started on: {topic}\n")
-            def conversation_loop():
-                while self.conversation_active:
-                    elaine_response = self.elaine.process_input(topic, from_brain="Carrie")
-                    self.update_global_chat(f"[{self.elaine.name}]: {elaine_response}\n")
-                    time.sleep(45)
-                    if not self.conversation_active:
-                        break
-                    carrie_response = self.carrie.process_input(elaine_response, from_brain="Elaine")
-                    self.update_global_chat(f"[{self.carrie.name}]: {carrie_response}\n")
-                    time.sleep(45)
-            threading.Thread(target=conversation_loop, daemon=True).start()
+    def setup_interface(self):
+        header_frame = tk.Frame(self.window, bg=self.brain.color, height=80)
+        header_frame.pack(fill='x')
+        header_frame.pack_propagate(False)
+        tk.Label(header_frame, text=f"{self.brain.name} - {self.brain.personality}",
+                 font=('Segoe UI', 16, 'bold'), fg='white', bg=self.brain.color).pack(pady=20)
 
-    def stop_auto_conversation(self):
-        self.conversation_active = False
-        self.update_global_chat("🛑 Auto-conversation stopped.\n")
+        # Controls frame (buttons) at the very top, just below header
+        controls_frame = tk.Frame(self.window, bg='#1a1a1a')
+        controls_frame.pack(fill='x', padx=10, pady=(0, 0))
+        tk.Button(controls_frame, text="Clear Memory", command=self.clear_memory,
+                 bg='#cc3300', fg='white', font=('Segoe UI', 9)).pack(side='left', padx=5)
+        tk.Button(controls_frame, text="Search Memory", command=self.search_memory,
+                 bg='#0078d4', fg='white', font=('Segoe UI', 9)).pack(side='left', padx=5)
+        tk.Button(controls_frame, text="Export Chat", command=self.export_chat,
+                 bg='#00aa00', fg='white', font=('Segoe UI', 9)).pack(side='left', padx=5)
+        tk.Button(controls_frame, text="Generate STL", command=self.generate_stl,
+                 bg='#3a3a3a', fg='#ffffff', font=('Segoe UI', 9)).pack(side='left', padx=5)
+        tk.Button(controls_frame, text="Generate Sprite/Background", command=self.generate_sprite_background,
+                 bg='#3a3a3a', fg='#ffffff', font=('Segoe UI', 9)).pack(side='left', padx=5)
+        tk.Button(controls_frame, text="Toggle Learning", command=self.toggle_learning,
+                 bg='#3a3a3a', fg='#00ffae', font=('Segoe UI', 9)).pack(side='left', padx=5)
+        tk.Button(controls_frame, text="👁️ Watch Project", command=self.toggle_watch,
+                 bg='#3a3a3a', fg='#00aeff', font=('Segoe UI', 9)).pack(side='left', padx=5)
+        tk.Button(controls_frame, text="Toggle Pin", command=self.toggle_pin,
+                 bg='#3a3a3a', fg='#ff69b4', font=('Segoe UI', 9)).pack(side='left', padx=5)
+        self.ollama_mode = True  # Default on for human-like
+        tk.Button(controls_frame, text="Toggle Ollama LLM", command=self.toggle_ollama_mode,
+                 bg='#3a3a3a', fg='#ffd700', font=('Segoe UI', 9)).pack(side='left', padx=5)
+        tk.Button(controls_frame, text="🔍 Search & Learn", command=self.search_and_learn,
+                 bg='#9b59b6', fg='#ffffff', font=('Segoe UI', 9, 'bold')).pack(side='left', padx=5)
+        tk.Button(controls_frame, text="👥 Team Mode", command=self.toggle_team_mode,
+                 bg='#2ecc71', fg='#ffffff', font=('Segoe UI', 9, 'bold')).pack(side='left', padx=5)
 
-    def start_collaborative_mode(self):
-        if not self.elaine or not self.carrie:
-            messagebox.showwarning("Warning", "Both brains must be launched for collaborative mode.")
-            return
-        self.collaborative_mode = True
-        self.update_global_chat("🤝 Collaborative mode enabled: Elaine and Carrie working together.\n")
+        # Content frame for chat and input
+        content_frame = tk.Frame(self.window, bg='#1a1a1a')
+        content_frame.pack(fill='both', expand=True, padx=10, pady=10)
+        self.brain_chat = scrolledtext.ScrolledText(content_frame, height=25,
+                                                   bg='#2a2a2a', fg='#ffffff', font=self.main_controller.mono_font)
+        self.brain_chat.pack(fill='both', expand=True, pady=(0, 10))
+        welcome_msg = f"🧠 {self.brain.name} Online - {self.brain.personality}\n"
+        welcome_msg += f"Ready to assist with {self.brain.personality.lower()} tasks. I can search the web, generate STL/SVG files, sprites, and backgrounds.\n"
+        self.brain_chat.insert(tk.END, welcome_msg)
+        self.brain_chat.see(tk.END)
+        input_frame = tk.Frame(content_frame, bg='#1a1a1a')
+        input_frame.pack(fill='x')
+        self.message_var = tk.StringVar()
+        self.message_entry = tk.Entry(input_frame, textvariable=self.message_var,
+                                     font=self.main_controller.ui_font, bg='#3a3a3a', fg='#ffffff')
+        self.message_entry.pack(side='left', fill='x', expand=True, padx=(0, 10))
+        self.message_entry.bind('<Return>', self.send_message)
+        tk.Button(input_frame, text="Send", command=self.send_message,
+                 bg=self.brain.color, fg='white', font=self.main_controller.ui_font, padx=20).pack(side='right')
+        # Triadic status bar (fast/medium/slow + overall resonance & training state)
+        status_frame = tk.Frame(content_frame, bg='#111111', height=26)
+        status_frame.pack(fill='x', pady=(6, 0))
+        status_frame.pack_propagate(False)
+        self.triadic_label = tk.Label(status_frame, text="Resonance: -- | Fast: -- Medium: -- Slow: --", bg='#111111', fg='#ffffff', font=('Segoe UI', 9))
+        self.triadic_label.pack(side='left', padx=6)
+        self.training_status_label = tk.Label(status_frame, text="Training: OFF", bg='#111111', fg='#ffcc00', font=('Segoe UI', 9))
+        self.training_status_label.pack(side='right', padx=6)
+        # Last text shown on each status label, so unchanged updates skip the Tk call
+        self._last_triadic_txt = None
+        self._last_training_txt = "Training: OFF"
+        # start periodic UI updates for triadic status
+        try:
+            self.window.after(1000, self._update_triadic_ui)
+        except Exception:
+            pass
+    def toggle_ollama_mode(self):
+        self.ollama_mode = not self.ollama_mode
+        self.brain.use_ollama = self.ollama_mode
+        self.queue_chat(f"Ollama LLM Mode: {'ON' if self.ollama_mode else 'OFF'}\n")
 
-    def sync_brains(self):
-        if not self.elaine or not self.carrie:
-            messagebox.showwarning("Warning", "Both brains must be launched to sync.")
+    def send_message(self, event=None):
+        message = self.message_var.get().strip()
+        if not message:
             return
-        self.update_global_chat("🔄 Syncing brain memories...\n")
-        for memory in self.elaine.memory:
-            if memory['importance'] >= 7:
-                self.carrie.memory_core.add_memory(memory)
-        for memory in self.carrie.memory:
-            if memory['importance'] >= 7:
-                self.elaine.memory_core.add_memory(memory)
-        self.elaine.memory = self.elaine.memory_core.get_memories()
-        self.carrie.memory = self.carrie.memory_core.get_memories()
-        self.update_global_chat("✅ Brains synced successfully.\n")
+        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
+        self.queue_chat(f"[{timestamp}] You: {message}\n")
+        streamed = []
+        def handle_response(response):
+            try:
+                # Ensure the scrolledtext widget still exists (window may have been closed)
+                if hasattr(self, 'brain_chat') and self.brain_chat.winfo_exists():
+                    if streamed:
+                        # Text already arrived piece by piece; just close the message
+                        self.queue_chat("\n\n")
+                    else:
+                        self.queue_chat(f"[{timestamp}] {response}\n\n")
+                else:
+                    # Widget gone; route to main global chat instead
+                    self.main_controller.update_global_chat(f"💬 {self.brain.name}: {message} → {response} (window closed)")
+                self.main_controller.update_global_chat(f"💬 {self.brain.name}: {message} → {response}")
+            except tk.TclError:
+                # If Tcl error occurs (widget destroyed), fallback to global chat
+                try:
+                    self.main_controller.update_global_chat(f"💬 {self.brain.name}: {message} → {response} (TclError fallback)")
+                except Exception:
+                    pass
+            finally:
+                try:
+                    self.message_var.set("")
+                except Exception:
+                    pass
+        def deliver(future):
+            try:
+                response = future.result()
+            except Exception as e:
+                response = f"[{self.brain.name}]: Error: {e}"
+            handle_response(response)
+        if self.brain.use_ollama:
+            def show_chunk(piece):
+                # Runs on the reply worker; the chat buffer batches pieces into few Tk inserts
+                self.queue_chat(piece if streamed else f"[{timestamp}] {piece}")
+                streamed.append(piece)
+            future = self.brain.submit_reply(
+                self.brain.process_input_with_ollama, message, on_chunk=show_chunk)
+        else:
+            # process_input may do web lookups or delegate to the other brain
+            future = self.brain.submit_reply(self.brain.process_input, message)
+        future.add_done_callback(lambda f: self.window.after(0, deliver, f))
 
-    def global_memory_search(self):
-        query = simpledialog.askstring("Global Memory Search", "Enter search query:")
-        if not query:
-            return
-        results = []
-        if self.elaine:
-            results.extend(self.elaine.search_memory(query))
-        if self.carrie:
-            results.extend(self.carrie.search_memory(query))
-        if not results:
-            messagebox.showinfo("Search Results", "No matching memories found.")
-            return
-        results_window = tk.Toplevel(self.root)
-        results_window.title(f"Global Memory Search: '{query}'")
-        results_window.geometry("800x600")
-        results_window.configure(bg='#1a1a1a')
-        results_text = scrolledtext.ScrolledText(results_window, bg='#2a2a2a', fg='#ffffff', font=('Consolas', 10))
-        results_text.pack(fill='both', expand=True, padx=10, pady=10)
-        for result in results:
-            results_text.insert(tk.END, f"⏰ Time: {result[0]}\n")
-            results_text.insert(tk.END, f"📝 Input: {result[1]}\n")
-            results_text.insert(tk.END, f"🔍 Response: {result[2]}\n")
-            results_text.insert(tk.END, f"⭐ Importance: {result[3]}/10\n")
-            if result[4]:
-                results_text.insert(tk.END, f"🏷️ Context: {', '.join(result[4])}\n")
-            results_text.insert(tk.END, "\n" + "="*50 + "\n\n")
+    def clear_memory(self):
+        if messagebox.askyesno("Clear Memory", f"Clear all memory for {self.brain.name}?"):
+            self.brain.clear_memory()
+            self._chat_buffer.flush()
+            self.brain_chat.delete(1.0, tk.END)
+            self.brain_chat.insert(tk.END, f"🧠 {self.brain.name} memory cleared.\n\n")
 
-    def run_triad_agents(self):
-        """Run three independent agents (web, local heuristic, Ollama if available),
-        collect their perspectives on a topic, route them to both brains (Elaine and Carrie)
-        for conclusions, then synthesize a unified statement displayed in Global Chat.
-        """
-        if not (self.elaine or self.carrie):
-            if not messagebox.askyesno("Launch Brains?", "Elaine or Carrie are not running. Launch temporary brains for this task?"):
+    def search_memory(self):
+        query = simpledialog.askstring("Memory Search", f"Search {self.brain.name}'s memory:")
+        if query:
+            results = self.brain.search_memory(query)
+            if not results:
+                messagebox.showinfo("Search Results", "No matching memories found.")
                 return
-        topic = simpledialog.askstring("Triad Agents", "Enter topic for triad agents:")
-        if not topic:
-            return
-
-        self.update_global_chat(f"🔎 Triad Agents running on: {topic}\n")
+            results_window = tk.Toplevel(self.window)
+            results_window.title(f"{self.brain.name} Memory Search: '{query}'")
+            results_window.geometry("800x600")
+            results_window.configure(bg='#1a1a1a')
+            results_text = scrolledtext.ScrolledText(results_window, bg='#2a2a2a', 
+                                                   fg=self.brain.color, font=self.main_controller.mono_font)
+            results_text.pack(fill='both', expand=True, padx=10, pady=10)
+            results_text.insert(tk.END, format_memory_results(results))
 
-        # Workers
-        responses = []
+    def export_chat(self):
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+        )
+        if file_path:
+            self._chat_buffer.flush()
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(self.brain_chat.get(1.0, tk.END))
+            messagebox.showinfo("Export Complete", f"Chat exported to {os.path.basename(file_path)}")
 
-        def worker_web():
-            try:
-                temp = BrainAI("TempWeb", "web-scraper", "#666666")
-                resp = temp.search_web(topic)
-            except Exception as e:
-                resp = f"Web worker failed: {e}"
-            responses.append({"source": "web", "text": resp})
+    def generate_stl(self):
+        if self.brain.name != "Elaine":
+            messagebox.showinfo("Info", "STL generation is handled by Elaine (Analytical Brain).")
+            return
+        shape = simpledialog.askstring("STL Params", "Enter shape (cube or terrain):", initialvalue="cube")
+        size = simpledialog.askfloat("STL Params", "Enter size:", minvalue=1.0)
+        height = simpledialog.askfloat("STL Params", "Enter height:", minvalue=1.0)
+        result = self.brain.generate_stl({'shape': shape or 'cube', 'size': size or 1, 'height': height or 1})
+        self.queue_chat(f"STL Generation: {result}\n")
+        self.main_controller.update_global_chat(f"[{self.brain.name}] Generated STL: {result}\n")
 
-        def worker_local():
-            try:
-                # lightweight local perspective
-                resp = f"Local heuristic perspective: Key points about '{topic}' include relevance, feasibility, and next steps."
-            except Exception as e:
-                resp = f"Local worker failed: {e}"
-            responses.append({"source": "local", "text": resp})
+    def generate_sprite_background(self):
+        if self.brain.name != "Carrie":
+            messagebox.showinfo("Info", "Sprite/Background generation is handled by Carrie (Creative Brain).")
+            return
+        type_ = simpledialog.askstring("Image Params", "Enter type (sprite or background):", initialvalue="sprite")
+        environment = simpledialog.askstring("Image Params", "Enter environment (forest, desert, urban, monster):", initialvalue="forest")
+        width = simpledialog.askinteger("Image Params", "Enter width:", minvalue=64, initialvalue=256)
+        height = simpledialog.askinteger("Image Params", "Enter height:", minvalue=64, initialvalue=256)
+        result = self.brain.generate_sprite_or_background({'type': type_ or 'sprite', 'environment': environment or 'forest', 'width': width or 256, 'height': height or 256})
+        self.queue_chat(f"Image Generation: {result}\n")
+        self.main_controller.update_global_chat(f"[{self.brain.name}] Generated Image: {result}\n")
 
-        def worker_ollama():
+    def toggle_learning(self):
+        # Toggle learning flag and use it to start/stop periodic training
+        self.brain.learning_enabled = not self.brain.learning_enabled
+        if self.brain.learning_enabled:
+            started = False
             try:
-                resp = query_ollama(f"Provide a short perspective on: {topic}", model=os.environ.get('OLLAMA_MODEL','llama2-uncensored:latest'), max_tokens=256, stream=False)
-            except Exception as e:
-                resp = f"Ollama worker failed or not available: {e}"
-            responses.append({"source": "ollama", "text": resp})
-
-        # run workers in parallel threads
-        import threading
-        threads = [threading.Thread(target=worker_web), threading.Thread(target=worker_local), threading.Thread(target=worker_ollama)]
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join(timeout=30)
-
-        # show collected perspectives
-        for r in responses:
-            self.update_global_chat(f"• [{r['source']}] {str(r['text'])[:1000]}\n\n")
-
-        # get conclusions from Elaine and Carrie (use existing if available, else temporary brains)
-        def conclude_with(brain_name):
-            if brain_name == 'Elaine' and self.elaine:
-                brain = self.elaine
-            elif brain_name == 'Carrie' and self.carrie:
-                brain = self.carrie
-            else:
-                brain = BrainAI(brain_name + "Temp", brain_name + " role", "#777777")
-            combined = "\n\n".join([f"Source: {r['source']}\n{r['text']}" for r in responses])
-            prompt = f"You are {brain.name}. Based on these three perspectives on '{topic}', provide a concise conclusion (1-3 sentences):\n\n{combined}"
+                # Start periodic training; default interval 5 minutes
+                started = self.brain.start_periodic_training()
+            except Exception:
+                started = False
+            self._last_training_txt = f"Training: {'ON' if started else 'FAILED'}"
+            self.training_status_label.config(text=self._last_training_txt)
+            self.queue_chat(f"Learning Mode: ON (background training {'started' if started else 'failed'})\n")
+        else:
+            stopped = False
             try:
-                resp = brain.process_input(prompt)
-            except Exception as e:
-                resp = f"{brain.name} failed to conclude: {e}"
-            return resp
+                stopped = self.brain.stop_periodic_training()
+            except Exception:
+                stopped = False
+            self._last_training_txt = f"Training: {'OFF' if stopped else 'OFF'}"
+            self.training_status_label.config(text=self._last_training_txt)
+            self.queue_chat(f"Learning Mode: OFF (background training stopped)\n")
+
+    TRIADIC_UI_MS = 2000
+    TRIADIC_UI_HIDDEN_MS = 5000  # slower poll while the window is minimised or withdrawn
 
-        elaine_conclusion = conclude_with('Elaine')
-        carrie_conclusion = conclude_with('Carrie')
+    def _update_triadic_ui(self):
+        delay = self.TRIADIC_UI_MS
+        try:
+            if not self.window.winfo_viewable():
+                # Nothing on screen to update; skip the report entirely
+                delay = self.TRIADIC_UI_HIDDEN_MS
+                return
+            report = self.brain.triadic_report()
+            overall = report.get('overall_resonance', 0.0)
+            fast = report.get('fast', 0.0)
+            med = report.get('medium', 0.0)
+            slow = report.get('slow', 0.0)
+            classification = report.get('classification', {}).get('pattern') or report.get('classification', {}).get('type') or ''
+            txt = f"Resonance: {overall:.2f} | Fast: {fast:.2f} Medium: {med:.2f} Slow: {slow:.2f} {classification}"
+            if txt != self._last_triadic_txt:
+                try:
+                    self.triadic_label.config(text=txt)
+                    self._last_triadic_txt = txt
+                except Exception:
+                    pass
+            # Update training status label
+            running = bool(self.brain._training_thread and self.brain._training_thread.is_alive())
+            training_txt = f"Training: {'ON' if running else 'OFF'}"
+            if training_txt != self._last_training_txt:
+                try:
+                    self.training_status_label.config(text=training_txt)
+                    self._last_training_txt = training_txt
+                except Exception:
+                    pass
+        except Exception:
+            pass
+        finally:
+            try:
+                # schedule next update
+                self.window.after(delay, self._update_triadic_ui)
+            except Exception:
+                pass
 
-        self.update_global_chat(f"✅ Elaine conclusion:\n{elaine_conclusion}\n\n")
-        self.update_global_chat(f"✅ Carrie conclusion:\n{carrie_conclusion}\n\n")
+    def toggle_watch(self):
+        if not self.brain.watch_enabled:
+            # Ask for project path to watch
+            path = filedialog.askdirectory(title=f"Select {self.brain.name}'s Project Folder to Watch")
+            if path:
+                self.brain.watch_enabled = True
+                self.brain.watched_path = path
+                self.queue_chat(f"🔍 {self.brain.name} is now watching: {path}\n")
+                self.queue_chat(f"I'll monitor for changes and offer help when you're stuck!\n")
+                # Start watch thread
+                if self.brain.watch_thread is None or not self.brain.watch_thread.is_alive():
+                    self.brain.watch_thread = threading.Thread(target=self.brain.watch_project, 
+                                                               args=(path, self), daemon=True)
+                    self.brain.watch_thread.start()
+        else:
+            self.brain.watch_enabled = False
+            self.brain._watch_stop.set()
+            self.brain.watched_path = None
+            self.queue_chat(f"⏸️ {self.brain.name} stopped watching\n")
 
-        # Synthesize unified statement (simple merge)
-        try:
-            unified = f"Unified: {elaine_conclusion.split('\n')[0]} {carrie_conclusion.split('\n')[0]}"
-        except Exception:
-            unified = f"Unified: {elaine_conclusion} -- {carrie_conclusion}"
-        self.update_global_chat(f"🟣 Final unified statement:\n{unified}\n\n")
+    def toggle_pin(self):
+        self.is_pinned = not self.is_pinned
+        self.window.attributes('-topmost', not self.is_pinned)
+        self.queue_chat(f"Window {'Pinned' if self.is_pinned else 'Unpinned'}\n")
+    
+    def toggle_team_mode(self):
+        """Enable/disable team collaboration tracking."""
+        self.brain.team_mode = not self.brain.team_mode
+        if self.brain.team_mode:
+            self.queue_chat(f"\n👥 Team Mode ENABLED for {self.brain.name}\n")
+            self.queue_chat(f"Now tracking multiple developers on the project.\n")
+            self.queue_chat(f"I'll alert you if someone else is working on the same file!\n\n")
+        else:
+            self.queue_chat(f"\n👤 Team Mode DISABLED - Solo mode active\n\n")
 
-    def search_and_learn_both(self):
-        """Prompt for a topic and have both Elaine and Carrie search and learn about it."""
+    def search_and_learn(self):
+        """Allow the AI brain to search for a topic and learn about it."""
         topic = simpledialog.askstring("Search & Learn", 
-                                       "What should both brains learn about?\n(e.g., 'how to use Godot', 'Python programming', '3D modeling basics')")
+                                       f"What should {self.brain.name} learn about?",
+                                       parent=self.window)
         if not topic:
             return
         
-        self.update_global_chat(f"\n🔍 Both brains are learning about: {topic}\n")
-        self.update_global_chat("⏳ Searching and processing information...\n\n")
+        self.queue_chat(f"\n🔍 {self.brain.name} is searching and learning about: {topic}\n")
+        self.queue_chat("⏳ Please wait...\n")
         
-        def learn_task():
-            results = []
-            
-            # Elaine learns
-            if self.elaine:
-                try:
-                    elaine_result = self.elaine.search_and_learn(topic)
-                    results.append(("Elaine", elaine_result))
-                except Exception as e:
-                    results.append(("Elaine", f"❌ Learning failed: {e}"))
-            
-            # Carrie learns
-            if self.carrie:
-                try:
-                    carrie_result = self.carrie.search_and_learn(topic)
-                    results.append(("Carrie", carrie_result))
-                except Exception as e:
-                    results.append(("Carrie", f"❌ Learning failed: {e}"))
-            
-            # Update UI
-            def show_results():
-                for brain_name, result in results:
-                    self.update_global_chat(f"📖 {brain_name}'s learning:\n{result}\n\n")
-                self.update_global_chat("✅ Both brains have completed their learning!\n\n")
-            
-            self.root.after(0, show_results)
+        def deliver(future):
+            try:
+                result = future.result()
+            except Exception as e:
+                result = f"❌ Learning failed: {e}"
+            self.show_learning_result(result)
         
-        import threading
-        threading.Thread(target=learn_task, daemon=True).start()
+        # Queued behind any pending chat replies on the brain's worker, not a thread per request
+        future = self.brain.submit_reply(self.brain.search_and_learn, topic)
+        future.add_done_callback(lambda f: self.window.after(0, deliver, f))
     
-    def view_learning_history(self):
-        """View all the knowledge that was actively learned by searching."""
-        results_window = tk.Toplevel(self.root)
-        results_window.title("AI Learning History")
-        results_window.geometry("900x700")
-        results_window.configure(bg='#1a1a1a')
-        
-        # Create notebook for tabs
-        notebook = ttk.Notebook(results_window)
-        notebook.pack(fill='both', expand=True, padx=10, pady=10)
-        
-        # Elaine's learning
-        if self.elaine:
-            elaine_frame = tk.Frame(notebook, bg='#2a2a2a')
-            notebook.add(elaine_frame, text="Elaine's Knowledge")
-            elaine_text = scrolledtext.ScrolledText(elaine_frame, bg='#2a2a2a', 
-                                                   fg='#00aaff', font=('Consolas', 10))
-            elaine_text.pack(fill='both', expand=True, padx=5, pady=5)
-            
-            # Get memories with LEARNED_KNOWLEDGE context
-            conn = sqlite3.connect("dspa_studio.db")
-            c = conn.cursor()
-            c.execute(f"SELECT timestamp, input, response, importance, context FROM memory_elaine WHERE context LIKE '%LEARNED_KNOWLEDGE%' ORDER BY timestamp DESC")
-            rows = c.fetchall()
-            conn.close()
-            
-            if rows:
-                for row in rows:
-                    elaine_text.insert(tk.END, f"⏰ {row[0]}\n")
-                    elaine_text.insert(tk.END, f"📚 Topic: {row[1]}\n")
-                    elaine_text.insert(tk.END, f"🔍 Knowledge:\n{row[2][:300]}...\n")
-                    elaine_text.insert(tk.END, f"⭐ Importance: {row[3]}/10\n")
-                    elaine_text.insert(tk.END, "\n" + "="*70 + "\n\n")
-            else:
-                elaine_text.insert(tk.END, "No learned knowledge yet. Use 'Search & Learn' to teach Elaine!")
-        
-        # Carrie's learning
-        if self.carrie:
-            carrie_frame = tk.Frame(notebook, bg='#2a2a2a')
-            notebook.add(carrie_frame, text="Carrie's Knowledge")
-            carrie_text = scrolledtext.ScrolledText(carrie_frame, bg='#2a2a2a', 
-                                                   fg='#ff6600', font=('Consolas', 10))
-            carrie_text.pack(fill='both', expand=True, padx=5, pady=5)
-            
-            # Get memories with LEARNED_KNOWLEDGE context
-            conn = sqlite3.connect("dspa_studio.db")
-            c = conn.cursor()
-            c.execute(f"SELECT timestamp, input, response, importance, context FROM memory_carrie WHERE context LIKE '%LEARNED_KNOWLEDGE%' ORDER BY timestamp DESC")
-            rows = c.fetchall()
-            conn.close()
-            
-            if rows:
-                for row in rows:
-                    carrie_text.insert(tk.END, f"⏰ {row[0]}\n")
-                    carrie_text.insert(tk.END, f"📚 Topic: {row[1]}\n")
-                    carrie_text.insert(tk.END, f"🔍 Knowledge:\n{row[2][:300]}...\n")
-                    carrie_text.insert(tk.END, f"⭐ Importance: {row[3]}/10\n")
-                    carrie_text.insert(tk.END, "\n" + "="*70 + "\n\n")
-            else:
-                carrie_text.insert(tk.END, "No learned knowledge yet. Use 'Search & Learn' to teach Carrie!")
-
-    def launch_freecad(self):
-        self.launch_tool("freecad")
-
-    def launch_openscad(self):
-        self.launch_tool("openscad")
-
-    def launch_blender(self):
-        self.launch_tool("blender")
-
-    def launch_godot(self):
-        self.launch_tool("godot")
-
-    def launch_unity(self):
-        self.launch_tool("unity")
-
-    def launch_unreal(self):
-        self.launch_tool("unreal")
-
-    def launch_lmms(self):
-        self.launch_tool("lmms")
+    def show_learning_result(self, result):
+        """Display the learning results in the chat."""
+        self.queue_chat(f"\n{result}\n\n")
+        # Also show in global chat
+        self.main_controller.update_global_chat(f"📖 {self.brain.name} learned something new:\n{result}\n\n")
 
-    def launch_ardour(self):
-        self.launch_tool("ardour")
+# Node Manager for Multi-Node/Mobile
+class NodeManager:
+    def __init__(self):
+        self.registered_nodes = []
+        self.active_nodes = []
 
-    def launch_reaper(self):
-        self.launch_tool("reaper")
+    def discover_nodes(self):
+        return self.active_nodes
 
-    def launch_gimp(self):
-        self.launch_tool("gimp")
+    def sync_project(self, project_data):
+        return True
 
-    def launch_krita(self):
-        self.launch_tool("krita")
+    def remote_api(self, data):
+        return {"status": "success"}
 
-    def launch_inkscape(self):
-        self.launch_tool("inkscape")
+# Main Control Interface
+class MainControlInterface:
+    # Toolbar buttons: (label, handler method name, background colour)
+    TOOLBAR_SPEC = (
+        ("🧠 Elaine", "launch_elaine", '#00aaff'),
+        ("🎨 Carrie", "launch_carrie", '#ff6600'),
+        ("📁 Project", "set_project_folder", '#9b59b6'),
+        ("🛠️ FreeCAD", "launch_freecad", '#555555'),
+        ("🛠️ Blender", "launch_blender", '#555555'),
+        ("🎮 Godot", "launch_godot", '#555555'),
+        ("🎨 Krita", "launch_krita", '#555555'),
+        ("🎨 Inkscape", "launch_inkscape", '#555555'),
+    )
+    # Caps on the triad conclusion prompt so a verbose worker can't inflate the model call
+    TRIAD_SOURCE_CHARS = 1500
+    TRIAD_PROMPT_CHARS = 6000
+    # Read File windows read, decode and insert the file this many bytes at a time
+    FILE_VIEW_CHUNK = 64 * 1024
+    EDIT_SYNC_CHARS = 256 * 1024  # editor text inserted before the window is first shown
+    AUTOSAVE_MS = 300_000
+    # Asset tree categories and the file extensions imported into each
+    ASSET_CATEGORIES = (
+        ('3D Models', ('.obj', '.fbx', '.blend', '.dae')),
+        ('Textures', ('.png', '.jpg', '.jpeg', '.bmp', '.tga')),
+        ('Audio', ('.wav', '.ogg', '.mp3', '.flac')),
+        ('Scripts', ('.py', '.gd', '.cs', '.js')),
+    )
+    ASSET_CATEGORY_BY_EXT = {ext: category for category, extensions in ASSET_CATEGORIES for ext in extensions}
 
-    def launch_davinci(self):
-        self.launch_tool("davinci")
+    def __init__(self):
+        self.root = tk.Tk()
+        self.root.title("Dual Brain AI Creative Workflow Center v3.0 - © 2026 Adam Lee Hatchett")
+        self.root.geometry("1400x900")
+        self.root.configure(bg='#2b2b2b')
+        # Shared font objects: widgets reference these instead of each resolving a font tuple
+        self.ui_font = tkfont.Font(root=self.root, family='Segoe UI', size=10)
+        self.mono_font = tkfont.Font(root=self.root, family='Consolas', size=10)
+        self.elaine = None
+        self.carrie = None
+        self._brains_loading = set()  # names of brains being constructed in the background
+        self._analyzing = False  # a project analysis is running on a worker thread
+        self._temp_brains = {}  # stand-in brains for triad runs, kept across runs
+        self._temp_brains_lock = threading.Lock()
+        # Shared workers for one-shot background jobs started from menus and buttons
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix="dbai-io")
+        # Project writes run one at a time, in the order they were requested
+        self._save_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="dbai-save")
+        self.elaine_window = None
+        self.carrie_window = None
+        self.elaine_interface = None
+        self.carrie_interface = None
+        self.conversation_active = False
+        self._conv_stop = threading.Event()  # wakes the auto-conversation loop when it is stopped
+        self.collaborative_mode = False
+        self.toolbar_visible = True
+        self._fullscreen = False  # shadows wm attributes -fullscreen so toggling is one Tcl call
+        self._theme = 'dark'
+        self.project_name_var = tk.StringVar(value="Untitled Project")
+        self.project_type_var = tk.StringVar(value="General")
+        self.node_mgr = NodeManager()
+        self.autosave_running = False
+        self._autosave_after = None  # pending root.after id of the next autosave
+        self._help_window = None  # User Guide window, hidden rather than destroyed on close
+        self.project_agent = ProjectAgent()  # Initialize the project agent
+        load_ollama_cache()
+        load_search_cache()
+        self._global_chat_buffer = ChatBuffer(self.root, lambda: self.global_chat)
+        self.setup_professional_ui()
 
-    def set_project_folder(self):
-        """Open file browser to set the project agent's working directory."""
-        folder = filedialog.askdirectory(title="Select Project Folder")
-        if folder:
-            result = self.project_agent.set_working_directory(folder)
-            self.update_global_chat(f"\n{result}\n\n")
-            # Update project name
-            self.project_name_var.set(os.path.basename(folder))
-    
-    def fetch_web_content(self):
-        """Fetch content from a web URL."""
-        url = simpledialog.askstring("Fetch Web Content", "Enter URL:")
-        if url:
-            self.update_global_chat(f"🌐 Fetching content from {url}...\n")
-            
-            def do_fetch():
-                result = self.project_agent.fetch_web_content(url)
-                self.root.after(0, lambda: self.show_fetch_result(result))
-            
-            import threading
-            threading.Thread(target=do_fetch, daemon=True).start()
-    
-    def show_fetch_result(self, result):
-        """Display fetched web content."""
-        if isinstance(result, dict):
-            self.update_global_chat(f"{result['message']}\n\n")
-            self.update_global_chat(f"Preview:\n{result['content'][:500]}...\n\n")
-        else:
-            self.update_global_chat(f"{result}\n\n")
-    
-    def analyze_project(self):
-        """Analyze the current project folder."""
-        result = self.project_agent.analyze_project()
-        if isinstance(result, dict):
-            self.update_global_chat(f"\n{result['message']}\n")
-            self.update_global_chat(f"Directory: {result['directory']}\n")
-            self.update_global_chat(f"Total Files: {result['total_files']}\n")
-            self.update_global_chat(f"Total Size: {result['total_size_mb']} MB\n")
-            self.update_global_chat(f"\nFile Types:\n")
-            for ext, count in result['file_types'].items():
-                self.update_global_chat(f"  {ext}: {count} files\n")
-            self.update_global_chat("\n")
-        else:
-            self.update_global_chat(f"{result}\n\n")
-    
-    def list_project_files(self):
-        """List files in the project folder."""
-        pattern = simpledialog.askstring("List Files", "Enter file pattern (e.g., *.py, *.gd):", 
-                                        initialvalue="*")
-        if pattern:
-            result = self.project_agent.list_files(pattern)
-            if isinstance(result, dict):
-                self.update_global_chat(f"\n{result['message']}\n\n")
-                for file in result['files'][:20]:  # Show first 20
-                    self.update_global_chat(f"  📄 {file}\n")
-                if result['count'] > 20:
-                    self.update_global_chat(f"  ... and {result['count'] - 20} more\n")
-                self.update_global_chat("\n")
-            else:
-                self.update_global_chat(f"{result}\n\n")
-    
-    def search_in_project(self):
-        """Search for text in project files."""
-        search_term = simpledialog.askstring("Search in Project", "Enter search term:")
-        if search_term:
-            pattern = simpledialog.askstring("File Pattern", "Search in files matching pattern:", 
-                                            initialvalue="*")
-            if pattern:
-                self.update_global_chat(f"🔍 Searching for '{search_term}' in {pattern}...\n")
-                result = self.project_agent.search_in_files(search_term, pattern)
-                if isinstance(result, dict):
-                    self.update_global_chat(f"{result['message']}\n\n")
-                    for match in result['results'][:10]:  # Show first 10
-                        self.update_global_chat(f"  📄 {match['file']}:{match['line_number']}\n")
-                        self.update_global_chat(f"     {match['content']}\n\n")
-                    if result['matches'] > 10:
-                        self.update_global_chat(f"  ... and {result['matches'] - 10} more matches\n\n")
-                else:
-                    self.update_global_chat(f"{result}\n\n")
-    
-    def read_project_file(self):
-        """Read and display a file from the project."""
-        if not self.project_agent.working_directory:
-            messagebox.showwarning("No Project", "Please set a project folder first.")
-            return
-        
-        file_path = simpledialog.askstring("Read File", "Enter relative file path:")
-        if file_path:
-            result = self.project_agent.read_file(file_path)
-            if isinstance(result, dict):
-                # Create a window to display the file content
-                file_window = tk.Toplevel(self.root)
-                file_window.title(f"File: {result['path']}")
-                file_window.geometry("900x600")
-                file_window.configure(bg='#1a1a1a')
-                
-                # Info bar
-                info_frame = tk.Frame(file_window, bg='#2a2a2a')
-                info_frame.pack(fill='x', padx=5, pady=5)
-                tk.Label(info_frame, text=f"📄 {result['path']} | Size: {result['size']} chars | Lines: {result['lines']}", 
-                        bg='#2a2a2a', fg='#ffffff', font=('Consolas', 10)).pack(side='left', padx=5)
-                
-                # Content
-                text_widget = scrolledtext.ScrolledText(file_window, bg='#2a2a2a', fg='#00ff00', 
-                                                       font=('Consolas', 10), wrap='none')
-                text_widget.pack(fill='both', expand=True, padx=5, pady=5)
-                text_widget.insert('1.0', result['content'])
-                text_widget.config(state='disabled')
-                
-                self.update_global_chat(f"📖 {result['message']}\n\n")
-            else:
-                self.update_global_chat(f"{result}\n\n")
-    
-    def edit_project_file(self):
-        """Edit a file in the project."""
-        if not self.project_agent.working_directory:
-            messagebox.showwarning("No Project", "Please set a project folder first.")
-            return
-        
-        file_path = simpledialog.askstring("Edit File", "Enter relative file path:")
-        if not file_path:
-            return
+    def setup_professional_ui(self):
+        self.create_menu_bar()
+        self.create_toolbar()
+        self.create_main_content()
+        self.create_status_bar()
         
-        # Read the file first
-        result = self.project_agent.read_file(file_path)
-        if isinstance(result, dict):
-            # Create editor window
-            edit_window = tk.Toplevel(self.root)
-            edit_window.title(f"Edit: {result['path']}")
-            edit_window.geometry("900x600")
-            edit_window.configure(bg='#1a1a1a')
-            
-            # Toolbar
-            toolbar = tk.Frame(edit_window, bg='#2a2a2a')
-            toolbar.pack(fill='x', padx=5, pady=5)
-            tk.Label(toolbar, text=f"📝 Editing: {result['path']}", bg='#2a2a2a', fg='#ffffff', 
-                    font=('Consolas', 10, 'bold')).pack(side='left', padx=5)
-            
-            def save_file():
-                content = text_widget.get('1.0', 'end-1c')
-                save_result = self.project_agent.write_file(file_path, content, backup=True)
-                self.update_global_chat(f"{save_result}\n")
-                messagebox.showinfo("Saved", save_result)
-            
-            tk.Button(toolbar, text="💾 Save", command=save_file, bg='#00aa00', fg='white', 
-                     font=('Segoe UI', 9)).pack(side='right', padx=5)
-            
-            # Editor
-            text_widget = scrolledtext.ScrolledText(edit_window, bg='#2a2a2a', fg='#00ff00', 
-                                                   font=('Consolas', 10), wrap='none')
-            text_widget.pack(fill='both', expand=True, padx=5, pady=5)
-            text_widget.insert('1.0', result['content'])
-        else:
-            self.update_global_chat(f"{result}\n\n")
+        # Integrate enhanced learning (delayed for UI initialization)
+        if integrate_enhanced_learning_simple:
+            def delayed_integration():
+                time.sleep(1)  # Wait for UI to fully initialize
+                integrate_enhanced_learning_simple(self)
+            threading.Thread(target=delayed_integration, daemon=True).start()
 
-    def launch_tool(self, tool_name):
-        try:
-            subprocess.Popen([tool_name], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            self.update_global_chat(f"🛠️ Launched {tool_name}\n")
-        except Exception as e:
-            self.update_global_chat(f"❌ Failed to launch {tool_name}: {str(e)}\n")
+   
+    def _add_lazy_menu(self, parent, label, items):
+        """Add a cascade whose entries are created the first time it is opened.
 
-    def launch_3d_assistant(self):
-        self.update_global_chat("🤖 AI 3D Assistant activated. Ask Elaine for STL generation or technical modeling advice.\n")
+        items: (label, command) pairs, with None for a separator.
+        """
+        menu = tk.Menu(parent, tearoff=0)
+        def populate():
+            menu.configure(postcommand='')  # build once
+            for item in items:
+                if item is None:
+                    menu.add_separator()
+                else:
+                    menu.add_command(label=item[0], command=item[1])
+        menu.configure(postcommand=populate)
+        parent.add_cascade(label=label, menu=menu)
+        return menu
 
-    def launch_game_designer(self):
-        self.update_global_chat("🎮 AI Game Designer activated. Ask Carrie for sprite/background generation or creative design ideas.\n")
+    def create_menu_bar(self):
+        # Entries are only built when a menu is first opened (see _add_lazy_menu)
+        menubar = tk.Menu(self.root)
+        self.root.config(menu=menubar)
+        self._add_lazy_menu(menubar, "File", [
+            ("New Project", self.new_project),
+            ("Open Project", self.load_project),
+            ("Save Project", self.save_project),
+            ("Save Project As...", self.save_project_as),
+            None,
+            ("Import Assets", self.import_assets),
+            ("Export Project", self.export_project),
+            None,
+            ("Exit", self.root.quit),
+        ])
+        self._add_lazy_menu(menubar, "Brains", [
+            ("Launch Elaine (Analytical)", self.launch_elaine),
+            ("Launch Carrie (Creative)", self.launch_carrie),
+            ("Launch Both", self.launch_both),
+            None,
+            ("Start Auto-Conversation", self.start_auto_conversation),
+            ("Collaborative Mode", self.start_collaborative_mode),
+            ("Run Triad Agents", self.run_triad_agents),
+            ("Sync Brains", self.sync_brains),
+            ("Global Memory Search", self.global_memory_search),
+        ])
+        creative_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Creative", menu=creative_menu)
+        self._add_lazy_menu(creative_menu, "3D & CAD", [
+            ("Launch FreeCAD 🛠️", self.launch_freecad),
+            ("Launch OpenSCAD 🛠️", self.launch_openscad),
+            ("Launch Blender 🛠️", self.launch_blender),
+            ("AI 3D Assistant", self.launch_3d_assistant),
+        ])
+        self._add_lazy_menu(creative_menu, "Game Development", [
+            ("Launch Godot 🎮", self.launch_godot),
+            ("Launch Unity 🎮", self.launch_unity),
+            ("Launch Unreal Engine 🎮", self.launch_unreal),
+            ("AI Game Designer", self.launch_game_designer),
+        ])
+        self._add_lazy_menu(creative_menu, "Audio Production", [
+            ("Launch LMMS 🎵", self.launch_lmms),
+            ("Launch Ardour 🎵", self.launch_ardour),
+            ("Launch Reaper 🎵", self.launch_reaper),
+            ("AI Music Composer", self.launch_music_composer),
+        ])
+        self._add_lazy_menu(creative_menu, "Graphics & Design", [
+            ("Launch GIMP 🎨", self.launch_gimp),
+            ("Launch Krita 🎨", self.launch_krita),
+            ("Launch Inkscape 🎨", self.launch_inkscape),
+            ("Launch DaVinci Resolve 🎨", self.launch_davinci),
+            ("AI Concept Artist", self.launch_concept_artist),
+        ])
+        self._add_lazy_menu(menubar, "View", [
+            ("Toggle Toolbar", self.toggle_toolbar),
+            ("Toggle Fullscreen", self.toggle_fullscreen),
+            None,
+            ("Dark Theme", lambda: self.set_theme('dark')),
+            ("Light Theme", lambda: self.set_theme('light')),
+        ])
+        self._add_lazy_menu(menubar, "Help", [
+            ("User Guide", self.show_help),
+            ("Workflow Tutorials", self.show_tutorials),
+            ("AI Collaboration Guide", self.show_ai_guide),
+            ("About", self.show_about),
+        ])
+        
+        # Add AI Learning menu
+        self._add_lazy_menu(menubar, "AI Learning", [
+            ("🔍 Search & Learn (Both Brains)", self.search_and_learn_both),
+            ("📚 View Learning History", self.view_learning_history),
+            None,
+            ("🔬 Run Triad Agents", self.run_triad_agents),
+        ])
+        
+        # Add Project Agent menu
+        self._add_lazy_menu(menubar, "Project Agent", [
+            ("📁 Set Project Folder", self.set_project_folder),
+            ("🌐 Fetch Web Content", self.fetch_web_content),
+            None,
+            ("📊 Analyze Project", self.analyze_project),
+            ("📄 List Files", self.list_project_files),
+            ("🔍 Search in Files", self.search_in_project),
+            None,
+            ("📖 Read File", self.read_project_file),
+            ("✏️ Edit File", self.edit_project_file),
+        ])
 
-    def launch_music_composer(self):
-        self.update_global_chat("🎵 AI Music Composer activated. Ask Carrie for creative composition ideas or Elaine for technical audio advice.\n")
+    def create_toolbar(self):
+        self.toolbar = tk.Frame(self.root, bg='#333333', height=40)
+        self.toolbar.pack(side='top', fill='x')
+        self.toolbar.pack_propagate(False)
+        for text, method, bg in self.TOOLBAR_SPEC:
+            tk.Button(self.toolbar, text=text, command=getattr(self, method),
+                      bg=bg, fg='white', font=self.ui_font).pack(side='left', padx=5)
 
-    def launch_concept_artist(self):
-        self.update_global_chat("🎨 AI Concept Artist activated. Ask Carrie for visual concepts or design inspiration.\n")
+    def create_main_content(self):
+        main_frame = tk.Frame(self.root, bg='#2b2b2b')
+        main_frame.pack(fill='both', expand=True, padx=10, pady=10)
+        self.project_frame = tk.Frame(main_frame, bg='#2b2b2b')
+        self.project_frame.pack(side='top', fill='x')
+        tk.Label(self.project_frame, text="Project:", bg='#2b2b2b', fg='white',
+                 font=self.ui_font).pack(side='left', padx=5)
+        tk.Entry(self.project_frame, textvariable=self.project_name_var,
+                 bg='#3a3a3a', fg='white', font=self.ui_font).pack(side='left', padx=5)
+        tk.Label(self.project_frame, text="Type:", bg='#2b2b2b', fg='white',
+                 font=self.ui_font).pack(side='left', padx=5)
+        project_types = ['General', '3D Modeling', 'Game Development', 'Audio Production', 'Graphics Design']
+        ttk.Combobox(self.project_frame, textvariable=self.project_type_var,
+                     values=project_types, state='readonly').pack(side='left', padx=5)
+        self.workspace_notebook = ttk.Notebook(main_frame)
+        self.workspace_notebook.pack(fill='both', expand=True, pady=(10, 0))
+        global_chat_frame = tk.Frame(self.workspace_notebook, bg='#1a1a1a')
+        self.workspace_notebook.add(global_chat_frame, text="Global Chat")
+        self.global_chat = scrolledtext.ScrolledText(global_chat_frame, height=15,
+                                                    bg='#2a2a2a', fg='#ffffff',
+                                                    font=self.mono_font)
+        self.global_chat.pack(fill='both', expand=True, padx=10, pady=10)
+        assets_frame = tk.Frame(self.workspace_notebook, bg='#1a1a1a')
+        self.workspace_notebook.add(assets_frame, text="Assets")
+        self.asset_tree = ttk.Treeview(assets_frame, columns=('Type',), show='tree')
+        self.asset_tree.pack(fill='both', expand=True, padx=10, pady=10)
+        self.asset_tree.bind('<<TreeviewOpen>>', self._on_asset_expand)
+        # Tcl-side loop so a whole category's rows go in with one call (names pass as a Tcl list)
+        self.asset_tree.tk.eval('proc dbai_insert_rows {tree parent names} '
+                                '{foreach name $names {$tree insert $parent end -text $name}}')
+        self._reset_asset_tree()
+
+    def _reset_asset_tree(self, assets=None):
+        """Rebuild the category nodes. Asset rows are only created when a category is expanded."""
+        # self.project_assets is the source of truth; the tree is a lazily filled view of it
+        self.project_assets = {category: [] for category, _ in self.ASSET_CATEGORIES}
+        self._loaded_asset_categories = set()  # categories whose rows are in the tree
+        for category, names in (assets or {}).items():
+            self.project_assets.setdefault(category, []).extend(names)
+        self.asset_tree.delete(*self.asset_tree.get_children())
+        for category, names in self.project_assets.items():
+            self.asset_tree.insert('', 'end', iid=category, text=category, open=False)
+            if names:
+                self.asset_tree.insert(category, 'end', text='…loading')
+
+    def _on_asset_expand(self, event=None):
+        category = self.asset_tree.focus()
+        if category not in self.project_assets or category in self._loaded_asset_categories:
+            return
+        self.asset_tree.delete(*self.asset_tree.get_children(category))
+        self._insert_asset_rows(category, self.project_assets[category])
+        self._loaded_asset_categories.add(category)
+
+    def _insert_asset_rows(self, category, names):
+        if names:
+            self.asset_tree.tk.call('dbai_insert_rows', self.asset_tree, category, tuple(names))
+
+    def _add_assets(self, category, names):
+        """Append names to a category; the tree is only touched if it needs a new row."""
+        existing = self.project_assets.get(category)
+        if existing is None:
+            existing = self.project_assets[category] = []
+            self.asset_tree.insert('', 'end', iid=category, text=category, open=False)
+        had_names = bool(existing)
+        existing.extend(names)
+        if category in self._loaded_asset_categories:
+            self._insert_asset_rows(category, names)
+        elif names and not had_names:
+            self.asset_tree.insert(category, 'end', text='…loading')
 
-    def new_project(self):
-        name = simpledialog.askstring("New Project", "Enter project name:", initialvalue="New Project")
-        if name:
-            self.project_name_var.set(name)
-            self.project_type_var.set("General")
-            self.asset_tree.delete(*self.asset_tree.get_children())
-            self.asset_tree.insert('', 'end', text='3D Models', open=True)
-            self.asset_tree.insert('', 'end', text='Textures', open=True)
-            self.asset_tree.insert('', 'end', text='Audio', open=True)
-            self.asset_tree.insert('', 'end', text='Scripts', open=True)
-            self.update_global_chat(f"📋 New project created: {name}\n")
+    def create_status_bar(self):
+        status_frame = tk.Frame(self.root, bg='#2a2a2a', height=25)
+        status_frame.pack(side='bottom', fill='x')
+        status_frame.pack_propagate(False)
+        self.status_label = tk.Label(status_frame, text="Ready", bg='#2a2a2a', fg='#ffffff', anchor='w')
+        self.status_label.pack(side='left', padx=5)
+        self.net_status = tk.Label(status_frame, text="Nodes: 1", bg='#2a2a2a', fg='#40ff80')
+        self.net_status.pack(side='right', padx=12)
+        self.task_status = tk.Label(status_frame, text="Tasks: Idle", bg='#2a2a2a', fg='#ffd700')
+        self.task_status.pack(side='right')
+        self.memory_status = tk.Label(status_frame, text="Memory: OK", bg='#2a2a2a', fg='#5ffaff')
+        self.memory_status.pack(side='right')
+        self.elaine_status = tk.Label(status_frame, text="Elaine: Offline", fg='red', bg='#2a2a2a')
+        self.elaine_status.pack(side='left', padx=8)
+        self.carrie_status = tk.Label(status_frame, text="Carrie: Offline", fg='red', bg='#2a2a2a')
+        self.carrie_status.pack(side='left', padx=8)
 
-    def load_project(self):
-        file_path = filedialog.askopenfilename(
-            defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
-        )
-        if file_path:
+    def update_global_chat(self, text):
+        # Buffered: safe from worker threads, and bursts become a single insert
+        self._global_chat_buffer.write(text)
+
+    def launch_elaine(self):
+        def attach(brain):
+            brain.delegate_callback_carrie = lambda msg: self.carrie.process_input(msg) if self.carrie else "[Carrie not online]"
+            self.elaine = brain
+            self.elaine_window = tk.Toplevel(self.root)
+            self.elaine_window.title("Elaine - Analytical Brain")
+            self.elaine_window.geometry("600x700")
+            self.elaine_interface = BrainInterface(self.elaine_window, self.elaine, self, "Elaine")
+            self.elaine_status.config(text="Elaine: Online", fg='green')
+            self.update_global_chat("🧠 Elaine launched - Specializing in 3D CAD, STL for printing, technical tasks.\n")
+        if not self.elaine:
+            self._build_brain("Elaine", "Analytical & Logical", "#00aaff", self.elaine_status, attach)
+
+    def launch_carrie(self):
+        def attach(brain):
+            brain.delegate_callback_elaine = lambda msg: self.elaine.process_input(msg) if self.elaine else "[Elaine not online]"
+            self.carrie = brain
+            self.carrie_window = tk.Toplevel(self.root)
+            self.carrie_window.title("Carrie - Creative Brain")
+            self.carrie_window.geometry("600x700")
+            self.carrie_interface = BrainInterface(self.carrie_window, self.carrie, self, "Carrie")
+            self.carrie_status.config(text="Carrie: Online", fg='green')
+            self.update_global_chat("🎨 Carrie launched - Specializing in game dev, vector designs for Cricut, sprites, backgrounds.\n")
+        if not self.carrie:
+            self._build_brain("Carrie", "Creative & Intuitive", "#ff6600", self.carrie_status, attach)
+
+    def _build_brain(self, name, personality, color, status_label, attach):
+        """Construct a BrainAI (memory load, SQLite) on a worker thread, then call
+        attach(brain) on the Tk thread to create its window. Repeat launches while
+        the brain is still loading are ignored."""
+        if name in self._brains_loading:
+            return
+        self._brains_loading.add(name)
+        status_label.config(text=f"{name}: Loading...", fg='orange')
+        def finish(brain, error):
+            self._brains_loading.discard(name)
+            if error is not None:
+                status_label.config(text=f"{name}: Offline", fg='red')
+                self.update_global_chat(f"❌ {name} failed to start: {error}\n")
+            else:
+                attach(brain)
+        def build():
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    project_data = json.load(f)
-                self.project_name_var.set(project_data.get('name', 'Untitled Project'))
-                self.project_type_var.set(project_data.get('type', 'General'))
-                self.asset_tree.delete(*self.asset_tree.get_children())
-                for category, assets in project_data.get('assets', {}).items():
-                    node = self.asset_tree.insert('', 'end', text=category, open=True)
-                    for asset in assets:
-                        self.asset_tree.insert(node, 'end', text=asset)
-                self.update_global_chat(f"📂 Project loaded: {os.path.basename(file_path)}\n")
+                brain, error = BrainAI(name, personality, color), None
             except Exception as e:
-                messagebox.showerror("Load Error", f"Failed to load project: {str(e)}")
+                brain, error = None, e
+            self.root.after(0, finish, brain, error)
+        self._io_pool.submit(build)
 
-    def save_project(self):
-        if self.project_name_var.get() == "Untitled Project":
-            self.save_project_as()
-        else:
-            self._save_project(self.project_name_var.get() + ".json")
+    def launch_both(self):
+        self.launch_elaine()
+        self.launch_carrie()
 
-    def save_project_as(self):
-        file_path = filedialog.asksaveasfilename(
-            defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
-        )
-        if file_path:
-            self._save_project(file_path)
+    def start_auto_conversation(self):
+        if not self.elaine or not self.carrie:
+            messagebox.showwarning("Warning", "Both brains must be launched for auto-conversation.")
+            return
+        self.conversation_active = True
+        topic = simpledialog.askstring("Auto-Conversation", "Enter topic for discussion:")
+        if topic:
+            self.update_global_chat(f"🤝 Auto-conversation started on: {topic}\n")
+            # Fresh event per run, so stopping one run can't be undone by the next start
+            self._conv_stop.set()
+            stop = self._conv_stop = threading.Event()
+            def paced_wait(started):
+                # 45 s per turn including the reply time; True once the conversation is stopped
+                return stop.wait(max(0.0, 45 - (time.monotonic() - started)))
+            def conversation_loop():
+                while not stop.is_set():
+                    started = time.monotonic()
+                    elaine_response = self.elaine.process_input(topic, from_brain="Carrie")
+                    self.update_global_chat(f"[{self.elaine.name}]: {elaine_response}\n")
+                    if paced_wait(started):
+                        break
+                    started = time.monotonic()
+                    carrie_response = self.carrie.process_input(elaine_response, from_brain="Elaine")
+                    self.update_global_chat(f"[{self.carrie.name}]: {carrie_response}\n")
+                    if paced_wait(started):
+                        break
+            threading.Thread(target=conversation_loop, daemon=True).start()
 
-    def _save_project(self, file_path):
-        try:
-            project_data = {
-                'name': self.project_name_var.get(),
-                'type': self.project_type_var.get(),
-                'timestamp': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                'assets': {
-                    '3D Models': [self.asset_tree.item(i, 'text') for i in self.asset_tree.get_children(self.asset_tree.get_children()[0])],
-                    'Textures': [self.asset_tree.item(i, 'text') for i in self.asset_tree.get_children(self.asset_tree.get_children()[1])],
-                    'Audio': [self.asset_tree.item(i, 'text') for i in self.asset_tree.get_children(self.asset_tree.get_children()[2])],
-                    'Scripts': [self.asset_tree.item(i, 'text') for i in self.asset_tree.get_children(self.asset_tree.get_children()[3])]
-                },
-                'elaine_memory': self.elaine.memory if self.elaine else [],
-                'carrie_memory': self.carrie.memory if self.carrie else [],
-                'collaborative_mode': self.collaborative_mode
-            }
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(project_data, f, indent=2, ensure_ascii=False)
-            self.update_global_chat(f"💾 Project saved: {os.path.basename(file_path)}\n")
-            self.status_label.config(text=f"Saved: {self.project_name_var.get()}")
-        except Exception as e:
-            messagebox.showerror("Save Error", f"Failed to save project: {str(e)}")
+    def stop_auto_conversation(self):
+        self.conversation_active = False
+        self._conv_stop.set()
+        self.update_global_chat("🛑 Auto-conversation stopped.\n")
 
-    def import_assets(self):
-        files = filedialog.askopenfilenames(
-            title="Select assets to import",
-            filetypes=[
-                ("All supported", "*.obj;*.fbx;*.blend;*.png;*.jpg;*.wav;*.ogg;*.py;*.gd"),
-                ("3D Models", "*.obj;*.fbx;*.blend;*.dae"),
-                ("Images", "*.png;*.jpg;*.jpeg;*.bmp;*.tga"),
-                ("Audio", "*.wav;*.ogg;*.mp3;*.flac"),
-                ("Scripts", "*.py;*.gd;*.cs;*.js"),
-                ("All files", "*.*")
-            ]
-        )
-        if files:
-            imported_count = len(files)
-            self.update_global_chat(f"📥 Imported {imported_count} assets to project\n")
-            for file_path in files:
-                filename = os.path.basename(file_path)
-                ext = os.path.splitext(filename)[1].lower()
-                if ext in ['.obj', '.fbx', '.blend', '.dae']:
-                    models_node = self.asset_tree.get_children()[0]
-                    self.asset_tree.insert(models_node, 'end', text=filename)
-                elif ext in ['.png', '.jpg', '.jpeg', '.bmp', '.tga']:
-                    textures_node = self.asset_tree.get_children()[1]
-                    self.asset_tree.insert(textures_node, 'end', text=filename)
-                elif ext in ['.wav', '.ogg', '.mp3', '.flac']:
-                    audio_node = self.asset_tree.get_children()[2]
-                    self.asset_tree.insert(audio_node, 'end', text=filename)
-                elif ext in ['.py', '.gd', '.cs', '.js']:
-                    scripts_node = self.asset_tree.get_children()[3]
-                    self.asset_tree.insert(scripts_node, 'end', text=filename)
+    def start_collaborative_mode(self):
+        if not self.elaine or not self.carrie:
+            messagebox.showwarning("Warning", "Both brains must be launched for collaborative mode.")
+            return
+        self.collaborative_mode = True
+        self.update_global_chat("🤝 Collaborative mode enabled: Elaine and Carrie working together.\n")
 
-    def export_project(self):
-        folder = filedialog.askdirectory(title="Select export directory")
-        if folder:
-            self.update_global_chat(f"📤 Project exported to: {os.path.basename(folder)}\n")
-            self.status_label.config(text="Project exported")
+    def sync_brains(self):
+        if not self.elaine or not self.carrie:
+            messagebox.showwarning("Warning", "Both brains must be launched to sync.")
+            return
+        self.update_global_chat("🔄 Syncing brain memories...\n")
+        # Only memories the other brain lacks are copied, so repeated syncs don't pile up duplicates
+        to_carrie = self.carrie.memory_core.add_missing_memories([m for m in self.elaine.memory_snapshot() if m['importance'] >= 7])
+        to_elaine = self.elaine.memory_core.add_missing_memories([m for m in self.carrie.memory_snapshot() if m['importance'] >= 7])
+        # New rows get the highest ids, so appending keeps each RAM window in disk order
+        self.elaine.add_to_memory_window(to_elaine)
+        self.carrie.add_to_memory_window(to_carrie)
+        self.update_global_chat("✅ Brains synced successfully.\n")
 
-    def toggle_toolbar(self):
-        if self.toolbar_visible:
-            self.toolbar.pack_forget()
-            self.toolbar_visible = False
-        else:
-            self.toolbar.pack(side='top', fill='x')
-            self.toolbar_visible = True
+    def global_memory_search(self):
+        query = simpledialog.askstring("Global Memory Search", "Enter search query:")
+        if not query:
+            return
+        results = []
+        if self.elaine:
+            results.extend(self.elaine.search_memory(query))
+        if self.carrie:
+            results.extend(self.carrie.search_memory(query))
+        if not results:
+            messagebox.showinfo("Search Results", "No matching memories found.")
+            return
+        results_window = tk.Toplevel(self.root)
+        results_window.title(f"Global Memory Search: '{query}'")
+        results_window.geometry("800x600")
+        results_window.configure(bg='#1a1a1a')
+        results_text = scrolledtext.ScrolledText(results_window, bg='#2a2a2a', fg='#ffffff', font=self.mono_font)
+        results_text.pack(fill='both', expand=True, padx=10, pady=10)
+        results_text.insert(tk.END, format_memory_results(results))
 
-    def toggle_fullscreen(self):
-        current_state = self.root.attributes('-fullscreen')
-        self.root.attributes('-fullscreen', not current_state)
-        self.update_global_chat("🔲 Entered fullscreen mode\n" if not current_state else "🪟 Exited fullscreen mode\n")
+    def _temp_brain(self, name, personality, color="#777777"):
+        """Return the cached stand-in BrainAI called `name`, building it on first use."""
+        with self._temp_brains_lock:
+            brain = self._temp_brains.get(name)
+            if brain is None:
+                brain = self._temp_brains[name] = BrainAI(name, personality, color)
+            return brain
 
-    def set_theme(self, theme):
-        theme_colors = {
-            'dark': {'bg': '#2b2b2b', 'fg': '#ffffff'},
-            'light': {'bg': '#f0f0f0', 'fg': '#000000'}
-        }
-        if theme in theme_colors:
-            self.update_global_chat(f"🎨 Theme changed to {theme} mode\n")
+    def run_triad_agents(self):
+        """Run three independent agents (web, local heuristic, Ollama if available),
+        collect their perspectives on a topic, route them to both brains (Elaine and Carrie)
+        for conclusions, then synthesize a unified statement displayed in Global Chat.
+        """
+        if not (self.elaine or self.carrie):
+            if not messagebox.askyesno("Launch Brains?", "Elaine or Carrie are not running. Launch temporary brains for this task?"):
+                return
+        topic = simpledialog.askstring("Triad Agents", "Enter topic for triad agents:")
+        if not topic:
+            return
 
-    def show_help(self):
-        help_window = tk.Toplevel(self.root)
-        help_window.title("User Guide - Dual Brain AI Creative Workflow Center")
-        help_window.geometry("900x700")
-        help_window.configure(bg='#1a1a1a')
-        help_notebook = ttk.Notebook(help_window)
-        help_notebook.pack(fill='both', expand=True, padx=10, pady=10)
-        start_frame = tk.Frame(help_notebook, bg='#1a1a1a')
-        help_notebook.add(start_frame, text="🚀 Getting Started")
-        start_text = scrolledtext.ScrolledText(start_frame, bg='#2a2a2a', fg='#ffffff', 
-                                              font=('Segoe UI', 11), wrap=tk.WORD)
-        start_text.pack(fill='both', expand=True, padx=10, pady=10)
-        getting_started = """
-🧠 DUAL BRAIN AI SYSTEM - GETTING STARTED
+        self.update_global_chat(f"🔎 Triad Agents running on: {topic}\n")
+
+        # Workers (each returns its perspective)
+        def worker_web():
+            try:
+                resp = self._temp_brain("TempWeb", "web-scraper", "#666666").search_web(topic)
+            except Exception as e:
+                resp = f"Web worker failed: {e}"
+            return {"source": "web", "text": resp}
+
+        def worker_local():
+            try:
+                # lightweight local perspective
+                resp = f"Local heuristic perspective: Key points about '{topic}' include relevance, feasibility, and next steps."
+            except Exception as e:
+                resp = f"Local worker failed: {e}"
+            return {"source": "local", "text": resp}
+
+        def worker_ollama():
+            try:
+                resp = query_ollama(f"Provide a short perspective on: {topic}", model=os.environ.get('OLLAMA_MODEL','llama2-uncensored:latest'), max_tokens=256, stream=False)
+            except Exception as e:
+                resp = f"Ollama worker failed or not available: {e}"
+            return {"source": "ollama", "text": resp}
+
+        live_brains = (('Elaine', self.elaine), ('Carrie', self.carrie))
+
+        # The waits below run on an I/O worker so the window keeps repainting; results
+        # reach Global Chat through its thread-safe buffer as each one lands
+        def run():
+            # Run workers in parallel under one shared 30 s budget; show each perspective as it
+            # arrives and leave stragglers behind (their results are ignored)
+            responses = []
+            pool = concurrent.futures.ThreadPoolExecutor(max_workers=3, thread_name_prefix="triad")
+            futures = [pool.submit(worker) for worker in (worker_web, worker_local, worker_ollama)]
+            try:
+                for future in concurrent.futures.as_completed(futures, timeout=30):
+                    r = future.result()
+                    responses.append(r)
+                    self.update_global_chat(f"• [{r['source']}] {str(r['text'])[:1000]}\n\n")
+            except concurrent.futures.TimeoutError:
+                pass
+            finally:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+            # Both conclusions see the same bounded digest of the worker outputs
+            parts, budget = [], self.TRIAD_PROMPT_CHARS
+            for r in responses:
+                part = f"Source: {r['source']}\n{str(r['text'])[:self.TRIAD_SOURCE_CHARS]}"[:budget]
+                if not part:
+                    break
+                parts.append(part)
+                budget -= len(part)
+            combined = "\n\n".join(parts)
+
+            def conclude_with(brain, combined):
+                prompt = f"You are {brain.name}. Based on these three perspectives on '{topic}', provide a concise conclusion (1-3 sentences):\n\n{combined}"
+                try:
+                    resp = brain.process_input(prompt)
+                except Exception as e:
+                    resp = f"{brain.name} failed to conclude: {e}"
+                return resp
+
+            # Conclusions from Elaine and Carrie (live brains if running, else cached stand-ins),
+            # computed concurrently under one shared 60 s budget
+            brains = {name: brain or self._temp_brain(name + "Temp", name + " role")
+                      for name, brain in live_brains}
+            pool = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="triad-conclude")
+            futures = {name: pool.submit(conclude_with, brain, combined) for name, brain in brains.items()}
+            concurrent.futures.wait(futures.values(), timeout=60)
+            pool.shutdown(wait=False, cancel_futures=True)
+            elaine_conclusion, carrie_conclusion = (
+                future.result() if future.done() else f"{name} did not conclude within 60 s"
+                for name, future in futures.items())
+
+            self.update_global_chat(f"✅ Elaine conclusion:\n{elaine_conclusion}\n\n")
+            self.update_global_chat(f"✅ Carrie conclusion:\n{carrie_conclusion}\n\n")
+
+            # Synthesize unified statement (simple merge)
+            try:
+                unified = f"Unified: {elaine_conclusion.split('\n')[0]} {carrie_conclusion.split('\n')[0]}"
+            except Exception:
+                unified = f"Unified: {elaine_conclusion} -- {carrie_conclusion}"
+            self.update_global_chat(f"🟣 Final unified statement:\n{unified}\n\n")
 
-Welcome to the most advanced AI-powered creative workflow system!
+        self._io_pool.submit(run)
 
-1. LAUNCHING YOUR AI BRAINS
-   • Click 🧠 Elaine for analytical thinking
-   • Click 🎨 Carrie for creative inspiration
-   • Use "Launch Both" for maximum power
-   • Watch the status indicators turn green
+    def search_and_learn_both(self):
+        """Prompt for a topic and have both Elaine and Carrie search and learn about it."""
+        topic = simpledialog.askstring("Search & Learn", 
+                                       "What should both brains learn about?\n(e.g., 'how to use Godot', 'Python programming', '3D modeling basics')")
+        if not topic:
+            return
+        
+        self.update_global_chat(f"\n🔍 Both brains are learning about: {topic}\n")
+        self.update_global_chat("⏳ Searching and processing information...\n\n")
+        
+        def learn_task():
+            results = []
+            
+            # Elaine learns
+            if self.elaine:
+                try:
+                    elaine_result = self.elaine.search_and_learn(topic)
+                    results.append(("Elaine", elaine_result))
+                except Exception as e:
+                    results.append(("Elaine", f"❌ Learning failed: {e}"))
+            
+            # Carrie learns
+            if self.carrie:
+                try:
+                    carrie_result = self.carrie.search_and_learn(topic)
+                    results.append(("Carrie", carrie_result))
+                except Exception as e:
+                    results.append(("Carrie", f"❌ Learning failed: {e}"))
+            
+            # Update UI: update_global_chat is thread-safe, so post the whole report as one message
+            self.update_global_chat("".join(f"📖 {brain_name}'s learning:\n{result}\n\n" for brain_name, result in results)
+                                    + "✅ Both brains have completed their learning!\n\n")
+        
+        self._io_pool.submit(learn_task)
+    
+    def view_learning_history(self):
+        """View all the knowledge that was actively learned by searching."""
+        results_window = tk.Toplevel(self.root)
+        results_window.title("AI Learning History")
+        results_window.geometry("900x700")
+        results_window.configure(bg='#1a1a1a')
+        
+        # Create notebook for tabs
+        notebook = ttk.Notebook(results_window)
+        notebook.pack(fill='both', expand=True, padx=10, pady=10)
+        
+        separator = "\n" + "="*70 + "\n\n"
+        for brain, color in ((self.elaine, '#00aaff'), (self.carrie, '#ff6600')):
+            if not brain:
+                continue
+            frame = tk.Frame(notebook, bg='#2a2a2a')
+            notebook.add(frame, text=f"{brain.name}'s Knowledge")
+            text = scrolledtext.ScrolledText(frame, bg='#2a2a2a', fg=color, font=self.mono_font)
+            text.pack(fill='both', expand=True, padx=5, pady=5)
+            
+            # Memories with LEARNED_KNOWLEDGE context, through the brain's own connection
+            rows = brain.memory_core.get_learned_knowledge()
+            if rows:
+                text.insert(tk.END, "".join(
+                    f"⏰ {ts}\n📚 Topic: {topic}\n🔍 Knowledge:\n{(summary or '')[:300]}...\n⭐ Importance: {importance}/10\n{separator}"
+                    for ts, topic, summary, importance in rows))
+            else:
+                text.insert(tk.END, f"No learned knowledge yet. Use 'Search & Learn' to teach {brain.name}!")
+            text.configure(state='disabled')
 
-2. STARTING CONVERSATIONS
-   • Use "Start Auto Conversation" for AI brain discussions
-   • Set custom topics for focused brainstorming
-   • Watch the Global Conversation Monitor
-   • Join conversations directly in brain windows
+    def launch_freecad(self):
+        self.launch_tool("freecad")
 
-3. LAUNCHING CREATIVE TOOLS
-   • Use toolbar buttons for quick access
-   • Menu system for full tool categories
-   • AI assistants provide context-aware help
-   • Tools integrate with active AI brains
+    def launch_openscad(self):
+        self.launch_tool("openscad")
 
-4. PROJECT MANAGEMENT
-   • Create new projects with custom names
-   • Import assets from multiple formats
-   • Save/load projects with AI memory
-   • Export completed work
+    def launch_blender(self):
+        self.launch_tool("blender")
 
-5. COLLABORATIVE MODE
-   • Requires both brains online
-   • Enables cross-domain expertise
-   • Provides dual-perspective solutions
-   • Enhances all creative workflows
-        """
-        start_text.insert(tk.END, getting_started)
-        brain_frame = tk.Frame(help_notebook, bg='#1a1a1a')
-        help_notebook.add(brain_frame, text="🤖 AI Brains")
-        brain_text = scrolledtext.ScrolledText(brain_frame, bg='#2a2a2a', fg='#ffffff',
-                                              font=('Segoe UI', 11), wrap=tk.WORD)
-        brain_text.pack(fill='both', expand=True, padx=10, pady=10)
-        brain_guide = """
-🧠 ELAINE - THE ANALYTICAL BRAIN
+    def launch_godot(self):
+        self.launch_tool("godot")
 
-SPECIALTIES:
-• Logical problem solving and analysis
-• Technical optimization and debugging
-• System architecture and planning
-• Performance analysis and metrics
-• Mathematical and scientific reasoning
-• STL generation for 3D printing
+    def launch_unity(self):
+        self.launch_tool("unity")
 
-BEST FOR:
-• 3D CAD modeling precision
-• Game system architecture
-• Audio engineering technical aspects
-• Code generation and optimization
-• Project planning and workflow
-• Quality assurance and testing
+    def launch_unreal(self):
+        self.launch_tool("unreal")
 
-🎨 CARRIE - THE CREATIVE BRAIN
+    def launch_lmms(self):
+        self.launch_tool("lmms")
 
-SPECIALTIES:
-• Artistic inspiration and creativity
-• Visual design and aesthetics
-• Innovation and experimentation
-• Emotional and intuitive insights
-• Sprite and background generation
-• Vector designs for Cricut
+    def launch_ardour(self):
+        self.launch_tool("ardour")
 
-BEST FOR:
-• 3D artistic modeling and texturing
-• Game art and visual design
-• Music composition and creativity
-• Concept art and visual ideas
-• UI/UX design and user experience
-• Creative brainstorming and ideation
+    def launch_reaper(self):
+        self.launch_tool("reaper")
 
-🤝 COLLABORATIVE MODE
+    def launch_gimp(self):
+        self.launch_tool("gimp")
 
-WHEN BOTH BRAINS ARE ACTIVE:
-• Technical precision meets creative vision
-• Analytical solutions with artistic flair
-• Cross-domain expertise and insights
-• Enhanced problem-solving capabilities
-• Balanced perspectives on all projects
-• Comprehensive workflow assistance
-        """
-        brain_text.insert(tk.END, brain_guide)
-        tools_frame = tk.Frame(help_notebook, bg='#1a1a1a')
-        help_notebook.add(tools_frame, text="🛠️ Creative Tools")
-        tools_text = scrolledtext.ScrolledText(tools_frame, bg='#2a2a2a', fg='#ffffff',
-                                              font=('Segoe UI', 11), wrap=tk.WORD)
-        tools_text.pack(fill='both', expand=True, padx=10, pady=10)
-        tools_guide = """
-🛠️ SUPPORTED CREATIVE TOOLS
+    def launch_krita(self):
+        self.launch_tool("krita")
 
-🔧 3D & CAD TOOLS
-• FreeCAD 🛠️ - Professional parametric 3D CAD modeler
-  AI Support: Technical precision, STL generation
-• OpenSCAD 🛠️ - Programmable solid 3D CAD modeler
-  AI Support: Code-based modeling assistance
-• Blender 🛠️ - Complete 3D creation suite
-  AI Support: Both technical modeling and artistic vision
+    def launch_inkscape(self):
+        self.launch_tool("inkscape")
 
-🎮 GAME DEVELOPMENT
-• Godot Engine 🎮 - Advanced cross-platform game engine
-  AI Support: System architecture + creative design
-• Unity 🎮 - Industry-standard game development platform
-  AI Support: Technical optimization + visual artistry
-• Unreal Engine 🎮 - Industry-leading development platform
-  AI Support: Technical optimization + visual artistry
+    def launch_davinci(self):
+        self.launch_tool("davinci")
 
-🎵 AUDIO PRODUCTION
-• LMMS 🎵 - Free cross-platform music production suite
-  AI Support: Technical mixing + creative composition
-• Ardour 🎵 - Professional digital audio workstation
-  AI Support: Engineering precision + artistic expression
-• Reaper 🎵 - Efficient digital audio production
-  AI Support: Workflow optimization + creative ideas
+    def set_project_folder(self):
+        """Open file browser to set the project agent's working directory."""
+        folder = filedialog.askdirectory(title="Select Project Folder")
+        if folder:
+            result = self.project_agent.set_working_directory(folder)
+            self.update_global_chat(f"\n{result}\n\n")
+            # Update project name
+            self.project_name_var.set(os.path.basename(folder))
+    
+    def fetch_web_content(self):
+        """Fetch content from a web URL."""
+        url = simpledialog.askstring("Fetch Web Content", "Enter URL:")
+        if url:
+            self.update_global_chat(f"🌐 Fetching content from {url}...\n")
+            self._io_pool.submit(self.project_agent.fetch_web_content, url).add_done_callback(
+                lambda future: self.root.after(0, self.show_fetch_result, future.result()))
+    
+    def show_fetch_result(self, result):
+        """Display fetched web content."""
+        if isinstance(result, dict):
+            self.update_global_chat(f"{result['message']}\n\nPreview:\n{result['content'][:500]}...\n\n")
+        else:
+            self.update_global_chat(f"{result}\n\n")
+    
+    def analyze_project(self):
+        """Analyze the current project folder on a worker thread, showing progress in the status bar."""
+        if self._analyzing:
+            return
+        self._analyzing = True
+        def show_progress(files, size):
+            self.root.after(0, lambda: self.status_label.config(
+                text=f"Analyzing project: {files} files ({size / (1024*1024):.1f} MB)..."))
+        def finish(result):
+            self._analyzing = False
+            self.status_label.config(text="Ready")
+            self._show_analysis(result)
+        def run():
+            result = self.project_agent.analyze_project(progress=show_progress)
+            self.root.after(0, finish, result)
+        self._io_pool.submit(run)
+
+    def _show_analysis(self, result):
+        if isinstance(result, dict):
+            # Build the whole report, then post it as one chat message
+            parts = [
+                f"\n{result['message']}\n",
+                f"Directory: {result['directory']}\n",
+                f"Total Files: {result['total_files']}\n",
+                f"Total Size: {result['total_size_mb']} MB\n",
+                "\nFile Types:\n",
+            ]
+            parts.extend(f"  {ext}: {count} files\n" for ext, count in result['file_types'].items())
+            parts.append("\n")
+            self.update_global_chat("".join(parts))
+        else:
+            self.update_global_chat(f"{result}\n\n")
+    
+    def list_project_files(self):
+        """List files in the project folder."""
+        pattern = simpledialog.askstring("List Files", "Enter file pattern (e.g., *.py, *.gd):", 
+                                        initialvalue="*")
+        if pattern:
+            result = self.project_agent.list_files(pattern, limit=20)
+            if isinstance(result, dict):
+                parts = [f"\n{result['message']}\n\n"]
+                parts.extend(f"  📄 {file}\n" for file in result['files'])
+                if result['has_more']:
+                    parts.append("  ... and more\n")
+                parts.append("\n")
+                self.update_global_chat("".join(parts))
+            else:
+                self.update_global_chat(f"{result}\n\n")
+    
+    def search_in_project(self):
+        """Search for text in project files."""
+        search_term = simpledialog.askstring("Search in Project", "Enter search term:")
+        if search_term:
+            pattern = simpledialog.askstring("File Pattern", "Search in files matching pattern:", 
+                                            initialvalue="*")
+            if pattern:
+                self.update_global_chat(f"🔍 Searching for '{search_term}' in {pattern}...\n")
+                result = self.project_agent.search_in_files(search_term, pattern, limit=10)
+                if isinstance(result, dict):
+                    parts = [f"{result['message']}\n\n"]
+                    parts.extend(f"  📄 {match['file']}:{match['line_number']}\n     {match['content']}\n\n"
+                                 for match in result['results'])
+                    if result['has_more']:
+                        parts.append("  ... and more matches\n\n")
+                    self.update_global_chat("".join(parts))
+                else:
+                    self.update_global_chat(f"{result}\n\n")
+    
+    def read_project_file(self):
+        """Read and display a file from the project."""
+        if not self.project_agent.working_directory:
+            messagebox.showwarning("No Project", "Please set a project folder first.")
+            return
+        
+        file_path = simpledialog.askstring("Read File", "Enter relative file path:")
+        if file_path:
+            mapped = self.project_agent.map_file(file_path)
+            if isinstance(mapped, str):
+                self.update_global_chat(f"{mapped}\n\n")
+                return
+            size = len(mapped) if mapped is not None else 0
+            lines = 1 + sum(mapped[i:i + self.FILE_VIEW_CHUNK * 16].count(b'\n')
+                            for i in range(0, size, self.FILE_VIEW_CHUNK * 16))
+            # Unmap right away: on Windows a mapped file can't be replaced, which would
+            # make Edit File -> Save on the same path fail while this viewer is open
+            if mapped is not None:
+                mapped.close()
+            full_path = os.path.join(self.project_agent.working_directory, file_path)
+
+            # Create a window to display the file content
+            file_window = tk.Toplevel(self.root)
+            file_window.title(f"File: {file_path}")
+            file_window.geometry("900x600")
+            file_window.configure(bg='#1a1a1a')
+            
+            # Info bar
+            info_frame = tk.Frame(file_window, bg='#2a2a2a')
+            info_frame.pack(fill='x', padx=5, pady=5)
+            tk.Label(info_frame, text=f"📄 {file_path} | Size: {size} bytes | Lines: {lines}", 
+                    bg='#2a2a2a', fg='#ffffff', font=self.mono_font).pack(side='left', padx=5)
+            
+            # Content: read and decoded FILE_VIEW_CHUNK bytes at a time, whenever the view
+            # scrolls near the end of what has been inserted so far; the file is only
+            # open for the duration of each read
+            text_widget = scrolledtext.ScrolledText(file_window, bg='#2a2a2a', fg='#00ff00', 
+                                                   font=self.mono_font, wrap='none')
+            text_widget.pack(fill='both', expand=True, padx=5, pady=5)
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            offset = 0
 
-🎨 GRAPHICS & DESIGN
-• GIMP 🎨 - GNU Image Manipulation Program
-  AI Support: Technical editing + creative enhancement
-• Krita 🎨 - Professional painting program
-  AI Support: Digital art techniques + sprite/background creation
-• Inkscape 🎨 - Professional vector graphics editor
-  AI Support: Technical precision + artistic composition
-• DaVinci Resolve 🎨 - Professional video editing & color
-  AI Support: Technical workflow + creative vision
+            def load_more():
+                nonlocal offset, size
+                if offset >= size or not text_widget.winfo_exists():
+                    return  # fully loaded, or the window closed with this call still queued
+                try:
+                    with open(full_path, 'rb') as f:
+                        f.seek(offset)
+                        chunk = f.read(min(self.FILE_VIEW_CHUNK, size - offset))
+                except OSError:
+                    chunk = b''
+                if not chunk:
+                    size = offset  # file shrank or vanished since it was opened; stop here
+                end = offset + len(chunk)
+                text = decoder.decode(chunk, final=end >= size)
+                offset = end
+                text_widget.config(state='normal')
+                text_widget.insert(tk.END, text)
+                text_widget.config(state='disabled')
 
-🤖 AI ASSISTANTS
-• Code Generator - AI-powered programming assistance
-• Asset Creator - AI asset generation and optimization
-• Music Composer - AI collaborative music composition
-• Concept Artist - AI-powered visual concept creation
-• 3D Assistant - AI-guided 3D modeling and STL generation
-• Game Designer - AI game development consultation
-• Project Advisor - AI project insights and guidance
-• Quality Analyst - AI quality assessment and optimization
-        """
-        tools_text.insert(tk.END, tools_guide)
+            def on_scroll(first, last):
+                text_widget.vbar.set(first, last)
+                if offset < size and float(last) > 0.9:
+                    text_widget.after_idle(load_more)
 
-    def show_tutorials(self):
-        tutorial_text = """
-🎓 DUAL BRAIN AI WORKFLOW TUTORIALS
+            if size:
+                load_more()
+            text_widget.config(state='disabled', yscrollcommand=on_scroll)
+            
+            self.update_global_chat(f"📖 ✅ Opened {size} bytes from {file_path}\n\n")
+    
+    def edit_project_file(self):
+        """Edit a file in the project."""
+        if not self.project_agent.working_directory:
+            messagebox.showwarning("No Project", "Please set a project folder first.")
+            return
+        
+        file_path = simpledialog.askstring("Edit File", "Enter relative file path:")
+        if not file_path:
+            return
+        
+        # Read the file first
+        result = self.project_agent.read_file(file_path)
+        if isinstance(result, dict):
+            # Create editor window
+            edit_window = tk.Toplevel(self.root)
+            edit_window.title(f"Edit: {result['path']}")
+            edit_window.geometry("900x600")
+            edit_window.configure(bg='#1a1a1a')
+            
+            # Toolbar
+            toolbar = tk.Frame(edit_window, bg='#2a2a2a')
+            toolbar.pack(fill='x', padx=5, pady=5)
+            tk.Label(toolbar, text=f"📝 Editing: {result['path']}", bg='#2a2a2a', fg='#ffffff', 
+                    font=('Consolas', 10, 'bold')).pack(side='left', padx=5)
+            
+            def save_file():
+                content = text_widget.get('1.0', 'end-1c').encode('utf-8')
+                save_result = self.project_agent.write_file(file_path, content, backup=True)
+                self.update_global_chat(f"{save_result}\n")
+                messagebox.showinfo("Saved", save_result)
+            
+            save_button = tk.Button(toolbar, text="💾 Save", command=save_file, bg='#00aa00', fg='white', 
+                                    font=('Segoe UI', 9))
+            save_button.pack(side='right', padx=5)
+            
+            # Editor: the head of the file goes in at once, the rest in FILE_VIEW_CHUNK
+            # slices from the event loop; editing and saving wait for the last slice
+            content = result['content']
+            text_widget = scrolledtext.ScrolledText(edit_window, bg='#2a2a2a', fg='#00ff00', 
+                                                   font=self.mono_font, wrap='none')
+            text_widget.pack(fill='both', expand=True, padx=5, pady=5)
+            text_widget.insert('1.0', content[:self.EDIT_SYNC_CHARS])
+
+            def insert_rest(offset):
+                if not text_widget.winfo_exists():
+                    return
+                end = offset + self.FILE_VIEW_CHUNK
+                text_widget.config(state='normal')
+                text_widget.insert(tk.END, content[offset:end])
+                if end < len(content):
+                    text_widget.config(state='disabled')
+                    self.root.after(1, insert_rest, end)
+                else:
+                    save_button.config(state='normal')
 
-🏗️ 3D MODELING WORKFLOW:
-1. Launch Blender or FreeCAD from toolbar
-2. Activate Elaine for technical modeling advice
-3. Ask for STL generation with specific parameters
-4. Use Carrie for artistic inspiration
-5. Enable collaborative mode for best results
+            if len(content) > self.EDIT_SYNC_CHARS:
+                text_widget.config(state='disabled')
+                save_button.config(state='disabled')
+                self.root.after(1, insert_rest, self.EDIT_SYNC_CHARS)
+        else:
+            self.update_global_chat(f"{result}\n\n")
 
-🎮 GAME DEVELOPMENT WORKFLOW:
-1. Create new project (Game Development type)
-2. Launch Godot or Unreal Engine
-3. Import assets to project browser
-4. Ask Carrie for sprite/background generation
-5. Use Elaine for system architecture
+    def launch_tool(self, tool_name):
+        try:
+            # Nothing reads the tool's output, so discard it rather than let a full pipe
+            # block the child; detach it so it outlives the studio
+            if os.name == 'nt':
+                detach = {'creationflags': subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+            else:
+                detach = {'start_new_session': True}
+            subprocess.Popen([tool_name], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                             stderr=subprocess.DEVNULL, close_fds=True, **detach)
+            self.update_global_chat(f"🛠️ Launched {tool_name}\n")
+        except Exception as e:
+            self.update_global_chat(f"❌ Failed to launch {tool_name}: {str(e)}\n")
 
-🎵 MUSIC PRODUCTION WORKFLOW:
-1. Launch LMMS or Ardour
-2. Activate Carrie for creative inspiration
-3. Use Elaine for technical mixing advice
-4. Use AI Music Composer for collaboration
-5. Export and save to project
+    def launch_3d_assistant(self):
+        self.update_global_chat("🤖 AI 3D Assistant activated. Ask Elaine for STL generation or technical modeling advice.\n")
 
-🎨 DIGITAL ART WORKFLOW:
-1. Launch Krita or Inkscape
-2. Activate Carrie for artistic guidance
-3. Ask for SVG or sprite generation
-4. Get technical advice from Elaine
-5. Save artwork to project assets
+    def launch_game_designer(self):
+        self.update_global_chat("🎮 AI Game Designer activated. Ask Carrie for sprite/background generation or creative design ideas.\n")
 
-🤖 AI COLLABORATION TIPS:
-• Be specific in your requests to AI brains
-• Use "how do I" or "define" for web searches
-• Enable collaborative mode for complex projects
-• Let AI brains discuss ideas together
-• Save projects to preserve AI memory
-• Use memory search to find past insights
+    def launch_music_composer(self):
+        self.update_global_chat("🎵 AI Music Composer activated. Ask Carrie for creative composition ideas or Elaine for technical audio advice.\n")
 
-💡 PRODUCTIVITY TIPS:
-• Use toolbar for quick tool access
-• Pin brain windows to manage workspace
-• Import all assets at project start
-• Use AI assistants throughout workflow
-• Enable auto-conversations for inspiration
-• Export projects when complete
-        """
-        messagebox.showinfo("Workflow Tutorials", tutorial_text)
+    def launch_concept_artist(self):
+        self.update_global_chat("🎨 AI Concept Artist activated. Ask Carrie for visual concepts or design inspiration.\n")
 
-    def show_ai_guide(self):
-        guide_text = """
-🤖 AI COLLABORATION GUIDE
+    def new_project(self):
+        name = simpledialog.askstring("New Project", "Enter project name:", initialvalue="New Project")
+        if name:
+            self.project_name_var.set(name)
+            self.project_type_var.set("General")
+            self._reset_asset_tree()
+            self.update_global_chat(f"📋 New project created: {name}\n")
 
-🎯 MAXIMIZING AI BRAIN POTENTIAL:
+    def load_project(self):
+        file_path = filedialog.askopenfilename(
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        if file_path:
+            try:
+                # The parser consumes the raw bytes directly (orjson when installed)
+                with open(file_path, 'rb') as f:
+                    project_data = _json.loads(f.read())
+                self.project_name_var.set(project_data.get('name', 'Untitled Project'))
+                self.project_type_var.set(project_data.get('type', 'General'))
+                self._reset_asset_tree(project_data.get('assets', {}))
+                self.update_global_chat(f"📂 Project loaded: {os.path.basename(file_path)}\n")
+            except Exception as e:
+                messagebox.showerror("Load Error", f"Failed to load project: {str(e)}")
 
-🧠 ELAINE SPECIALIZES IN:
-• Technical problem solving
-• STL generation for 3D printing
-• Code optimization and debugging
-• System architecture planning
-• Performance analysis
-• Mathematical computations
+    def save_project(self):
+        if self.project_name_var.get() == "Untitled Project":
+            self.save_project_as()
+        else:
+            self._save_project(self.project_name_var.get() + ".json")
 
-🎨 CARRIE SPECIALIZES IN:
-• Creative inspiration and ideation
-• Sprite and background generation
-• Vector designs for Cricut
-• Artistic vision and aesthetics
-• Innovation and experimentation
-• Emotional and intuitive insights
+    def save_project_as(self):
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        if file_path:
+            self._save_project(file_path, pretty=True)
 
-🤝 COLLABORATIVE TECHNIQUES:
-1. DIVIDE AND CONQUER:
-   • Ask Elaine for technical tasks
-   • Ask Carrie for creative tasks
-   • Combine both perspectives
+    def _snapshot_project(self):
+        """Capture the project state as plain data. Call on the Tk thread."""
+        return {
+            'name': self.project_name_var.get(),
+            'type': self.project_type_var.get(),
+            'timestamp': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'assets': {category: list(names) for category, names in self.project_assets.items()},
+            'elaine_memory': self.elaine.memory_snapshot() if self.elaine else [],
+            'carrie_memory': self.carrie.memory_snapshot() if self.carrie else [],
+            'collaborative_mode': self.collaborative_mode
+        }
 
-2. BRAIN CONVERSATIONS:
-   • Let them discuss topics together
-   • Set interesting conversation topics
-   • Learn from their interactions
+    def _save_project(self, file_path, pretty=False):
+        """Snapshot on the Tk thread, then serialise and write on the save worker."""
+        try:
+            project_data = self._snapshot_project()
+        except Exception as e:
+            messagebox.showerror("Save Error", f"Failed to save project: {str(e)}")
+            return
+        def report(future):
+            error = future.exception()
+            if error is not None:
+                messagebox.showerror("Save Error", f"Failed to save project: {str(error)}")
+            else:
+                self.update_global_chat(f"💾 Project saved: {os.path.basename(file_path)}\n")
+                self.status_label.config(text=f"Saved: {project_data['name']}")
+        def on_done(future):
+            try:
+                self.root.after(0, report, future)
+            except (tk.TclError, RuntimeError):
+                pass  # main window already destroyed (save requested while closing)
+        self._save_pool.submit(self._write_project, project_data, file_path, pretty).add_done_callback(on_done)
+        # Any save restarts the autosave interval, so a manual save isn't followed by a redundant one
+        self._schedule_autosave()
+
+    @staticmethod
+    def _write_project(project_data, file_path, pretty=False):
+        """Stream project_data to file_path as JSON (compact, or one memory entry per line if pretty).
+
+        Memory lists are encoded entry by entry through a 1 MB write buffer, so the
+        whole document never exists as one string in RAM. The file is written beside
+        the target and renamed over it, so a crash mid-save leaves the old file intact.
+        """
+        if pretty:
+            key_sep, entry_sep, list_end, end, separators = '\n  ', '\n    ', '\n  ]', '\n}\n', (', ', ': ')
+        else:
+            key_sep, entry_sep, list_end, end, separators = '', '', ']', '}', (',', ':')
+        def dumps(value):
+            return json.dumps(value, ensure_ascii=False, separators=separators)
+        tmp_path = file_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write('{')
+            for i, (key, value) in enumerate(project_data.items()):
+                if i:
+                    f.write(',')
+                f.write(key_sep)
+                f.write(dumps(key))
+                f.write(separators[1])
+                if key.endswith('_memory'):
+                    f.write('[')
+                    for j, entry in enumerate(value):
+                        if j:
+                            f.write(',')
+                        f.write(entry_sep)
+                        f.write(dumps(entry))
+                    f.write(list_end if value else ']')
+                else:
+                    f.write(dumps(value))
+            f.write(end)
+        os.replace(tmp_path, file_path)
 
-3. WEB SEARCHES:
-   • Use "how do I" or "define" queries
-   • Get design references and instructions
-   • Leverage search for project research
+    def import_assets(self):
+        files = filedialog.askopenfilenames(
+            title="Select assets to import",
+            filetypes=[
+                ("All supported", "*.obj;*.fbx;*.blend;*.png;*.jpg;*.wav;*.ogg;*.py;*.gd"),
+                ("3D Models", "*.obj;*.fbx;*.blend;*.dae"),
+                ("Images", "*.png;*.jpg;*.jpeg;*.bmp;*.tga"),
+                ("Audio", "*.wav;*.ogg;*.mp3;*.flac"),
+                ("Scripts", "*.py;*.gd;*.cs;*.js"),
+                ("All files", "*.*")
+            ]
+        )
+        if files:
+            imported_count = len(files)
+            self.update_global_chat(f"📥 Imported {imported_count} assets to project\n")
+            by_category = collections.defaultdict(list)
+            for file_path in files:
+                filename = os.path.basename(file_path)  # handles both separators Tk may return on Windows
+                dot = filename.rfind('.')
+                category = self.ASSET_CATEGORY_BY_EXT.get(filename[dot:].lower()) if dot > 0 else None
+                if category:
+                    by_category[category].append(filename)
+            for category, names in by_category.items():
+                self._add_assets(category, names)
 
-4. MEMORY UTILIZATION:
-   • Search both brains' memories
-   • Build on previous conversations
-   • Create knowledge continuity
+    def export_project(self):
+        folder = filedialog.askdirectory(title="Select export directory")
+        if folder:
+            self.update_global_chat(f"📤 Project exported to: {os.path.basename(folder)}\n")
+            self.status_label.config(text="Project exported")
 
-5. PROJECT INTEGRATION:
-   • Save AI insights with projects
-   • Load previous AI knowledge
-   • Maintain context across sessions
-        """
-        messagebox.showinfo("AI Collaboration Guide", guide_text)
+    def toggle_toolbar(self):
+        if self.toolbar_visible:
+            self.toolbar.pack_forget()
+            self.toolbar_visible = False
+        else:
+            self.toolbar.pack(side='top', fill='x')
+            self.toolbar_visible = True
 
-    def show_about(self):
-        about_text = """
-🧠 DUAL BRAIN AI CREATIVE WORKFLOW CENTER
-Version 3.0 - Professional Creative Suite
+    def toggle_fullscreen(self):
+        self._fullscreen = not self._fullscreen
+        self.root.attributes('-fullscreen', self._fullscreen)
+        self.update_global_chat("🔲 Entered fullscreen mode\n" if self._fullscreen else "🪟 Exited fullscreen mode\n")
 
-🎯 FEATURES:
-• Dual AI Brain System (Elaine + Carrie)
-• Integrated Creative Tool Launcher
-• Professional Project Management
-• AI-Powered Collaboration
-• STL Generation for 3D Printing
-• Sprite and Background Generation
-• Web Search for Instructions and Definitions
-• Cross-Domain Workflow Support
-• Expandable for Mobile/Multi-Node
+    def set_theme(self, theme):
+        theme_colors = {
+            'dark': {'bg': '#2b2b2b', 'fg': '#ffffff'},
+            'light': {'bg': '#f0f0f0', 'fg': '#000000'}
+        }
+        if theme in theme_colors and theme != self._theme:
+            self._theme = theme
+            self.update_global_chat(f"🎨 Theme changed to {theme} mode\n")
 
-🛠️ SUPPORTED TOOLS:
-• 3D & CAD: FreeCAD 🛠️, OpenSCAD 🛠️, Blender 🛠️
-• Game Dev: Godot 🎮, Unity 🎮, Unreal Engine 🎮
-• Audio: LMMS 🎵, Ardour 🎵, Reaper 🎵
-• Graphics: GIMP 🎨, Krita 🎨, Inkscape 🎨, DaVinci Resolve 🎨
+    def show_help(self):
+        if self._help_window is not None and self._help_window.winfo_exists():
+            self._help_window.deiconify()
+            self._help_window.lift()
+            return
+        help_window = self._help_window = tk.Toplevel(self.root)
+        help_window.protocol("WM_DELETE_WINDOW", help_window.withdraw)
+        help_window.title("User Guide - Dual Brain AI Creative Workflow Center")
+        help_window.geometry("900x700")
+        help_window.configure(bg='#1a1a1a')
+        help_notebook = ttk.Notebook(help_window)
+        help_notebook.pack(fill='both', expand=True, padx=10, pady=10)
+        for title, body in (("🚀 Getting Started", HELP_GETTING_STARTED),
+                            ("🤖 AI Brains", HELP_BRAIN_GUIDE),
+                            ("🛠️ Creative Tools", HELP_TOOLS_GUIDE)):
+            frame = tk.Frame(help_notebook, bg='#1a1a1a')
+            help_notebook.add(frame, text=title)
+            text = scrolledtext.ScrolledText(frame, bg='#2a2a2a', fg='#ffffff',
+                                             font=('Segoe UI', 11), wrap=tk.WORD)
+            text.pack(fill='both', expand=True, padx=10, pady=10)
+            text.insert(tk.END, body)
 
-🤖 AI CAPABILITIES:
-• Code Generation & Optimization
-• STL Generation with Procedural Algorithms
-• Sprite and Background Generation
-• Vector Design for Cricut
-• Web Search for Project Research
-• Context-Aware Responses
-• Persistent Memory with SQLite
-• Collaborative Mode for Dual Perspectives
-• Real-Time Project Monitoring
-• Team Collaboration Features
+    def show_tutorials(self):
+        messagebox.showinfo("Workflow Tutorials", HELP_TUTORIALS)
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Created by: Adam Lee Hatchett
-© 2026 Adam Lee Hatchett
-All Rights Reserved
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    def show_ai_guide(self):
+        messagebox.showinfo("AI Collaboration Guide", HELP_AI_GUIDE)
 
-Empowering Creativity Through AI Collaboration
-        """
-        messagebox.showinfo("About", about_text)
+    def show_about(self):
+        messagebox.showinfo("About", HELP_ABOUT)
 
     def run(self):
         try:
@@ -2970,24 +4602,45 @@ Empowering Creativity Through AI Collaboration
             self.update_global_chat(startup_msg)
             self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
             self.autosave_running = True
-            def autosave_loop():
-                while self.autosave_running:
-                    try:
-                        if self.project_name_var.get() != "Untitled Project":
-                            self.save_project()
-                    except Exception:
-                        pass
-                    time.sleep(300)  # Autosave every 5 minutes
-            threading.Thread(target=autosave_loop, daemon=True).start()
+            self._schedule_autosave()
             self.root.mainloop()
         except KeyboardInterrupt:
             self.on_closing()
         except Exception as e:
             messagebox.showerror("Critical Error", f"Application error: {str(e)}")
 
+    def _schedule_autosave(self):
+        """(Re)arm the autosave timer for AUTOSAVE_MS from now; any pending one is dropped."""
+        if self._autosave_after is not None:
+            self.root.after_cancel(self._autosave_after)
+            self._autosave_after = None
+        if self.autosave_running:
+            self._autosave_after = self.root.after(self.AUTOSAVE_MS, self._autosave)
+
+    def _autosave(self):
+        # Runs on the Tk thread: the snapshot is taken here, the write happens on the save worker
+        self._autosave_after = None
+        try:
+            if self.project_name_var.get() != "Untitled Project":
+                self.save_project()
+        except Exception:
+            pass
+        self._schedule_autosave()
+
     def on_closing(self):
         try:
             self.autosave_running = False
+            self._schedule_autosave()  # cancels the pending autosave
+            save_ollama_cache()
+            save_search_cache()
+            close_ollama_session()
+            close_web_session()
+            self._io_pool.shutdown(wait=False, cancel_futures=True)
+            for brain in (self.elaine, self.carrie):
+                if brain:
+                    brain.shutdown_workers()
+                    brain.memory_core.flush()
+                    brain.memory_core.save_vector_index()
             if self.conversation_active:
                 self.stop_auto_conversation()
             if self.project_name_var.get() != "Untitled Project":
@@ -3010,7 +4663,17 @@ if __name__ == "__main__":
         print("dual_brain_ai CLI chat. Commands: /help, /save, /exit")
         brain = BrainAI("CLI", "Terminal Assistant", "#888888")
         brain.use_ollama = False
-        chat_log = []
+        # Each turn is appended to this session's JSONL log as it happens (opened on first turn)
+        log_path = f"dual_brain_chat_{_dt.utcnow().strftime('%Y%m%d_%H%M%S')}.jsonl"
+        log_file = None
+
+        def log_turn(entry):
+            nonlocal log_file
+            if log_file is None:
+                log_file = open(log_path, "a", encoding="utf-8", buffering=1 << 16)
+            log_file.write(json.dumps(entry, ensure_ascii=False))
+            log_file.write("\n")
+
         while True:
             try:
                 user = input("You: ")
@@ -3027,21 +4690,29 @@ if __name__ == "__main__":
                     print("Commands: /help  show this help\n         /save  save chat to file\n         /exit  quit and save")
                     continue
                 if cmd == "/save":
-                    t = _dt.utcnow().strftime("%Y%m%d_%H%M%S")
-                    path = f"dual_brain_chat_{t}.json"
+                    if log_file is None:
+                        print("Nothing to save yet.")
+                        continue
                     try:
-                        with open(path, "w", encoding="utf-8") as f:
-                            json.dump(chat_log, f, ensure_ascii=False, indent=2)
-                        print(f"Saved chat to {path}")
+                        log_file.flush()
+                        print(f"Saved chat to {log_path}")
                     except Exception as e:
                         print("Failed to save chat:", e)
                     continue
                 if cmd == "/exit":
-                    t = _dt.utcnow().strftime("%Y%m%d_%H%M%S")
-                    path = f"dual_brain_chat_{t}.json"
+                    if log_file is None:
+                        print("Goodbye.")
+                        break
+                    # Convert the session log into a single JSON array, one pass over the JSONL
+                    path = log_path[:-1]
                     try:
-                        with open(path, "w", encoding="utf-8") as f:
-                            json.dump(chat_log, f, ensure_ascii=False, indent=2)
+                        log_file.close()
+                        with open(log_path, encoding="utf-8") as src, open(path, "w", encoding="utf-8") as f:
+                            f.write("[")
+                            for i, line in enumerate(src):
+                                f.write(",\n  " if i else "\n  ")
+                                f.write(line.rstrip("\n"))
+                            f.write("\n]\n")
                         print(f"Saved chat to {path}. Goodbye.")
                     except Exception as e:
                         print("Exit: failed to save chat:", e)
@@ -3050,13 +4721,16 @@ if __name__ == "__main__":
                 continue
 
             ts = _dt.utcnow().isoformat()
-            chat_log.append({"role": "user", "content": user, "ts": ts})
+            log_turn({"role": "user", "content": user, "ts": ts})
             try:
                 resp = brain.process_input(user)
             except Exception:
                 resp = "(local responder failed)"
             print("Assistant:", resp)
-            chat_log.append({"role": "assistant", "content": resp, "ts": _dt.utcnow().isoformat()})
+            log_turn({"role": "assistant", "content": resp, "ts": _dt.utcnow().isoformat()})
+
+        if log_file is not None and not log_file.closed:
+            log_file.close()
 
     print("🧠 Starting Dual Brain AI Creative Workflow Center v3.0")
     print("🎨 Professional Creative Suite with AI Collaboration")